@@ -0,0 +1,3 @@
+'''
+Data structures and algorithms of CSD301, one subpackage per topic
+'''
@@ -0,0 +1,1242 @@
+# %%
+from collections import deque
+
+class Node:
+    '''
+    BlackRed-Node
+    ------
+        A node contain:
+        + value -> int haa 
+        + isRed -> bool
+        + isNIL -> bool
+        + parent -> Node
+        + left -> Node
+        + right -> Node
+        + size -> number of values in subtree of this node
+
+        All NIL children are the same black NIL node, its parent is only meaningful right after it is set.
+        Nodes keep data of their subtree, the tree calls update() after the children of a node changed.
+    '''
+    __slots__ = ('value', 'isRed', 'parent', 'left', 'right', 'isNIL', 'size')
+
+    def __init__(self, value = 0, parent = None, left = None, right = None, isRed = True, isNIL = False) -> None:
+        self.value : int = value
+        self.isRed : bool = isRed
+        self.parent : Node = parent
+        self.left : Node = left
+        self.right : Node = right
+        self.isNIL : bool = isNIL
+        self.size : int = 0 if isNIL else 1
+
+    # Recompute data of subtree from children
+    def update(self):
+        self.size = 1 + self.left.size + self.right.size
+
+    # Set the left node
+    def setLeft(self, node):
+        self.left = node
+        node.parent = self
+
+    # Set the right node
+    def setRight(self, node):
+        self.right = node
+        node.parent = self
+
+    # Set isred property, reverse this property if input is None 
+    def setIsRed(self, isRed = None):
+        if self.isNIL == False:
+            if isRed is None:   
+                self.isRed = not self.isRed
+            else:
+                self.isRed = isRed
+        else:
+            self.isRed = False
+
+    # Inorder traverse, generate nodes of subtree with a stack
+    def inorder(self):
+        stack = []
+        curNode = self
+        while True:
+            while not curNode.isNIL:
+                stack.append(curNode)
+                curNode = curNode.left
+            if len(stack) == 0:
+                return
+            curNode = stack.pop()
+            yield curNode
+            curNode = curNode.right
+
+    # Preorder traverse, generate nodes of subtree with a stack
+    def preorder(self):
+        stack = [] if self.isNIL else [self]
+        while len(stack) > 0:
+            curNode = stack.pop()
+            yield curNode
+            if not curNode.right.isNIL:
+                stack.append(curNode.right)
+            if not curNode.left.isNIL:
+                stack.append(curNode.left)
+
+    # Level order traverse, generate nodes of subtree with a queue
+    def level_order(self):
+        waitNodes = deque() if self.isNIL else deque([self])
+        while len(waitNodes) > 0:
+            curNode = waitNodes.popleft()
+            yield curNode
+            if not curNode.left.isNIL:
+                waitNodes.append(curNode.left)
+            if not curNode.right.isNIL:
+                waitNodes.append(curNode.right)
+
+    # Values in level order
+    def __str__(self) -> str:
+        if self.isNIL:
+            return 'NIL Node'
+        return ''.join(str(curNode.value) + "\t" for curNode in self.level_order())
+
+    # Show a node with Mathplotlib
+    def show(self, level = 1, posx = 0, posy = 0):
+        import matplotlib.pyplot as plt
+        # Stack of (node, level, x, y)
+        waitNodes = [] if self.isNIL else [(self, level, posx, posy)]
+        while len(waitNodes) > 0:
+            (node, level, posx, posy) = waitNodes.pop()
+            width = 2000.0 * (0.5**(level)) # This will be used to space nodes horizontally
+            s = str(node.value)
+            if node.isRed: 
+                plt.text(posx, posy, s, horizontalalignment='center',color='r',fontsize=14)
+            else: plt.text(posx, posy, s, horizontalalignment='center',color='k',fontsize=14)
+
+            for (child, childx) in [(node.left, posx - width), (node.right, posx + width)]:
+                if child.isNIL:
+                    continue
+                px = [posx, childx]
+                py = [posy-1, posy-15]
+                if child.isRed: plt.plot(px,py,'r-')
+                else: plt.plot(px,py,'k-')
+                waitNodes.append((child, level + 1, childx, posy - 20))
+
+    # Generate subtree of this node in DOT format line by line, so large trees can be streamed to a file
+    # Draw maxDepth levels below this node and at most maxNodes nodes, None means no limit
+    # Children that are cut off are collapsed into one summary node with their number of nodes
+    def dot_lines(self, maxDepth = None, maxNodes = None):
+        yield 'digraph brtree {'
+        if self.isNIL:
+            yield '}'
+            return
+        # Queue of (node, depth), nodes are drawn in level order
+        waitNodes = deque([(self, 0)])
+        drawn = 1
+        while len(waitNodes) > 0:
+            (curNode, depth) = waitNodes.popleft()
+            name = 'n{}'.format(id(curNode))
+            label = str(curNode.value).replace('\\', '\\\\').replace('"', '\\"')
+            yield '    {} [label="{}", color={}];'.format(name, label, 'red' if curNode.isRed else 'black')
+            children = [child for child in (curNode.left, curNode.right) if not child.isNIL]
+            if len(children) == 0:
+                continue
+            # Collapse both children if they are too deep or over the node limit
+            if (maxDepth is not None and depth >= maxDepth) or (maxNodes is not None and drawn + len(children) > maxNodes):
+                yield '    {}s [label="... {} nodes", shape=box, style=dashed];'.format(name, curNode.size - 1)
+                yield '    {} -> {}s;'.format(name, name)
+                continue
+            # Create edges from this node to left and right node if they are not NIL
+            drawn += len(children)
+            for child in children:
+                yield '    {} -> n{};'.format(name, id(child))
+                waitNodes.append((child, depth + 1))
+        yield '}'
+
+    # Stream subtree of this node in DOT format to a .gv file
+    def save_dot(self, fileName, maxDepth = None, maxNodes = None):
+        with open(fileName, 'w') as f:
+            for line in self.dot_lines(maxDepth, maxNodes):
+                f.write(line + '\n')
+
+    # Save a node to .gv file, then render .pdf file unless render is False
+    def save_pdf(self, fileName = None, maxDepth = None, maxNodes = None, render = True):
+        if self.isNIL:
+            print('NIL Node')
+            return
+        # Save and render image
+        if fileName is None:
+            fileName = 'br-tree.gv'
+        self.save_dot(fileName, maxDepth, maxNodes)
+        if render:
+            import graphviz
+            graphviz.view(graphviz.render('dot', 'pdf', fileName))
+
+# Shared black NIL node, children of all leaves
+NIL = Node(isRed=False, isNIL=True)
+NIL.left = NIL.right = NIL
+
+class BRTree:
+    '''
+    BlackRed-Tree
+    -----
+        Features:
+        + Binary Search Tree
+        + A node is Black or Red
+        + The root is Black
+        + The NIL node is Black
+        + 2 Red nodes can not be near
+        + Black height in left and right child must be equal
+    '''
+    # Type of new nodes, subclasses keep more data of subtree
+    nodeType : type = Node
+
+    def __init__(self) -> None:        
+        self.root : Node = NIL
+
+    # Public function, insert new value (node) to tree
+    def insert(self, value):
+        self.__insert(self.__node(value), self.__searchParent(value))  
+            
+    # Public function, delete node with value equal given value
+    def delete(self, value):
+        self.__delete(self.search(value))
+
+    # Public function, search node with value equal given value, return None if not found
+    def search(self, value):
+        curNode = self.root
+        while not curNode.isNIL:
+            if value < curNode.value:
+                curNode = curNode.left
+            elif value > curNode.value:
+                curNode = curNode.right
+            else:
+                return curNode
+        return None
+
+    def __len__(self) -> int:
+        return self.root.size
+
+    # Public function, return number of values < given value
+    def rank(self, value) -> int:
+        result = 0
+        curNode = self.root
+        while not curNode.isNIL:
+            if value > curNode.value:
+                result += curNode.left.size + 1
+                curNode = curNode.right
+            else:
+                curNode = curNode.left
+        return result
+
+    # Public function, return the k-th smallest value (k starts from 0)
+    def select(self, k : int):
+        if k < 0 or k >= self.root.size:
+            raise IndexError("Index of value is out of range")
+        curNode = self.root
+        while k != curNode.left.size:
+            if k < curNode.left.size:
+                curNode = curNode.left
+            else:
+                k -= curNode.left.size + 1
+                curNode = curNode.right
+        return curNode.value
+
+    # Public function, return value in tree equal given value, return default if not found
+    def get(self, value, default = None):
+        node = self.search(value)
+        return default if node is None else node.value
+
+    def __contains__(self, value) -> bool:
+        return self.search(value) is not None
+
+    # Public function, return the largest value <= given value, None if not found
+    def floor(self, value):
+        node = self.__floorNode(value)
+        return None if node is None else node.value
+
+    # Public function, return the smallest value >= given value, None if not found
+    def ceiling(self, value):
+        node = self.__ceilingNode(value)
+        return None if node is None else node.value
+
+    # Public function, return the smallest value > given value, None if not found
+    def successor(self, value):
+        node = self.__ceilingNode(value, strict=True)
+        return None if node is None else node.value
+
+    # Public function, return the largest value < given value, None if not found
+    def predecessor(self, value):
+        node = self.__floorNode(value, strict=True)
+        return None if node is None else node.value
+
+    # Public function, generate values in range [lo, hi) in increasing order, None bound means no limit
+    # Descend once to lo, then follow successors with parent pointers. Tree must not be changed while generating.
+    def irange(self, lo = None, hi = None):
+        if lo is None:
+            curNode = None if self.root.isNIL else self.root
+            while curNode is not None and not curNode.left.isNIL:
+                curNode = curNode.left
+        else:
+            curNode = self.__ceilingNode(lo)
+
+        while curNode is not None and (hi is None or curNode.value < hi):
+            yield curNode.value
+            curNode = self.__nextNode(curNode)
+
+    def __iter__(self):
+        return self.irange()
+
+    # Public function, generate values in inorder (increasing order)
+    def inorder(self):
+        for curNode in self.root.inorder():
+            yield curNode.value
+
+    # Public function, generate values in preorder
+    def preorder(self):
+        for curNode in self.root.preorder():
+            yield curNode.value
+
+    # Public function, generate values in level order
+    def level_order(self):
+        for curNode in self.root.level_order():
+            yield curNode.value
+
+    # Public function, build tree from sorted unique values in O(n)
+    # Tree is balanced by size, nodes in the last level are red if this level is not complete
+    @classmethod
+    def from_sorted(cls, sorted_iterable):
+        values = list(sorted_iterable)
+        for i in range(1, len(values)):
+            if values[i - 1] >= values[i]:
+                raise Exception("Values must be sorted in increasing order and unique")
+
+        tree = cls()
+        # Levels from 0 to fullDepth - 1 are complete
+        fullDepth = (len(values) + 1).bit_length() - 1
+        tree.root = tree.__build(values, 0, len(values), 0, fullDepth)
+        return tree
+
+    # Public function, split tree into 2 trees (values < key, values >= key), this tree become empty
+    def split(self, key):
+        (left, _, found, right, hr) = self.__split(self.root, self.__blackHeight(self.root), key)
+        if found is not None:
+            (right, hr) = self.__join(NIL, 0, found, right, hr)
+        self.root = NIL
+        return (self.__tree(left), self.__tree(right))
+
+    # Public function, join 2 trees with a key (values of left < key < values of right), both trees become empty
+    @classmethod
+    def join(cls, left, key, right):
+        if (len(left) > 0 and left.select(len(left) - 1) >= key) or (len(right) > 0 and right.select(0) <= key):
+            raise Exception("Values of left tree must be less than key and values of right tree must be greater than key")
+
+        tree = cls()
+        node = tree.nodeType(value=key, left=NIL, right=NIL)
+        (tree.root, _) = tree.__join(left.root, tree.__blackHeight(left.root), node, right.root, tree.__blackHeight(right.root))
+        left.root = right.root = NIL
+        return tree
+
+    # Public function, return tree of values in this tree or other tree, both trees become empty
+    def union(self, other):
+        (root, _) = self.__union(self.root, self.__blackHeight(self.root), other.root, self.__blackHeight(other.root))
+        self.root = other.root = NIL
+        return self.__tree(root)
+
+    # Public function, return tree of values in both this tree and other tree, both trees become empty
+    def intersection(self, other):
+        (root, _) = self.__intersection(self.root, self.__blackHeight(self.root), other.root, self.__blackHeight(other.root))
+        self.root = other.root = NIL
+        return self.__tree(root)
+
+    # Public function, return tree of values in this tree but not in other tree, both trees become empty
+    def difference(self, other):
+        (root, _) = self.__difference(self.root, self.__blackHeight(self.root), other.root, self.__blackHeight(other.root))
+        self.root = other.root = NIL
+        return self.__tree(root)
+
+    # Display tree with Matplotlib
+    def show(self, figsize=(10,6), title=""):
+        import matplotlib.pyplot as plt
+        from pylab import rcParams
+        rcParams['figure.figsize'] = figsize
+        fig, ax = plt.subplots()
+        ax.axis('off')
+        # ax.set_title(title)
+        plt.text(0, 15, title, horizontalalignment='center',color='k',fontsize=14)
+        self.root.show()
+        plt.show()
+    
+    # Save tree to .gv and .pdf file
+    # Start from the node of value start if given, see Node.dot_lines for maxDepth and maxNodes
+    def save_pdf(self, fileName = None, start = None, maxDepth = None, maxNodes = None, render = True):
+        node = self.root if start is None else self.search(start)
+        if node is None:
+            print('Can not find value!')
+            return
+        node.save_pdf(fileName, maxDepth, maxNodes, render)
+
+    # Insert new node to left node, then fix color problem
+    def __insert(self, node : Node, parent : Node):
+        # Empty tree
+        if self.root.isNIL:
+            self.root = node
+            self.root.isRed = False
+            return
+        
+        # Add node to left
+        if node.value < parent.value:
+            parent.setLeft(node)
+        # Add node to right
+        elif node.value > parent.value:
+            parent.setRight(node)
+        else:
+            return
+
+        # Update subtree data of ancestors before rotations
+        self.__updatePath(parent)
+        self.__fixColor(node)
+
+    # Swap node with right or left most child, delete it and then fix double black problem
+    def __delete(self, node : Node):
+        if node is None:
+            return
+        delNode = self.__rightMostOrLeftMost(node)
+        # root node
+        if delNode == self.root:
+            self.root = NIL
+            return
+
+        node.value = delNode.value
+        parent = delNode.parent
+        if parent.left == delNode:
+            if not delNode.left.isNIL: 
+                parent.setLeft(delNode.left)
+            elif not delNode.right.isNIL:
+                parent.setLeft(delNode.right)
+            else:
+                parent.setLeft(NIL)
+            newnode = parent.left
+        else:
+            if not delNode.left.isNIL: 
+                parent.setRight(delNode.left)
+            elif not delNode.right.isNIL:
+                parent.setRight(delNode.right)
+            else:
+                parent.setRight(NIL)
+            newnode = parent.right
+        self.__updatePath(parent)
+        if not delNode.isRed:  
+            self.__fixDoubleBlack(newnode, parent)
+
+    # When red node inserted can cause 2 red node are near, this function to fix it
+    def __fixColor(self, node : Node):
+        parent = node.parent
+
+        if not parent and node.isRed:
+            node.setIsRed(False)
+            return
+        elif not parent:
+            return
+        # Parent is black node
+        if not parent.isRed:
+            return
+
+        grand = parent.parent
+        if grand.left == parent:
+            uncle = grand.right
+        else:
+            uncle = grand.left
+
+        # Parent is red node
+        if uncle.isRed:
+            parent.setIsRed(False)
+            grand.setIsRed(not grand.isRed)
+            uncle.setIsRed(False)
+            self.__fixColor(grand)
+        # Parent is black node
+        else:
+            # LL case
+            if grand.left == parent and parent.left == node:
+                parent.setIsRed()
+                grand.setIsRed()
+                self.__rotateRight(parent)
+            # LR case
+            elif grand.left == parent and parent.right == node:
+                self.__rotateLeft(node)
+                self.__fixColor(parent)
+            # RR case
+            elif grand.right == parent and parent.right == node:
+                parent.setIsRed()
+                grand.setIsRed()
+                self.__rotateLeft(parent)
+            # RL case
+            elif grand.right == parent and parent.left == node:
+                self.__rotateRight(node)
+                self.__fixColor(parent)
+    
+    # when delete a node can cause double black -> this function to fix it
+    # Parent is given because node can be the shared NIL node
+    def __fixDoubleBlack(self, node : Node, parent : Node):
+        # Red node absorbs the extra black
+        if node.isRed:
+            node.setIsRed(False)
+            return
+        if parent is None:
+            return
+        sibling = parent.left if parent.right == node else parent.right
+
+        # Sibling is NIL
+        if sibling.isNIL:
+            self.__fixDoubleBlack(parent, parent.parent)
+            return
+
+        # Sibling is black
+        if not sibling.isRed:
+            # Either child is red
+            if sibling.left.isRed or sibling.right.isRed:
+                # LL case
+                if sibling == parent.left and sibling.left.isRed:
+                    # color of sibling's child = color of sibling because after rotate, child replace sibling position
+                    sibling.left.setIsRed(sibling.isRed)
+                    # color of sibling = color of parent because after rotate, sibling replace parent position
+                    sibling.setIsRed(parent.isRed)
+                    # color of parent is Black because after rotate, parent replace sibling position -> same color with sibling (Black)
+                    parent.setIsRed(False)
+                    self.__rotateRight(sibling)
+                # LR case
+                elif sibling == parent.left and sibling.right.isRed:
+                    # color of sibling's child = color of parent because after rotate, child become sibling's parent
+                    sibling.right.setIsRed(parent.isRed)
+                    # color of parent is Black because after rotate, parent is sibling of sibling -> same color with sibling (Black)
+                    parent.setIsRed(False)
+                    self.__rotateLeft(sibling.right)
+                    self.__rotateRight(sibling.parent)
+                # RR case
+                elif sibling == parent.right and sibling.right.isRed:
+                    # color of sibling's child = color of sibling because after rotate, child replace sibling position
+                    sibling.right.setIsRed(sibling.isRed)
+                    # color of sibling = color of parent because after rotate, sibling replace parent position
+                    sibling.setIsRed(parent.isRed)
+                    # color of parent is Black because after rotate, parent replace sibling position -> same color with sibling (Black)
+                    parent.setIsRed(False)
+                    self.__rotateLeft(sibling)
+                # RL case
+                elif sibling == parent.right and sibling.left.isRed:
+                    # color of sibling's child = color of parent because after rotate, child become sibling's parent
+                    sibling.left.setIsRed(parent.isRed)
+                    # color of parent is Black because after rotate, parent is sibling of sibling -> same color with sibling (Black)
+                    parent.setIsRed(False)
+                    self.__rotateRight(sibling.left)
+                    self.__rotateLeft(sibling.parent)
+            # Both childen are black -> return knew case
+            else:
+                sibling.setIsRed(True)
+                if parent.isRed:
+                    parent.setIsRed(False)
+                else:
+                    self.__fixDoubleBlack(parent, parent.parent)
+        # Sibling is red -> Return to knew cases
+        else:
+            sibling.setIsRed(False)
+            parent.setIsRed(True)
+            # Left case
+            if sibling == parent.left:
+                self.__rotateRight(sibling)
+            # Right case
+            else:
+                self.__rotateLeft(sibling)
+            self.__fixDoubleBlack(node, parent)
+
+    # Find right most in the left child, if not found, find left most in the right child
+    def __rightMostOrLeftMost(self, node : Node):
+        curNode = node
+        if not node.left.isNIL:
+            curNode = node.left
+            while not curNode.right.isNIL:
+                curNode = curNode.right
+        elif not node.right.isNIL:
+            curNode = node.right
+            while not curNode.left.isNIL:
+                curNode = curNode.left
+        return curNode
+
+    # Create a node with NIL child
+    def __node(self, value = 0):
+        return self.nodeType(value=value, left=NIL, right=NIL)
+
+    # Update subtree data of node and all its ancestors
+    def __updatePath(self, node : Node):
+        while node is not None:
+            node.update()
+            node = node.parent
+
+    # Rotate left a node
+    '''
+    P                       X
+      +                   +    +                      
+        X       ->      P       R
+      +    +              +  
+    L       R               L
+    '''
+    def __rotateLeft(self, node):
+        parent = node.parent
+        grand = parent.parent
+        parent.setRight(node.left)
+        node.setLeft(parent)
+        if grand is None:
+            self.root = node
+            node.parent = None
+        elif grand.left == parent:
+            grand.setLeft(node)
+        elif grand.right == parent:
+            grand.setRight(node)
+        # P become child of X, subtree of ancestors does not change
+        parent.update()
+        node.update()
+
+    # Rotate right a node
+    '''
+            P               X
+          +               +   +                      
+        X       ->      L       P
+      +   +                   +  
+    L       R               R
+    '''
+    def __rotateRight(self, node):
+        parent = node.parent
+        grand = parent.parent
+        parent.setLeft(node.right)
+        node.setRight(parent)
+        if grand is None:
+            self.root = node
+            node.parent = None
+        elif grand.left == parent:
+            grand.setLeft(node)
+        elif grand.right == parent:
+            grand.setRight(node)
+        # P become child of X, subtree of ancestors does not change
+        parent.update()
+        node.update()
+
+    # Return node with the smallest value >= value (> value if strict), None if not found
+    def __ceilingNode(self, value, strict = False):
+        result = None
+        curNode = self.root
+        while not curNode.isNIL:
+            if value < curNode.value or (not strict and value == curNode.value):
+                result = curNode
+                curNode = curNode.left
+            else:
+                curNode = curNode.right
+        return result
+
+    # Return node with the largest value <= value (< value if strict), None if not found
+    def __floorNode(self, value, strict = False):
+        result = None
+        curNode = self.root
+        while not curNode.isNIL:
+            if value > curNode.value or (not strict and value == curNode.value):
+                result = curNode
+                curNode = curNode.right
+            else:
+                curNode = curNode.left
+        return result
+
+    # Return node with the next value in order: left most of right child, or the first parent reached from a left child
+    def __nextNode(self, node : Node):
+        if not node.right.isNIL:
+            node = node.right
+            while not node.left.isNIL:
+                node = node.left
+            return node
+
+        while node.parent is not None and node.parent.right == node:
+            node = node.parent
+        return node.parent
+
+    # Create a tree of the same type with given root
+    def __tree(self, root : Node):
+        tree = type(self)()
+        tree.root = root
+        return tree
+
+    # Build subtree of values[lo:hi], nodes at redDepth are red
+    def __build(self, values, lo, hi, depth, redDepth):
+        if lo == hi:
+            return NIL
+        mid = (lo + hi) // 2
+        node = self.nodeType(value=values[mid], isRed=depth == redDepth)
+        node.setLeft(self.__build(values, lo, mid, depth + 1, redDepth))
+        node.setRight(self.__build(values, mid + 1, hi, depth + 1, redDepth))
+        node.update()
+        return node
+
+    # Number of black nodes from node down to a NIL node (NIL is not counted)
+    def __blackHeight(self, node : Node):
+        height = 0
+        while not node.isNIL:
+            if not node.isRed:
+                height += 1
+            node = node.left
+        return height
+
+    # Cut node from its parent, return it as root of a tree with black root and its black height
+    def __detach(self, node : Node, height):
+        if node.isNIL:
+            return (NIL, 0)
+        node.parent = None
+        if node.isRed:
+            node.isRed = False
+            height += 1
+        return (node, height)
+
+    # Join trees with black roots left < node < right, return tree with black root and its black height
+    '''
+    Higher tree is walked down along its inner spine to a black node with the same black height as lower tree,
+    node become a red parent of both, then 2 near red nodes are fixed by rotations on the way back
+    '''
+    def __join(self, left : Node, leftHeight, node : Node, right : Node, rightHeight):
+        if leftHeight > rightHeight:
+            root = self.__joinRight(left, leftHeight, node, right, rightHeight)
+        elif leftHeight < rightHeight:
+            root = self.__joinLeft(left, leftHeight, node, right, rightHeight)
+        else:
+            node.setLeft(left)
+            node.setRight(right)
+            node.isRed = True
+            node.update()
+            root = node
+
+        root.parent = None
+        height = max(leftHeight, rightHeight)
+        if root.isRed:
+            root.isRed = False
+            height += 1
+        return (root, height)
+
+    # Join node and right into the right spine of left, return new root of left
+    def __joinRight(self, left : Node, leftHeight, node : Node, right : Node, rightHeight):
+        if not left.isRed and leftHeight == rightHeight:
+            node.setLeft(left)
+            node.setRight(right)
+            node.isRed = True
+            node.update()
+            return node
+
+        child = self.__joinRight(left.right, leftHeight - (0 if left.isRed else 1), node, right, rightHeight)
+        left.setRight(child)
+        # 2 near red nodes under a black node -> rotate left
+        if not left.isRed and child.isRed and child.right.isRed:
+            child.right.isRed = False
+            left.setRight(child.left)
+            child.setLeft(left)
+            left.update()
+            child.update()
+            return child
+        left.update()
+        return left
+
+    # Join left and node into the left spine of right, return new root of right
+    def __joinLeft(self, left : Node, leftHeight, node : Node, right : Node, rightHeight):
+        if not right.isRed and leftHeight == rightHeight:
+            node.setLeft(left)
+            node.setRight(right)
+            node.isRed = True
+            node.update()
+            return node
+
+        child = self.__joinLeft(left, leftHeight, node, right.left, rightHeight - (0 if right.isRed else 1))
+        right.setLeft(child)
+        # 2 near red nodes under a black node -> rotate right
+        if not right.isRed and child.isRed and child.left.isRed:
+            child.left.isRed = False
+            right.setLeft(child.right)
+            child.setRight(right)
+            right.update()
+            child.update()
+            return child
+        right.update()
+        return right
+
+    # Join trees with black roots left < right without a middle node
+    def __join2(self, left : Node, leftHeight, right : Node, rightHeight):
+        if left.isNIL:
+            return (right, rightHeight)
+        (left, leftHeight, last) = self.__splitLast(left, leftHeight)
+        return self.__join(left, leftHeight, last, right, rightHeight)
+
+    # Remove the largest node of a tree with black root, return (the rest, its black height, the largest node)
+    def __splitLast(self, node : Node, height):
+        childHeight = height - (0 if node.isRed else 1)
+        (left, leftHeight) = self.__detach(node.left, childHeight)
+        if node.right.isNIL:
+            return (left, leftHeight, node)
+
+        (right, rightHeight) = self.__detach(node.right, childHeight)
+        (right, rightHeight, last) = self.__splitLast(right, rightHeight)
+        (root, height) = self.__join(left, leftHeight, node, right, rightHeight)
+        return (root, height, last)
+
+    # Split tree with black root by key, return (tree < key, its black height, node with key or None, tree > key, its black height)
+    def __split(self, node : Node, height, key):
+        if node.isNIL:
+            return (NIL, 0, None, NIL, 0)
+
+        childHeight = height - (0 if node.isRed else 1)
+        (left, leftHeight) = self.__detach(node.left, childHeight)
+        (right, rightHeight) = self.__detach(node.right, childHeight)
+        if key == node.value:
+            return (left, leftHeight, node, right, rightHeight)
+
+        if key < node.value:
+            (lowLeft, lowHeight, found, highLeft, highHeight) = self.__split(left, leftHeight, key)
+            (right, rightHeight) = self.__join(highLeft, highHeight, node, right, rightHeight)
+            return (lowLeft, lowHeight, found, right, rightHeight)
+
+        (lowRight, lowHeight, found, highRight, highHeight) = self.__split(right, rightHeight, key)
+        (left, leftHeight) = self.__join(left, leftHeight, node, lowRight, lowHeight)
+        return (left, leftHeight, found, highRight, highHeight)
+
+    # Union of 2 trees with black roots: split first tree by root of second tree, union both sides, then join them
+    def __union(self, first : Node, firstHeight, second : Node, secondHeight):
+        if first.isNIL:
+            return (second, secondHeight)
+        if second.isNIL:
+            return (first, firstHeight)
+
+        childHeight = secondHeight - 1
+        (secondLeft, secondLeftHeight) = self.__detach(second.left, childHeight)
+        (secondRight, secondRightHeight) = self.__detach(second.right, childHeight)
+        (firstLeft, firstLeftHeight, _, firstRight, firstRightHeight) = self.__split(first, firstHeight, second.value)
+        (left, leftHeight) = self.__union(firstLeft, firstLeftHeight, secondLeft, secondLeftHeight)
+        (right, rightHeight) = self.__union(firstRight, firstRightHeight, secondRight, secondRightHeight)
+        return self.__join(left, leftHeight, second, right, rightHeight)
+
+    # Intersection of 2 trees with black roots, root of second tree is kept only if it is found in first tree
+    def __intersection(self, first : Node, firstHeight, second : Node, secondHeight):
+        if first.isNIL or second.isNIL:
+            return (NIL, 0)
+
+        childHeight = secondHeight - 1
+        (secondLeft, secondLeftHeight) = self.__detach(second.left, childHeight)
+        (secondRight, secondRightHeight) = self.__detach(second.right, childHeight)
+        (firstLeft, firstLeftHeight, found, firstRight, firstRightHeight) = self.__split(first, firstHeight, second.value)
+        (left, leftHeight) = self.__intersection(firstLeft, firstLeftHeight, secondLeft, secondLeftHeight)
+        (right, rightHeight) = self.__intersection(firstRight, firstRightHeight, secondRight, secondRightHeight)
+        if found is None:
+            return self.__join2(left, leftHeight, right, rightHeight)
+        return self.__join(left, leftHeight, second, right, rightHeight)
+
+    # Difference of 2 trees with black roots, values of second tree are removed from first tree
+    def __difference(self, first : Node, firstHeight, second : Node, secondHeight):
+        if first.isNIL or second.isNIL:
+            return (first, firstHeight)
+
+        childHeight = secondHeight - 1
+        (secondLeft, secondLeftHeight) = self.__detach(second.left, childHeight)
+        (secondRight, secondRightHeight) = self.__detach(second.right, childHeight)
+        (firstLeft, firstLeftHeight, _, firstRight, firstRightHeight) = self.__split(first, firstHeight, second.value)
+        (left, leftHeight) = self.__difference(firstLeft, firstLeftHeight, secondLeft, secondLeftHeight)
+        (right, rightHeight) = self.__difference(firstRight, firstRightHeight, secondRight, secondRightHeight)
+        return self.__join2(left, leftHeight, right, rightHeight)
+
+    # Search parent node to insert value, return the node with this value if it has been in tree
+    def __searchParent(self, value):
+        parent = None
+        curNode = self.root
+        while not curNode.isNIL:
+            if value == curNode.value:
+                return curNode
+            parent = curNode
+            curNode = curNode.left if value < curNode.value else curNode.right
+        return parent
+
+    def __str__(self) -> str:
+        return str(self.root)
+
+class IntervalNode(Node):
+    '''
+    Interval-Node
+    ------
+        A node of interval tree contain:
+        + value -> (lo, hi), half-open interval [lo, hi)
+        + maxHi -> the largest hi in subtree of this node
+    '''
+    __slots__ = ('maxHi',)
+
+    def __init__(self, value = (0, 0), parent = None, left = None, right = None, isRed = True, isNIL = False) -> None:
+        super().__init__(value, parent, left, right, isRed, isNIL)
+        self.maxHi = value[1]
+
+    def update(self):
+        super().update()
+        self.maxHi = self.value[1]
+        if not self.left.isNIL and self.left.maxHi > self.maxHi:
+            self.maxHi = self.left.maxHi
+        if not self.right.isNIL and self.right.maxHi > self.maxHi:
+            self.maxHi = self.right.maxHi
+
+class IntervalTree(BRTree):
+    '''
+    Interval-Tree
+    -----
+        Features:
+        + BlackRed-Tree of half-open intervals [lo, hi) ordered by (lo, hi), an equal interval is stored once
+        + Intervals must not be empty (lo < hi), [a, b) and [c, d) overlap if a < d and c < b -> touching intervals do not overlap
+        + Every node keeps the largest hi in its subtree, updated after insert, delete and rotations
+        + Overlap query skips subtrees whose largest hi <= lo and stops at the first interval starting at or after hi
+    '''
+    nodeType : type = IntervalNode
+
+    # Public function, insert interval [lo, hi), empty intervals are rejected
+    def insert(self, lo, hi):
+        if lo >= hi:
+            raise Exception("Interval must have lo < hi")
+        super().insert((lo, hi))
+
+    # Public function, delete interval [lo, hi)
+    def delete(self, lo, hi):
+        super().delete((lo, hi))
+
+    # Public function, generate intervals overlapping [lo, hi) in increasing order, an empty query (lo >= hi) overlaps nothing
+    # Only paths to reported intervals and O(log n) boundary nodes are visited. Tree must not be changed while generating.
+    def overlapping(self, lo, hi):
+        if lo >= hi:
+            return
+        stack = []
+        curNode = self.root
+        while True:
+            # Go left while subtree can contain an interval ending after lo
+            while not curNode.isNIL and curNode.maxHi > lo:
+                stack.append(curNode)
+                curNode = curNode.left
+            if len(stack) == 0:
+                return
+
+            curNode = stack.pop()
+            # All next intervals start at or after hi
+            if curNode.value[0] >= hi:
+                return
+            if curNode.value[1] > lo:
+                yield curNode.value
+            curNode = curNode.right
+
+class PersistentBRTree(BRTree):
+    '''
+    Persistent BlackRed-Tree
+    -----
+        Features:
+        + Same rules as BlackRed-Tree
+        + A tree never changes, insert and delete return a new tree
+        + New tree shares all unchanged subtrees with the old one, an update creates O(log n) nodes
+        + Nodes do not link to parent (parent is None), fix-ups use the copied path from root instead
+    '''
+    def __init__(self, root : Node = NIL) -> None:
+        self.root : Node = root
+
+    # Public function, return a new tree with given value
+    def insert(self, value):
+        if value in self:
+            return self
+
+        # Copy path from root to the new leaf
+        path = []
+        curNode = self.root
+        while not curNode.isNIL:
+            path.append(self.__copy(curNode))
+            path[-1].size += 1
+            self.__link(path, len(path) - 1, path[-1])
+            curNode = curNode.left if value < curNode.value else curNode.right
+        path.append(Node(value=value, left=NIL, right=NIL))
+        self.__link(path, len(path) - 1, path[-1], value)
+
+        # Fix 2 near red nodes from the new leaf up
+        i = len(path) - 1
+        while i >= 2 and path[i - 1].isRed:
+            (node, parent, grand) = (path[i], path[i - 1], path[i - 2])
+            uncle = grand.right if grand.left is parent else grand.left
+
+            # Uncle is red -> recolor and continue from grand
+            if uncle.isRed:
+                uncle = self.__copy(uncle)
+                if grand.left is parent:
+                    grand.right = uncle
+                else:
+                    grand.left = uncle
+                uncle.isRed = False
+                parent.isRed = False
+                grand.isRed = True
+                i -= 2
+                continue
+
+            # Uncle is black -> LR and RL cases become LL and RR cases, then rotate grand
+            if grand.left is parent:
+                if parent.right is node:
+                    grand.left = parent = self.__rotateLeft(parent)
+                top = self.__rotateRight(grand)
+            else:
+                if parent.left is node:
+                    grand.right = parent = self.__rotateRight(parent)
+                top = self.__rotateLeft(grand)
+            top.isRed = False
+            grand.isRed = True
+            self.__link(path, i - 2, top)
+            path[i - 2] = top
+            break
+
+        path[0].isRed = False
+        return PersistentBRTree(path[0])
+
+    # Public function, return a new tree without given value
+    def delete(self, value):
+        if value not in self:
+            return self
+
+        # Copy path from root to the node with value
+        path = []
+        curNode = self.root
+        while True:
+            path.append(self.__copy(curNode))
+            path[-1].size -= 1
+            self.__link(path, len(path) - 1, path[-1])
+            if value == curNode.value:
+                break
+            curNode = curNode.left if value < curNode.value else curNode.right
+
+        # 2 children -> copy path to left most of right child, swap value and delete it
+        node = path[-1]
+        if not node.left.isNIL and not node.right.isNIL:
+            curNode = node.right
+            while not curNode.isNIL:
+                path.append(self.__copy(curNode))
+                path[-1].size -= 1
+                self.__link(path, len(path) - 1, path[-1])
+                curNode = curNode.left
+            node.value = path[-1].value
+
+        # Replace deleted node by its only child
+        delNode = path.pop()
+        child = delNode.left if not delNode.left.isNIL else delNode.right
+        if len(path) == 0:
+            root = self.__copy(child) if child.isRed else child
+            root.isRed = False
+            return PersistentBRTree(root)
+        isLeft = path[-1].left is delNode
+        if isLeft:
+            path[-1].left = child
+        else:
+            path[-1].right = child
+
+        if delNode.isRed:
+            return PersistentBRTree(path[0])
+        if child.isRed:
+            child = self.__copy(child)
+            child.isRed = False
+            self.__link(path, len(path), child, isLeft=isLeft)
+            return PersistentBRTree(path[0])
+
+        # Child is double black, fix from its parent up
+        i = len(path) - 1
+        while i >= 0:
+            parent = path[i]
+            sibling = self.__copy(parent.right if isLeft else parent.left)
+            if isLeft:
+                parent.right = sibling
+            else:
+                parent.left = sibling
+
+            # Sibling is red -> rotate parent so that sibling become black, parent moves down one level
+            if sibling.isRed:
+                sibling.isRed = False
+                parent.isRed = True
+                top = self.__rotateLeft(parent) if isLeft else self.__rotateRight(parent)
+                self.__link(path, i, top)
+                path.insert(i, top)
+                i += 1
+                continue
+
+            near = sibling.left if isLeft else sibling.right
+            far = sibling.right if isLeft else sibling.left
+
+            # Both children of sibling are black -> sibling become red, parent carries the double black
+            if not near.isRed and not far.isRed:
+                sibling.isRed = True
+                if parent.isRed:
+                    parent.isRed = False
+                    break
+                i -= 1
+                if i >= 0:
+                    isLeft = path[i].left is parent
+                continue
+
+            # Near child is red -> rotate sibling so that the far child is red
+            if not far.isRed:
+                near = self.__copy(near)
+                if isLeft:
+                    sibling.left = near
+                    parent.right = sibling = self.__rotateRight(sibling)
+                else:
+                    sibling.right = near
+                    parent.left = sibling = self.__rotateLeft(sibling)
+                sibling.isRed = False
+                (sibling.right if isLeft else sibling.left).isRed = True
+                far = sibling.right if isLeft else sibling.left
+
+            # Far child is red -> rotate parent, sibling takes color of parent
+            far = self.__copy(far)
+            if isLeft:
+                sibling.right = far
+            else:
+                sibling.left = far
+            far.isRed = False
+            sibling.isRed = parent.isRed
+            parent.isRed = False
+            top = self.__rotateLeft(parent) if isLeft else self.__rotateRight(parent)
+            self.__link(path, i, top)
+            path[i] = top
+            break
+
+        path[0].isRed = False
+        return PersistentBRTree(path[0])
+
+    # Join-based operations change nodes in place, so they can not be used on shared nodes
+    def split(self, key):
+        raise Exception("Persistent tree does not support split")
+
+    @classmethod
+    def join(cls, left, key, right):
+        raise Exception("Persistent tree does not support join")
+
+    def union(self, other):
+        raise Exception("Persistent tree does not support union")
+
+    def intersection(self, other):
+        raise Exception("Persistent tree does not support intersection")
+
+    def difference(self, other):
+        raise Exception("Persistent tree does not support difference")
+
+    # Public function, build tree from sorted unique values in O(n)
+    @classmethod
+    def from_sorted(cls, sorted_iterable):
+        tree = super().from_sorted(sorted_iterable)
+        # Nodes of persistent tree do not link to parent
+        waitNodes = [tree.root]
+        while len(waitNodes) > 0:
+            curNode = waitNodes.pop()
+            if not curNode.isNIL:
+                curNode.parent = None
+                waitNodes += [curNode.left, curNode.right]
+        return tree
+
+    # Public function, generate values in range [lo, hi) in increasing order with a stack of nodes
+    def irange(self, lo = None, hi = None):
+        stack = []
+        curNode = self.root
+        while True:
+            while not curNode.isNIL:
+                if lo is not None and curNode.value < lo:
+                    curNode = curNode.right
+                else:
+                    stack.append(curNode)
+                    curNode = curNode.left
+            if len(stack) == 0:
+                return
+
+            curNode = stack.pop()
+            if hi is not None and curNode.value >= hi:
+                return
+            yield curNode.value
+            curNode = curNode.right
+
+    # Copy a node, the copy can be changed without changing old versions
+    def __copy(self, node : Node):
+        copyNode = Node(value=node.value, left=node.left, right=node.right, isRed=node.isRed)
+        copyNode.size = node.size
+        return copyNode
+
+    # Link path[i] to path[i - 1] (new root if i == 0), the side is chosen by value or isLeft
+    def __link(self, path, i, node, value = None, isLeft = None):
+        if i == 0:
+            return
+        parent = path[i - 1]
+        if isLeft is None:
+            isLeft = (node.value if value is None else value) < parent.value
+        if isLeft:
+            parent.left = node
+        else:
+            parent.right = node
+
+    # Rotate left a copied node, return the new root of subtree
+    def __rotateLeft(self, node : Node):
+        top = node.right
+        node.right = top.left
+        top.left = node
+        node.update()
+        top.update()
+        return top
+
+    # Rotate right a copied node, return the new root of subtree
+    def __rotateRight(self, node : Node):
+        top = node.left
+        node.left = top.right
+        top.right = node
+        node.update()
+        top.update()
+        return top
+
+# %%
+if __name__ == "__main__":
+    from random import shuffle
+    from time import time
+    import tracemalloc
+
+    # Create, insert and show tree
+    insert_arr = [x for x in range(1, 20)]
+    brTree = BRTree()
+    for x in insert_arr:
+        brTree.insert(x)
+    brTree.show((20,6), "Add 19 number")
+
+    # Delete some nodes in tree
+    delete_arr = [14,11,13]
+    for x in delete_arr:
+        brTree.delete(x)    
+    brTree.show((20,6), "Delete 14, 11, 13")
+
+    # Ordered navigation
+    print("Floor of 13: {0}, ceiling of 13: {1}".format(brTree.floor(13), brTree.ceiling(13)))
+    print("Predecessor of 12: {0}, successor of 12: {1}".format(brTree.predecessor(12), brTree.successor(12)))
+    print("Values in [5, 15): ", list(brTree.irange(5, 15)))
+    print("Number of values: {0}, median: {1}, rank of 12: {2}".format(len(brTree), brTree.select(len(brTree) // 2), brTree.rank(12)))
+
+    # Interval tree, find all windows overlapping [12, 15)
+    intervalTree = IntervalTree()
+    for (lo, hi) in [(0, 5), (3, 12), (10, 14), (15, 20), (11, 30)]:
+        intervalTree.insert(lo, hi)
+    print("Intervals overlapping [12, 15): ", list(intervalTree.overlapping(12, 15)))
+
+    # Persistent tree, every version can still be read
+    versions = [PersistentBRTree()]
+    for x in [5, 3, 8, 1, 4]:
+        versions.append(versions[-1].insert(x))
+    versions.append(versions[-1].delete(3))
+    for (i, version) in enumerate(versions):
+        print("Version {0}: {1}".format(i, list(version)))
+
+    # Set operations with split and join
+    evenTree = BRTree.from_sorted(range(0, 20, 2))
+    tripleTree = BRTree.from_sorted(range(0, 20, 3))
+    (lowTree, highTree) = BRTree.from_sorted(range(10)).split(5)
+    print("Split at 5: {0} {1}".format(list(lowTree), list(highTree)))
+    print("Union of multiples of 2 and 3: ", list(evenTree.union(tripleTree)))
+
+    # %%
+    # Memory and insert throughput, one node object per key thanks to the shared NIL node
+    N = 100000
+    keys = [x for x in range(N)]
+    shuffle(keys)
+    tracemalloc.start()
+    bigTree = BRTree()
+    t1 = time()
+    for x in keys:
+        bigTree.insert(x)
+    t2 = time()
+    (memory, _) = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print("Insert {0:.0f} ops/s, {1:.1f} MB per million keys".format(N / (t2 - t1), memory / N))
@@ -0,0 +1,3 @@
+'''
+Black Red Tree
+'''
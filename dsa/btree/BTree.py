@@ -0,0 +1,1278 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+from typing import Callable, Iterable, Iterator, List, Tuple
+
+class BTreeNode:
+    '''
+    # B-Tree Node
+    
+        A B-Tree Node contains:
+        + All keys of node
+        + All children of node
+        + Number of keys in subtree of this node
+        + Version of the tree that created this node, older nodes can be shared with snapshots
+
+        Nodes do not link to parent, insert and delete record the path from root instead.
+    '''
+    __slots__ = ('keys', 'children', 'size', 'epoch')
+
+    def __init__(self, keys : List[int] = None, children = None) -> None:
+        self.keys : List[int] = [] if keys is None else keys
+        self.children : List[BTreeNode] = [] if children is None else children
+        self.size : int = len(self.keys) + sum(child.size for child in self.children)
+        self.epoch : int = 0
+
+    def __str__(self) -> str:
+        return "node-" + ''.join(str(x) for x in self.keys)
+
+    def isLeaf(self) -> bool:
+        return len(self.children) == 0
+
+    def countedKeys(self) -> int:
+        '''
+        Return number of keys of this node counted in size
+        '''
+        return len(self.keys)
+
+class CompactBTreeNode(BTreeNode):
+    '''
+    # Compact B-Tree Node
+    
+        Same as B-Tree Node, but keys are stored in an array of 64-bit integers:
+        + 8 bytes per key instead of a list slot and a boxed int
+        + Binary search runs directly on the array
+        + Keys must be integers in range [-2^63, 2^63)
+    '''
+    __slots__ = ()
+
+    def __init__(self, keys : List[int] = None, children = None) -> None:
+        if not isinstance(keys, array):
+            keys = array('q', [] if keys is None else keys)
+        super().__init__(keys, children)
+
+# Bulk load steps shared by BTree and BPlusTree, node creation and rebalancing are given by the tree
+def bulkCapacity(order : int, minKeys : int, fill_factor : float) -> int:
+    '''
+    Return number of keys packed in each node for a fill factor, at least the minimum keys of a node
+    '''
+    if fill_factor <= 0 or fill_factor > 1:
+        raise Exception("Fill factor must be in range (0, 1]")
+    return min(order - 1, max(minKeys, int(fill_factor * (order - 1))))
+
+def bulkSeparator(levels : List[BTreeNode], capacity : int, key : int, newLeaf : BTreeNode, newParent : Callable) -> None:
+    '''
+    Leaf of levels is full -> newLeaf becomes the open leaf and key its separator in the open parent.
+    If parent is full too -> carry separator up with a new parent node made by newParent(children)
+    '''
+    newNode = newLeaf
+    level = 0
+    while True:
+        level += 1
+        if level == len(levels):
+            levels.append(newParent([levels[-1]]))
+
+        parent = levels[level]
+        levels[level - 1] = newNode
+        if len(parent.keys) < capacity:
+            parent.keys.append(key)
+            parent.children.append(newNode)
+            return
+
+        newNode = newParent([newNode])
+
+def bulkFinish(tree : 'BTree', levels : List[BTreeNode], minKeys : int, rebalance : Callable, fixUnderflow : Callable) -> None:
+    '''
+    Make the top level the root, compute sizes, then fix underflow nodes of the right-most path from top to bottom
+    + rebalance(parent, index), fixUnderflow(path, node): the rebalancing steps of the tree
+    '''
+    tree.root = levels[-1]
+    computeSize(tree.root)
+
+    # Only nodes in the right-most path can be underflow
+    depth = 1
+    height = len(levels) - 1
+    while depth <= height:
+        path : List[Tuple[BTreeNode, int]] = []
+        node = tree.root
+        for _ in range(depth):
+            path.append((node, len(node.children) - 1))
+            node = node.children[-1]
+
+        # Node can be far from minimum -> rotate keys from left sibling until enough or merged
+        (parent, index) = path.pop()
+        while len(node.keys) < minKeys:
+            node = rebalance(parent, index)
+            index = len(parent.children) - 1
+        fixUnderflow(path, parent)
+
+        # Root has been merged -> all levels move up
+        newHeight = 0
+        node = tree.root
+        while not node.isLeaf():
+            node = node.children[0]
+            newHeight += 1
+        if newHeight == height:
+            depth += 1
+        height = newHeight
+
+def computeSize(node : BTreeNode) -> int:
+    '''
+    Compute size of all nodes in subtree of node
+    '''
+    node.size = node.countedKeys() + sum(computeSize(child) for child in node.children)
+    return node.size
+
+class BTree:
+    '''
+    # B-Tree
+    
+        B-Tree features:
+        + All leaves are at the same level.
+        + Order of B-Tree is maximum children of a node
+        + Every node except the root must contain at least t-1 keys. The root may contain a minimum of 1 key.
+        + All internal node contain the order number of keys
+        + Number of children of a node is equal to the number of keys in it plus 1.
+        + All keys of a node are sorted in increasing order. 
+        + Insertion of a Node in B-Tree happens only at Leaf Node.
+    '''
+    # Node class of the tree, compact trees use CompactBTreeNode
+    nodeType : type = BTreeNode
+
+    def __init__(self, order : int, compact : bool = False) -> None:
+        if order < 3:
+            raise Exception("The smallest order of B-Tree must be 3")
+
+        self.__order : int = order
+        self.__minKeys : int = round(order / 2) - 1
+        # Compact nodes store integer keys in arrays
+        self.__nodeType : type = CompactBTreeNode if compact else self.nodeType
+        # Nodes created before the current epoch are shared with snapshots and copied before changed
+        self.__epoch : int = 0
+        self.root : BTreeNode = self.__newNode()
+
+    def __str__(self) -> str:
+        return "BTree-root: " + str(list(self.root.keys))
+
+    @property
+    def order(self) -> int:
+        return self.__order
+
+    @property
+    def minKeys(self) -> int:
+        # Minimum number of keys of a node except the root
+        return self.__minKeys
+
+    def search(self, key : int) -> Tuple[BTreeNode, int]:
+        '''
+        Return node and index of key in this node. Return (None, -1) if not found
+        '''
+        curNode = self.root
+        while True:
+            # One binary search per node gives both the match and the child to descend
+            i = bisect_left(curNode.keys, key)
+            if i < len(curNode.keys) and curNode.keys[i] == key:
+                return (curNode, i)
+            
+            if len(curNode.children) == 0:
+                return (None, -1)
+
+            curNode = curNode.children[i]
+
+    def __len__(self) -> int:
+        return self.root.size
+
+    def isEmpty(self):
+        return len(self.root.keys) == 0
+
+    def rank(self, key : int) -> int:
+        '''
+        Return number of keys less than key
+        '''
+        result = 0
+        curNode = self.root
+        while True:
+            i = bisect_left(curNode.keys, key)
+            result += i
+            if curNode.isLeaf():
+                return result
+
+            for j in range(i):
+                result += curNode.children[j].size
+            if i < len(curNode.keys) and curNode.keys[i] == key:
+                return result + curNode.children[i].size
+            curNode = curNode.children[i]
+
+    def select(self, k : int) -> int:
+        '''
+        Return the k-th smallest key (k starts from 0)
+        '''
+        if k < 0 or k >= self.root.size:
+            raise IndexError("Index of key is out of range")
+
+        curNode = self.root
+        while not curNode.isLeaf():
+            # Skip children and keys before the child that contains k-th key
+            i = 0
+            while k >= curNode.children[i].size:
+                k -= curNode.children[i].size
+                if k == 0:
+                    return curNode.keys[i]
+                k -= 1
+                i += 1
+            curNode = curNode.children[i]
+        return curNode.keys[k]
+
+    def count(self, lo : int = None, hi : int = None) -> int:
+        '''
+        Return number of keys in range [lo, hi), None bound means no limit
+        '''
+        return max(0, (len(self) if hi is None else self.rank(hi)) - (0 if lo is None else self.rank(lo)))
+
+    @classmethod
+    def bulk_load(cls, sorted_iterable : Iterable[int], order : int, fill_factor : float = 1.0, compact : bool = False):
+        '''
+        Build a B-Tree bottom-up from sorted unique keys in a single pass.
+        Every node is packed with fill_factor * (order - 1) keys from left to right,
+        then the right-most nodes are fixed so that all nodes keep the minimum number of keys.
+        '''
+        tree : BTree = cls(order, compact)
+        capacity = bulkCapacity(order, tree.__minKeys, fill_factor)
+        newParent = lambda children: tree.__newNode(keys=[], children=children)
+
+        # Right-most (open) node of each level, leaves first
+        levels : List[BTreeNode] = [tree.root]
+        lastKey = None
+        for key in sorted_iterable:
+            if lastKey is not None and key <= lastKey:
+                raise Exception("Keys must be sorted in increasing order and unique")
+            lastKey = key
+
+            if len(levels[0].keys) < capacity:
+                levels[0].keys.append(key)
+                continue
+
+            # Leaf is full -> key become a separator of a new empty leaf
+            bulkSeparator(levels, capacity, key, tree.__newNode(), newParent)
+
+        bulkFinish(tree, levels, tree.__minKeys, tree.__rebalance, tree.__fixUnderflow)
+        return tree
+
+    def insert(self, key : int) -> None:
+        '''
+        Insert new key to B-Tree
+        '''
+        
+        # Search position to insert
+        (path, node, index) = self.__searchPath(key)
+
+        if index < len(node.keys) and node.keys[index] == key:
+            print("Key has been in tree!")
+            return
+
+        # Insert to leaf, if node is overflow -> split node
+        (path, node) = self.__writablePath(path, node)
+        node.keys.insert(index, key)
+        node.size += 1
+        for (parent, _) in path:
+            parent.size += 1
+        if len(node.keys) > self.__order - 1:
+            self.__splitNode(path, node)
+
+    def delete(self, key : int) -> int:
+        '''
+        Search and delete a key in B-Tree, return the deleted key
+        '''
+
+        (path, node, index) = self.__searchPath(key)
+        if index >= len(node.keys) or node.keys[index] != key:
+            print('Can not find key!')
+            return
+
+        (path, node) = self.__writablePath(path, node)
+        if node.isLeaf():
+            del node.keys[index]
+        
+        # Search most right of left child and swap it
+        else:
+            path.append((node, index))
+            curNode = self.__writable(node, index)
+            while not curNode.isLeaf():
+                path.append((curNode, len(curNode.children) - 1))
+                curNode = self.__writable(curNode, len(curNode.children) - 1)
+
+            node.keys[index] = curNode.keys.pop()
+            node = curNode
+
+        node.size -= 1
+        for (parent, _) in path:
+            parent.size -= 1
+        self.__fixUnderflow(path, node)
+
+        return key
+
+    def insert_many(self, keys : Iterable[int]) -> int:
+        '''
+        Insert a batch of keys, return number of inserted keys (keys already in tree are skipped).
+        Batch is sorted and partitioned across children in a single descent,
+        each leaf merges its keys at once and each overflow node is split once per batch.
+        '''
+        batch = sorted(set(keys))
+        if len(batch) == 0:
+            return 0
+
+        (inserted, pieces) = self.__insertBatch(self.__writable(), batch, 0, len(batch))
+
+        # Root has been split -> new root on top of pieces, it can be overflow too with a large batch
+        while len(pieces) > 0:
+            self.root = self.__newNode(keys=[sep for (sep, _) in pieces], children=[self.root] + [piece for (_, piece) in pieces])
+            pieces = self.__splitPieces(self.root) if len(self.root.keys) > self.__order - 1 else []
+
+        return inserted
+
+    def delete_many(self, keys : Iterable[int]) -> int:
+        '''
+        Delete a batch of keys, return number of deleted keys (keys not in tree are skipped).
+        Batch is sorted and partitioned across children in a single descent and each leaf drops its keys at once,
+        then every underflow leaf is fixed once. Keys in internal nodes are deleted one by one at the end.
+        '''
+        batch = sorted(set(keys))
+        if len(batch) == 0:
+            return 0
+
+        internalKeys : List[int] = []
+        underflowKeys : List[int] = []
+        deleted = self.__deleteBatch(self.__writable(), batch, 0, len(batch), internalKeys, underflowKeys)
+
+        for key in underflowKeys:
+            self.__fixBatchUnderflow(key)
+
+        for key in internalKeys:
+            self.delete(key)
+
+        return deleted + len(internalKeys)
+
+    def snapshot(self) -> 'BTreeSnapshot':
+        '''
+        Return a read-only view of the tree at this time in O(1).
+        The view shares all nodes with the tree, later changes copy the nodes they modify (copy-on-write),
+        so the view can be read from other threads while the tree keeps changing.
+        Old nodes are released when no snapshot refers to them.
+        '''
+        snapshot = BTreeSnapshot.__new__(BTreeSnapshot)
+        snapshot.__dict__.update(self.__dict__)
+        self.__epoch += 1
+        return snapshot
+
+    def range(self, lo : int = None, hi : int = None, reverse : bool = False) -> Iterator[int]:
+        '''
+        Generate keys in range [lo, hi) in increasing order, or decreasing order if reverse is True.
+        None bound means no limit. Tree must not be changed while generating.
+        '''
+        if reverse:
+            yield from self.__reverseRange(lo, hi)
+            return
+
+        # Stack of (node, index of next key), descend once to lo
+        stack : List[Tuple[BTreeNode, int]] = []
+        curNode = self.root
+        while True:
+            i = 0 if lo is None else bisect_left(curNode.keys, lo)
+            stack.append((curNode, i))
+            if curNode.isLeaf():
+                break
+            curNode = curNode.children[i]
+
+        while len(stack) > 0:
+            (curNode, i) = stack.pop()
+            if i == len(curNode.keys):
+                continue
+
+            key = curNode.keys[i]
+            if hi is not None and key >= hi:
+                return
+            yield key
+            stack.append((curNode, i + 1))
+
+            # Next key is the most left key of right child
+            if not curNode.isLeaf():
+                curNode = curNode.children[i + 1]
+                while True:
+                    stack.append((curNode, 0))
+                    if curNode.isLeaf():
+                        break
+                    curNode = curNode.children[0]
+
+    def __iter__(self) -> Iterator[int]:
+        return self.range()
+
+    def dot_lines(self, start : int = None, maxDepth : int = None, maxNodes : int = None) -> Iterator[str]:
+        '''
+        Generate tree in DOT format line by line, so large trees can be streamed to a file
+        + start: draw the subtree of the node containing this key, whole tree if None
+        + maxDepth: number of levels drawn below the first node, all levels if None
+        + maxNodes: number of nodes drawn, all nodes if None
+        Children that are cut off are collapsed into one summary node with their number of keys
+        '''
+        startNode = self.root if start is None else self.search(start)[0]
+        if startNode is None:
+            raise Exception("Can not find key!")
+
+        yield 'digraph btree {'
+        yield '    node [shape=record, height=.1];'
+        # Queue of (node, depth), nodes are drawn in level order
+        waitNodes = deque([(startNode, 0)])
+        drawn = 1
+        while len(waitNodes) > 0:
+            (curNode, depth) = waitNodes.popleft()
+            name = 'n{}'.format(id(curNode))
+
+            # Create a node
+            label = "<f0> "
+            for i in range(len(curNode.keys)):
+                label += "| <f{}> {}| <f{}>".format(2*i + 1, curNode.keys[i], 2*i + 2)
+            yield '    {} [label="{}"];'.format(name, label)
+            if curNode.isLeaf():
+                continue
+
+            # Collapse all children if they are too deep or over the node limit
+            if (maxDepth is not None and depth >= maxDepth) or (maxNodes is not None and drawn + len(curNode.children) > maxNodes):
+                yield '    {}s [label="... {} keys", shape=box, style=dashed];'.format(name, curNode.size - curNode.countedKeys())
+                yield '    {} -> {}s;'.format(name, name)
+                continue
+
+            # Create edges from this node to its children
+            drawn += len(curNode.children)
+            for (i, child) in enumerate(curNode.children):
+                yield '    {}:f{} -> n{};'.format(name, 2 * i, id(child))
+                waitNodes.append((child, depth + 1))
+        yield '}'
+
+    def save_dot(self, fileName : str, start : int = None, maxDepth : int = None, maxNodes : int = None) -> None:
+        '''
+        Stream tree in DOT format to a file, see dot_lines for the options
+        '''
+        with open(fileName, 'w') as f:
+            for line in self.dot_lines(start, maxDepth, maxNodes):
+                f.write(line + '\n')
+
+    def show(self, fileName = None, start : int = None, maxDepth : int = None, maxNodes : int = None, render : bool = True):
+        '''
+        Save tree to .gv file, then render .pdf file and display tree using graphviz
+        + start, maxDepth, maxNodes: see dot_lines
+        + render: only save the .gv file if False
+        '''
+        fileName = './btree.gv' if fileName is None else fileName
+        self.save_dot(fileName, start, maxDepth, maxNodes)
+        if render:
+            import graphviz
+            graphviz.view(graphviz.render('dot', 'pdf', fileName))
+
+    def __reverseRange(self, lo : int, hi : int) -> Iterator[int]:
+        '''
+        Generate keys in range [lo, hi) in decreasing order
+        '''
+        # Stack of (node, index after next key), descend once to hi
+        stack : List[Tuple[BTreeNode, int]] = []
+        curNode = self.root
+        while True:
+            i = len(curNode.keys) if hi is None else bisect_left(curNode.keys, hi)
+            stack.append((curNode, i))
+            if curNode.isLeaf():
+                break
+            curNode = curNode.children[i]
+
+        while len(stack) > 0:
+            (curNode, i) = stack.pop()
+            if i == 0:
+                continue
+
+            key = curNode.keys[i - 1]
+            if lo is not None and key < lo:
+                return
+            yield key
+            stack.append((curNode, i - 1))
+
+            # Next key is the most right key of left child
+            if not curNode.isLeaf():
+                curNode = curNode.children[i - 1]
+                while True:
+                    stack.append((curNode, len(curNode.keys)))
+                    if curNode.isLeaf():
+                        break
+                    curNode = curNode.children[-1]
+
+    def __newNode(self, keys : List[int] = None, children : List[BTreeNode] = None) -> BTreeNode:
+        '''
+        Create a node owned by the current epoch of the tree
+        '''
+        node = self.__nodeType(keys=keys, children=children)
+        node.epoch = self.__epoch
+        return node
+
+    def __writable(self, parent : BTreeNode = None, index : int = 0) -> BTreeNode:
+        '''
+        Return child at index of parent (or root if parent is None) that can be changed.
+        If the node is shared with a snapshot, replace it with a copy first. Parent must be writable.
+        '''
+        node = self.root if parent is None else parent.children[index]
+        if node.epoch == self.__epoch:
+            return node
+
+        node = self.__newNode(keys=node.keys[:], children=node.children[:])
+        if parent is None:
+            self.root = node
+        else:
+            parent.children[index] = node
+        return node
+
+    def __searchPath(self, key : int) -> Tuple[List[Tuple[BTreeNode, int]], BTreeNode, int]:
+        '''
+        Return path of (node, child index) from root, the node containing key or the leaf to insert, and index of key.
+        Nodes are not copied, so a search that changes nothing keeps sharing them with snapshots (see __writablePath).
+        '''
+        path : List[Tuple[BTreeNode, int]] = []
+        curNode = self.root
+        while True:
+            i = bisect_left(curNode.keys, key)
+            if (i < len(curNode.keys) and curNode.keys[i] == key) or curNode.isLeaf():
+                return (path, curNode, i)
+
+            path.append((curNode, i))
+            curNode = curNode.children[i]
+
+    def __writablePath(self, path : List[Tuple[BTreeNode, int]], node : BTreeNode) -> Tuple[List[Tuple[BTreeNode, int]], BTreeNode]:
+        '''
+        Make nodes of a path from __searchPath and its last node writable, return the writable path and node.
+        Call it only once the key is known to be inserted or deleted.
+        '''
+        # A node of the current epoch is only reached through nodes of the current epoch -> nothing to copy
+        if node.epoch == self.__epoch:
+            return (path, node)
+
+        writablePath : List[Tuple[BTreeNode, int]] = []
+        curNode = self.__writable()
+        for (_, i) in path:
+            writablePath.append((curNode, i))
+            curNode = self.__writable(curNode, i)
+        return (writablePath, curNode)
+        
+    def __fixUnderflow(self, path : List[Tuple[BTreeNode, int]], node : BTreeNode) -> None:
+        '''
+        Fix underflow nodes from node up to the root along path
+        '''
+        # Case 1 : node is not underflow -> stop
+        while len(path) > 0 and len(node.keys) < self.__minKeys:
+            (parent, index) = path.pop()
+            node = self.__rebalance(parent, index)
+
+            # Node can be far from minimum after a batch delete -> keep rebalancing while it has a sibling
+            while len(node.keys) < self.__minKeys and len(parent.children) > 1:
+                if index == len(parent.children) or parent.children[index] is not node:
+                    index -= 1
+                node = self.__rebalance(parent, index)
+            node = parent
+
+        # Empty root -> its only child become new root
+        if len(path) == 0:
+            while len(self.root.keys) == 0 and len(self.root.children) > 0:
+                self.root = self.root.children[0]
+
+    def __rebalance(self, parent : BTreeNode, index : int) -> BTreeNode:
+        '''
+        Fix underflow child at index of parent by rotating or merging with a sibling, return the node that contains its keys
+        '''
+        node = parent.children[index]
+
+        # Case 2: Right sibling has at least m/2 keys -> Rotate left
+        if index < len(parent.keys) and len(parent.children[index + 1].keys) > self.__minKeys:
+            rightSibling = self.__writable(parent, index + 1)
+
+            node.keys.append(parent.keys[index])
+            parent.keys[index] = rightSibling.keys.pop(0)
+            moved = 1
+            
+            if len(rightSibling.children) > 0:
+                node.children.append(rightSibling.children.pop(0))
+                moved += node.children[-1].size
+
+            node.size += moved
+            rightSibling.size -= moved
+            return node
+
+        # Case 3: Left sibling has at least m/2 keys -> Rotate right
+        if index > 0 and len(parent.children[index - 1].keys) > self.__minKeys:
+            leftSibling = self.__writable(parent, index - 1)
+
+            node.keys.insert(0, parent.keys[index - 1])
+            parent.keys[index - 1] = leftSibling.keys.pop()
+            moved = 1
+            
+            if len(leftSibling.children) > 0:
+                node.children.insert(0, leftSibling.children.pop())
+                moved += node.children[0].size
+
+            node.size += moved
+            leftSibling.size -= moved
+            return node
+
+        # Case 4: Both left and right sibling has at most m/2 - 1 keys -> merge right sibling into node
+        if index < len(parent.keys):
+            rightSibling = parent.children.pop(index + 1)
+
+            node.keys.append(parent.keys.pop(index))
+            node.keys.extend(rightSibling.keys)
+            node.children.extend(rightSibling.children)
+            node.size += 1 + rightSibling.size
+            return node
+
+        # Case 5: node is the last child -> merge node into left sibling
+        leftSibling = self.__writable(parent, index - 1)
+
+        leftSibling.keys.append(parent.keys.pop(index - 1))
+        leftSibling.keys.extend(node.keys)
+        leftSibling.children.extend(node.children)
+        leftSibling.size += 1 + node.size
+        del parent.children[index]
+        return leftSibling
+
+    def __splitNode(self, path : List[Tuple[BTreeNode, int]], node : BTreeNode) -> None:
+        '''
+        Split overflow nodes from node up to the root along path
+        '''
+        while len(node.keys) > self.__order - 1:
+            medianPosition = len(node.keys) // 2
+
+            # If root node, create new root node
+            if len(path) == 0:
+                parent = self.__newNode(keys=[], children=[node])
+                nodeIndex = 0
+                self.root = parent
+            else:
+                (parent, nodeIndex) = path.pop()
+
+            # Keep left part in node and move right part of median to new right node
+            # Example (order 3):
+            #                         [2]
+            #   [1, 2, 3]    ->      /   \
+            #                      [1]   [3]
+            rightNode = self.__newNode(keys=node.keys[medianPosition + 1 :], children=node.children[medianPosition + 1 :])
+            parent.keys.insert(nodeIndex, node.keys[medianPosition])
+            del node.keys[medianPosition :]
+            del node.children[medianPosition + 1 :]
+            node.size -= rightNode.size + 1
+
+            parent.children.insert(nodeIndex + 1, rightNode)
+
+            # If parent is full -> repeat split parent node
+            node = parent
+
+    def __insertBatch(self, node : BTreeNode, batch : List[int], lo : int, hi : int) -> Tuple[int, List[Tuple[int, BTreeNode]]]:
+        '''
+        Insert sorted keys batch[lo:hi] into subtree of node,
+        return number of inserted keys and (separator, new right node) pieces split from node
+        '''
+        inserted = 0
+        if node.isLeaf():
+            # Keys are sorted -> each one is inserted after the previous one, skip duplicates
+            i = 0
+            for j in range(lo, hi):
+                i = bisect_left(node.keys, batch[j], i)
+                if i == len(node.keys) or node.keys[i] != batch[j]:
+                    node.keys.insert(i, batch[j])
+                    inserted += 1
+        else:
+            # Partition batch by keys of node, only visit children that receive keys
+            parts : List[Tuple[int, int, int]] = []
+            start = lo
+            while start < hi:
+                i = bisect_left(node.keys, batch[start])
+                if i < len(node.keys) and node.keys[i] == batch[start]:
+                    start += 1
+                    continue
+                end = hi if i == len(node.keys) else bisect_left(batch, node.keys[i], start, hi)
+                parts.append((i, start, end))
+                start = end
+
+            # Pieces of a split child are placed right after it, from right to left so indexes of left children stay valid
+            for (i, start, end) in reversed(parts):
+                (count, pieces) = self.__insertBatch(self.__writable(node, i), batch, start, end)
+                inserted += count
+                for (j, (sep, piece)) in enumerate(pieces):
+                    node.keys.insert(i + j, sep)
+                    node.children.insert(i + j + 1, piece)
+
+        node.size += inserted
+        return (inserted, self.__splitPieces(node) if len(node.keys) > self.__order - 1 else [])
+
+    def __splitPieces(self, node : BTreeNode) -> List[Tuple[int, BTreeNode]]:
+        '''
+        Split an overflow node into as few nodes as possible with balanced number of keys.
+        Node keeps the first piece, return (separator, new right node) for the others.
+        '''
+        keys = node.keys
+        children = node.children
+        count = len(keys) // self.__order + 1
+        (perPiece, extra) = divmod(len(keys) - count + 1, count)
+
+        firstEnd = position = perPiece + (1 if extra > 0 else 0)
+        pieces : List[Tuple[int, BTreeNode]] = []
+        for i in range(1, count):
+            pieceKeys = perPiece + (1 if i < extra else 0)
+            piece = self.__newNode(keys=keys[position + 1 : position + 1 + pieceKeys], children=children[position + 1 : position + 2 + pieceKeys])
+            pieces.append((keys[position], piece))
+            position += 1 + pieceKeys
+
+        del node.keys[firstEnd :]
+        del node.children[firstEnd + 1 :]
+        node.size -= sum(piece.size for (_, piece) in pieces) + len(pieces)
+        return pieces
+
+    def __deleteBatch(self, node : BTreeNode, batch : List[int], lo : int, hi : int, internalKeys : List[int], underflowKeys : List[int]) -> int:
+        '''
+        Delete sorted keys batch[lo:hi] found in leaves of subtree of node, return number of deleted keys.
+        Keys found in internal nodes are added to internalKeys,
+        a key routed to each leaf left underflow is added to underflowKeys.
+        '''
+        deleted = 0
+        if node.isLeaf():
+            i = 0
+            for j in range(lo, hi):
+                i = bisect_left(node.keys, batch[j], i)
+                if i < len(node.keys) and node.keys[i] == batch[j]:
+                    del node.keys[i]
+                    deleted += 1
+
+            if deleted > 0 and len(node.keys) < self.__minKeys and node is not self.root:
+                underflowKeys.append(batch[lo])
+        else:
+            start = lo
+            while start < hi:
+                i = bisect_left(node.keys, batch[start])
+                if i < len(node.keys) and node.keys[i] == batch[start]:
+                    internalKeys.append(batch[start])
+                    start += 1
+                    continue
+                end = hi if i == len(node.keys) else bisect_left(batch, node.keys[i], start, hi)
+                deleted += self.__deleteBatch(self.__writable(node, i), batch, start, end, internalKeys, underflowKeys)
+                start = end
+
+        node.size -= deleted
+        return deleted
+
+    def __fixBatchUnderflow(self, key : int) -> None:
+        '''
+        Fix underflow nodes on the path to key until there is none.
+        A node can be left underflow when its parent has no other child, so descend again after each fix.
+        '''
+        while True:
+            path : List[Tuple[BTreeNode, int]] = []
+            underflow : Tuple[int, BTreeNode] = None
+            curNode = self.__writable()
+            while True:
+                if curNode is not self.root and len(curNode.keys) < self.__minKeys:
+                    underflow = (len(path), curNode)
+                if curNode.isLeaf():
+                    break
+                i = bisect_left(curNode.keys, key)
+                path.append((curNode, i))
+                curNode = self.__writable(curNode, i)
+
+            if underflow is None:
+                return
+
+            # Fix the deepest underflow node
+            (depth, node) = underflow
+            self.__fixUnderflow(path[: depth], node)
+
+class BTreeSnapshot(BTree):
+    '''
+    # B-Tree Snapshot
+    
+        Read-only version of a B-Tree returned by BTree.snapshot():
+        + Shares nodes with the tree, the tree copies a shared node before changing it
+        + Search, range, rank, select and count see the tree at the time of snapshot
+        + Insert and delete raise exception
+    '''
+
+    def insert(self, key : int) -> None:
+        raise Exception("Snapshot is read-only")
+
+    def delete(self, key : int) -> int:
+        raise Exception("Snapshot is read-only")
+
+    def insert_many(self, keys : Iterable[int]) -> int:
+        raise Exception("Snapshot is read-only")
+
+    def delete_many(self, keys : Iterable[int]) -> int:
+        raise Exception("Snapshot is read-only")
+
+    def snapshot(self) -> 'BTreeSnapshot':
+        return self
+
+class BPlusTreeNode(BTreeNode):
+    '''
+    # B+Tree Node
+    
+        A B+Tree Node contains:
+        + All keys of node (separator keys if node is internal)
+        + All values of keys (only leaf node)
+        + All children of node
+        + Links to previous and next leaf (only leaf node)
+        + Number of keys in leaves of subtree of this node (separators are not counted)
+    '''
+    __slots__ = ('values', 'prev', 'next')
+
+    def __init__(self, keys : List[int] = None, values : List[object] = None, children = None) -> None:
+        super().__init__(keys, children)
+        if len(self.children) > 0:
+            self.size = sum(child.size for child in self.children)
+        # A new leaf starts with an empty list of values
+        self.values : List[object] = ([] if len(self.children) == 0 else None) if values is None else values
+        self.prev : BPlusTreeNode = None
+        self.next : BPlusTreeNode = None
+
+    def countedKeys(self) -> int:
+        '''
+        Return number of keys of this node counted in size, separators of internal nodes are not counted
+        '''
+        return len(self.keys) if self.isLeaf() else 0
+
+class BPlusTree(BTree):
+    '''
+    # B+Tree
+    
+        B+Tree features:
+        + Same balance rules as B-Tree.
+        + Values are stored only in leaves, internal nodes contain separator keys only.
+        + Keys in child i of an internal node are in range [keys[i - 1], keys[i]).
+        + Leaves are linked from left to right -> range scans follow the leaf chain without going back up the tree.
+    '''
+
+    nodeType : type = BPlusTreeNode
+
+    def __init__(self, order : int) -> None:
+        # Leaves keep values next to keys, there are no compact B+Tree nodes
+        super().__init__(order)
+
+    def search(self, key : int) -> Tuple[BPlusTreeNode, int]:
+        '''
+        Return leaf node and index of key in this node. Return (None, -1) if not found
+        '''
+        leaf = self.__searchLeaf(key)
+        i = bisect_left(leaf.keys, key)
+        if i < len(leaf.keys) and leaf.keys[i] == key:
+            return (leaf, i)
+        return (None, -1)
+
+    def get(self, key : int, default : object = None) -> object:
+        '''
+        Return value of key, return default if not found
+        '''
+        (leaf, index) = self.search(key)
+        if leaf is None:
+            return default
+        return leaf.values[index]
+
+    def rank(self, key : int) -> int:
+        '''
+        Return number of keys less than key
+        '''
+        result = 0
+        curNode = self.root
+        while not curNode.isLeaf():
+            i = bisect_right(curNode.keys, key)
+            for j in range(i):
+                result += curNode.children[j].size
+            curNode = curNode.children[i]
+        return result + bisect_left(curNode.keys, key)
+
+    def select(self, k : int) -> int:
+        '''
+        Return the k-th smallest key (k starts from 0)
+        '''
+        if k < 0 or k >= self.root.size:
+            raise IndexError("Index of key is out of range")
+
+        curNode = self.root
+        while not curNode.isLeaf():
+            i = 0
+            while k >= curNode.children[i].size:
+                k -= curNode.children[i].size
+                i += 1
+            curNode = curNode.children[i]
+        return curNode.keys[k]
+
+    @classmethod
+    def bulk_load(cls, sorted_iterable : Iterable[Tuple[int, object]], order : int, fill_factor : float = 1.0):
+        '''
+        Build a B+Tree bottom-up from (key, value) pairs sorted by unique keys in a single pass.
+        Leaves are packed and linked from left to right, first key of each new leaf is copied up as separator.
+        '''
+        tree : BPlusTree = cls(order)
+        capacity = bulkCapacity(order, tree.minKeys, fill_factor)
+        newParent = lambda children: BPlusTreeNode(keys=[], children=children)
+
+        # Right-most (open) node of each level, leaves first
+        levels : List[BPlusTreeNode] = [tree.root]
+        lastKey = None
+        for (key, value) in sorted_iterable:
+            if lastKey is not None and key <= lastKey:
+                raise Exception("Keys must be sorted in increasing order and unique")
+            lastKey = key
+
+            leaf = levels[0]
+            if len(leaf.keys) < capacity:
+                leaf.keys.append(key)
+                leaf.values.append(value)
+                continue
+
+            # Leaf is full -> start a new leaf and copy its first key to parent as separator
+            newLeaf = BPlusTreeNode(keys=[key], values=[value])
+            leaf.next = newLeaf
+            newLeaf.prev = leaf
+            bulkSeparator(levels, capacity, key, newLeaf, newParent)
+
+        bulkFinish(tree, levels, tree.minKeys, tree.__rebalance, tree.__fixUnderflow)
+        return tree
+
+    def insert(self, key : int, value : object = None) -> None:
+        '''
+        Insert new key with value to B+Tree, replace the value if key has been in tree
+        '''
+        (path, leaf) = self.__searchPath(key)
+        i = bisect_left(leaf.keys, key)
+        if i < len(leaf.keys) and leaf.keys[i] == key:
+            leaf.values[i] = value
+            return
+
+        # Insert to leaf, if leaf is overflow -> split leaf
+        leaf.keys.insert(i, key)
+        leaf.values.insert(i, value)
+        leaf.size += 1
+        for (parent, _) in path:
+            parent.size += 1
+        if len(leaf.keys) > self.order - 1:
+            self.__splitNode(path, leaf)
+
+    def delete(self, key : int) -> object:
+        '''
+        Search and delete a key in B+Tree, return value of the deleted key
+        '''
+        (path, leaf) = self.__searchPath(key)
+        index = bisect_left(leaf.keys, key)
+        if index >= len(leaf.keys) or leaf.keys[index] != key:
+            print('Can not find key!')
+            return
+
+        del leaf.keys[index]
+        value = leaf.values.pop(index)
+        leaf.size -= 1
+        for (parent, _) in path:
+            parent.size -= 1
+        self.__fixUnderflow(path, leaf)
+        return value
+
+    def insert_many(self, items : Iterable[Tuple[int, object]]) -> int:
+        '''
+        Insert a batch of (key, value) pairs in key order, return number of new keys
+        '''
+        size = len(self)
+        for (key, value) in sorted(items, key=lambda item: item[0]):
+            self.insert(key, value)
+        return len(self) - size
+
+    def delete_many(self, keys : Iterable[int]) -> int:
+        '''
+        Delete a batch of keys in key order, return number of deleted keys (keys not in tree are skipped)
+        '''
+        size = len(self)
+        for key in sorted(set(keys)):
+            if self.search(key)[0] is not None:
+                self.delete(key)
+        return size - len(self)
+
+    def snapshot(self) -> BTreeSnapshot:
+        # Copying a leaf would need to copy its neighbours in the leaf chain, and so on for all leaves
+        raise Exception("Snapshot is not supported by B+Tree, leaves are linked")
+
+    def range(self, lo : int = None, hi : int = None, reverse : bool = False) -> Iterator[int]:
+        '''
+        Generate keys in range [lo, hi) by following the leaf chain
+        '''
+        for (key, _) in self.items(lo, hi, reverse):
+            yield key
+
+    def items(self, lo : int = None, hi : int = None, reverse : bool = False) -> Iterator[Tuple[int, object]]:
+        '''
+        Generate (key, value) pairs in range [lo, hi) in increasing order, or decreasing order if reverse is True.
+        None bound means no limit. Tree must not be changed while generating.
+        '''
+        if reverse:
+            # Descend once to the leaf of the last key less than hi, then go to previous leaves
+            leaf = self.root
+            while not leaf.isLeaf():
+                leaf = leaf.children[len(leaf.keys) if hi is None else bisect_left(leaf.keys, hi)]
+            i = len(leaf.keys) if hi is None else bisect_left(leaf.keys, hi)
+
+            while leaf is not None:
+                while i > 0:
+                    i -= 1
+                    if lo is not None and leaf.keys[i] < lo:
+                        return
+                    yield (leaf.keys[i], leaf.values[i])
+                leaf = leaf.prev
+                if leaf is not None:
+                    i = len(leaf.keys)
+            return
+
+        # Descend once to the leaf of lo, then go to next leaves
+        leaf = self.__searchLeaf(lo)
+        i = 0 if lo is None else bisect_left(leaf.keys, lo)
+
+        while leaf is not None:
+            while i < len(leaf.keys):
+                if hi is not None and leaf.keys[i] >= hi:
+                    return
+                yield (leaf.keys[i], leaf.values[i])
+                i += 1
+            leaf = leaf.next
+            i = 0
+
+    def __searchLeaf(self, key : int) -> BPlusTreeNode:
+        '''
+        Return the leaf that key belongs to, the most left leaf if key is None
+        '''
+        curNode = self.root
+        while not curNode.isLeaf():
+            curNode = curNode.children[0 if key is None else bisect_right(curNode.keys, key)]
+        return curNode
+
+    def __searchPath(self, key : int) -> Tuple[List[Tuple[BPlusTreeNode, int]], BPlusTreeNode]:
+        '''
+        Return path of (node, child index) from root and the leaf that key belongs to
+        '''
+        path : List[Tuple[BPlusTreeNode, int]] = []
+        curNode = self.root
+        while not curNode.isLeaf():
+            i = bisect_right(curNode.keys, key)
+            path.append((curNode, i))
+            curNode = curNode.children[i]
+        return (path, curNode)
+
+    def __fixUnderflow(self, path : List[Tuple[BPlusTreeNode, int]], node : BPlusTreeNode) -> None:
+        '''
+        Fix underflow nodes from node up to the root along path
+        '''
+        while len(path) > 0 and len(node.keys) < self.minKeys:
+            (parent, index) = path.pop()
+            self.__rebalance(parent, index)
+            node = parent
+
+        # Empty root -> its only child become new root
+        if len(path) == 0 and len(node.keys) == 0 and len(node.children) > 0:
+            self.root = node.children[0]
+
+    def __rebalance(self, parent : BPlusTreeNode, index : int) -> BPlusTreeNode:
+        '''
+        Fix underflow child at index of parent by borrowing from or merging with a sibling, return the node that contains its keys
+        '''
+        node = parent.children[index]
+        leftSibling = parent.children[index - 1] if index > 0 else None
+        rightSibling = parent.children[index + 1] if index < len(parent.keys) else None
+
+        if node.isLeaf():
+            # Case 2: Right sibling has more than minimum keys -> borrow its first key
+            if rightSibling is not None and len(rightSibling.keys) > self.minKeys:
+                node.keys.append(rightSibling.keys.pop(0))
+                node.values.append(rightSibling.values.pop(0))
+                node.size += 1
+                rightSibling.size -= 1
+                parent.keys[index] = rightSibling.keys[0]
+                return node
+
+            # Case 3: Left sibling has more than minimum keys -> borrow its last key
+            if leftSibling is not None and len(leftSibling.keys) > self.minKeys:
+                node.keys.insert(0, leftSibling.keys.pop())
+                node.values.insert(0, leftSibling.values.pop())
+                node.size += 1
+                leftSibling.size -= 1
+                parent.keys[index - 1] = node.keys[0]
+                return node
+
+            # Case 4: Merge right sibling into node, separator is dropped
+            if rightSibling is not None:
+                node.keys.extend(rightSibling.keys)
+                node.values.extend(rightSibling.values)
+                node.size += rightSibling.size
+                self.__unlinkLeaf(rightSibling)
+                del parent.keys[index]
+                del parent.children[index + 1]
+                return node
+
+            # Case 5: Merge node into left sibling, separator is dropped
+            leftSibling.keys.extend(node.keys)
+            leftSibling.values.extend(node.values)
+            leftSibling.size += node.size
+            self.__unlinkLeaf(node)
+            del parent.keys[index - 1]
+            del parent.children[index]
+            return leftSibling
+
+        # Internal nodes are fixed like B-Tree nodes, separators rotate through parent
+        # Case 2: Rotate left
+        if rightSibling is not None and len(rightSibling.keys) > self.minKeys:
+            node.keys.append(parent.keys[index])
+            parent.keys[index] = rightSibling.keys.pop(0)
+            node.children.append(rightSibling.children.pop(0))
+            node.size += node.children[-1].size
+            rightSibling.size -= node.children[-1].size
+            return node
+
+        # Case 3: Rotate right
+        if leftSibling is not None and len(leftSibling.keys) > self.minKeys:
+            node.keys.insert(0, parent.keys[index - 1])
+            parent.keys[index - 1] = leftSibling.keys.pop()
+            node.children.insert(0, leftSibling.children.pop())
+            node.size += node.children[0].size
+            leftSibling.size -= node.children[0].size
+            return node
+
+        # Case 4: Merge right sibling into node
+        if rightSibling is not None:
+            node.keys.append(parent.keys.pop(index))
+            node.keys.extend(rightSibling.keys)
+            node.children.extend(rightSibling.children)
+            node.size += rightSibling.size
+            del parent.children[index + 1]
+            return node
+
+        # Case 5: Merge node into left sibling
+        leftSibling.keys.append(parent.keys.pop(index - 1))
+        leftSibling.keys.extend(node.keys)
+        leftSibling.children.extend(node.children)
+        leftSibling.size += node.size
+        del parent.children[index]
+        return leftSibling
+
+    def __splitNode(self, path : List[Tuple[BPlusTreeNode, int]], node : BPlusTreeNode) -> None:
+        '''
+        Split overflow nodes from node up to the root along path
+        '''
+        while len(node.keys) > self.order - 1:
+            medianPosition = len(node.keys) // 2
+
+            # If root node, create new root node
+            if len(path) == 0:
+                parent = BPlusTreeNode(keys=[], children=[node])
+                nodeIndex = 0
+                self.root = parent
+            else:
+                (parent, nodeIndex) = path.pop()
+
+            # Leaf: copy first key of right leaf to parent and link the new leaf
+            if node.isLeaf():
+                rightNode = BPlusTreeNode(keys=node.keys[medianPosition :], values=node.values[medianPosition :])
+                parent.keys.insert(nodeIndex, rightNode.keys[0])
+                del node.keys[medianPosition :]
+                del node.values[medianPosition :]
+
+                rightNode.next = node.next
+                if node.next is not None:
+                    node.next.prev = rightNode
+                rightNode.prev = node
+                node.next = rightNode
+
+            # Internal: move median to parent like B-Tree
+            else:
+                rightNode = BPlusTreeNode(keys=node.keys[medianPosition + 1 :], children=node.children[medianPosition + 1 :])
+                parent.keys.insert(nodeIndex, node.keys[medianPosition])
+                del node.keys[medianPosition :]
+                del node.children[medianPosition + 1 :]
+
+            node.size -= rightNode.size
+            parent.children.insert(nodeIndex + 1, rightNode)
+
+            # If parent is full -> repeat split parent node
+            node = parent
+
+    def __unlinkLeaf(self, leaf : BPlusTreeNode) -> None:
+        '''
+        Remove a leaf from the leaf chain
+        '''
+        if leaf.prev is not None:
+            leaf.prev.next = leaf.next
+        if leaf.next is not None:
+            leaf.next.prev = leaf.prev
+
+if __name__ == "__main__":
+    from random import shuffle
+    from time import time
+    import tracemalloc
+
+    # Benchmark: throughput of insert, search and delete at different orders
+    N = 100000
+    keys = [x for x in range(N)]
+    shuffle(keys)
+    for order in [4, 64, 512]:
+        btree : BTree = BTree(order)
+        t1 = time()
+        for key in keys:
+            btree.insert(key)
+        t2 = time()
+        for key in keys:
+            btree.search(key)
+        t3 = time()
+        for key in keys:
+            btree.delete(key)
+        t4 = time()
+        print("Order {0}: insert {1:.0f} ops/s, search {2:.0f} ops/s, delete {3:.0f} ops/s".format(order, N / (t2 - t1), N / (t3 - t2), N / (t4 - t3)))
+
+        # Build the same tree from sorted keys with bulk load
+        t1 = time()
+        btree = BTree.bulk_load(range(N), order)
+        t2 = time()
+        print("Order {0}: bulk load {1:.0f} keys/s".format(order, N / (t2 - t1)))
+
+        # Insert and delete in batches of 1000 keys into a tree that already has N keys
+        t1 = time()
+        for i in range(0, N, 1000):
+            btree.insert_many(key + N for key in keys[i : i + 1000])
+        t2 = time()
+        for i in range(0, N, 1000):
+            btree.delete_many(keys[i : i + 1000])
+        t3 = time()
+        print("Order {0}: insert_many {1:.0f} keys/s, delete_many {2:.0f} keys/s".format(order, N / (t2 - t1), N / (t3 - t2)))
+
+    # Memory of one million keys: list nodes and compact array nodes
+    for compact in [False, True]:
+        tracemalloc.start()
+        btree = BTree.bulk_load(range(1000000), 256, compact=compact)
+        (memory, _) = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print("{0} nodes: {1:.1f} MB per million keys".format("Compact" if compact else "List", memory / 1000000))
+
+    N = 40
+    btree : BTree = BTree(6)
+    for i in range(1, N + 1):
+        btree.insert(i)
+
+    btree.delete(17)
+    btree.delete(18)
+    print("Keys in [10, 20): ", list(btree.range(10, 20)))
+    print("Keys in [10, 20) reverse: ", list(btree.range(10, 20, reverse=True)))
+    print("Rank of 20: {0}, 10-th smallest key: {1}, number of keys in [10, 20): {2}".format(btree.rank(20), btree.select(10), btree.count(10, 20)))
+    # btree.delete(19)
+
+    # Snapshot does not see later changes of the tree
+    snapshot = btree.snapshot()
+    btree.delete(20)
+    print("Snapshot has {0} keys, tree has {1} keys".format(len(snapshot), len(btree)))
+
+    bptree : BPlusTree = BPlusTree(6)
+    for i in range(1, N + 1):
+        bptree.insert(i, i * i)
+    bptree.delete(17)
+    print("Items in [10, 20): ", list(bptree.items(10, 20)))
+
+    btree.show()
@@ -0,0 +1,674 @@
+import mmap
+import os
+import struct
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Tuple
+
+class PageNode:
+    '''
+    # Page Node
+
+        A B-Tree node decoded from a fixed-size page, contains:
+        + Page id of this node
+        + All keys of node
+        + Page ids of all children (instead of children list and parent link)
+    '''
+    def __init__(self, pageId : int, keys : List[int] = None, children : List[int] = None) -> None:
+        self.pageId : int = pageId
+        self.keys : List[int] = [] if keys is None else keys
+        self.children : List[int] = [] if children is None else children
+
+    def __str__(self) -> str:
+        return "page-" + str(self.pageId)
+
+    def isLeaf(self) -> bool:
+        return len(self.children) == 0
+
+class Pager:
+    '''
+    # Pager
+
+        Store B-Tree nodes in fixed-size pages of a file accessed through mmap:
+        + Page 0 is the meta page: magic, page size, order, root page id, page count, first free page id
+        + Other pages: is leaf flag, number of keys, keys (int64), children page ids (uint64)
+        + Decoded nodes are kept in a bounded LRU cache, dirty nodes are written back when evicted or flushed
+        + If steal is False, dirty nodes are never written back before flush -> the file keeps the last flushed state
+        + Pages of merged nodes are kept in a free list and reused
+    '''
+    MAGIC = b'BTREEPG1'
+    META = struct.Struct('<8sIIQQQ')
+    HEADER = struct.Struct('<BH')
+    FREE = 2
+
+    def __init__(self, fileName : str, pageSize : int = 4096, order : int = None, cacheSize : int = 1024, steal : bool = True) -> None:
+        if cacheSize < 1:
+            raise Exception("Cache size must be at least 1")
+
+        self.cacheSize : int = cacheSize
+        self.steal : bool = steal
+        self.misses : int = 0
+        self.__cache : OrderedDict = OrderedDict()
+        self.__dirty : Dict[int, PageNode] = {}
+        self.__freed : List[int] = []
+
+        isNew = not os.path.exists(fileName) or os.path.getsize(fileName) == 0
+        self.__file = open(fileName, 'w+b' if isNew else 'r+b')
+
+        if isNew:
+            # Largest order that an overflow node (order keys, order + 1 children) still fits in a page
+            if order is None:
+                order = (pageSize - Pager.HEADER.size - 8) // 16
+            if order < 3:
+                raise Exception("The smallest order of B-Tree must be 3")
+            if Pager.HEADER.size + 16 * order + 8 > pageSize:
+                raise Exception("Page size {} is too small for order {}".format(pageSize, order))
+
+            self.pageSize : int = pageSize
+            self.order : int = order
+            self.rootId : int = 1
+            self.pageCount : int = 2
+            self.freeId : int = 0
+
+            self.__file.truncate(self.pageSize * 16)
+            self.__mmap = mmap.mmap(self.__file.fileno(), 0)
+            self.write(PageNode(self.rootId))
+            self.flush()
+        else:
+            self.__mmap = mmap.mmap(self.__file.fileno(), 0)
+            self.reload()
+            if self.__magic != Pager.MAGIC:
+                raise Exception("{} is not a B-Tree file".format(fileName))
+
+    def read(self, pageId : int) -> PageNode:
+        '''
+        Return decoded node of a page, decode from file if it is not in cache
+        '''
+        node = self.__cache.get(pageId, None)
+        if node is not None:
+            self.__cache.move_to_end(pageId)
+            return node
+
+        # Dirty node evicted from cache without steal is still kept in memory
+        node = self.__dirty.get(pageId, None)
+        if node is None:
+            self.misses += 1
+            offset = pageId * self.pageSize
+            (flag, n) = Pager.HEADER.unpack_from(self.__mmap, offset)
+            offset += Pager.HEADER.size
+            keys = list(struct.unpack_from('<{}q'.format(n), self.__mmap, offset))
+            children = [] if flag == 1 else list(struct.unpack_from('<{}Q'.format(n + 1), self.__mmap, offset + 8 * n))
+            node = PageNode(pageId, keys, children)
+
+        self.__cache[pageId] = node
+        self.__evict()
+        return node
+
+    def write(self, node : PageNode) -> None:
+        '''
+        Mark a node as dirty, it is written to file when evicted from cache or flushed
+        '''
+        self.__dirty[node.pageId] = node
+        self.__cache[node.pageId] = node
+        self.__cache.move_to_end(node.pageId)
+        self.__evict()
+
+    def dirtyCount(self) -> int:
+        return len(self.__dirty)
+
+    def allocate(self) -> PageNode:
+        '''
+        Return a new empty node in a free page, grow the file if there is no free page
+        '''
+        if len(self.__freed) > 0:
+            pageId = self.__freed.pop()
+        elif self.freeId != 0:
+            pageId = self.freeId
+            (self.freeId, ) = struct.unpack_from('<Q', self.__mmap, pageId * self.pageSize + Pager.HEADER.size)
+        else:
+            pageId = self.pageCount
+            self.pageCount += 1
+
+        node = PageNode(pageId)
+        self.write(node)
+        return node
+
+    def free(self, pageId : int) -> None:
+        '''
+        Put a page to free list, the free list in file is updated when flushed
+        '''
+        self.__cache.pop(pageId, None)
+        self.__dirty.pop(pageId, None)
+        self.__freed.append(pageId)
+
+    def takeImages(self) -> List[Tuple[int, bytes]]:
+        '''
+        Encode all dirty nodes, freed pages and meta page to (page id, bytes) images, then mark them as clean
+        '''
+        images = [(pageId, self.__encode(node)) for (pageId, node) in self.__dirty.items()]
+        for pageId in self.__freed:
+            images.append((pageId, Pager.HEADER.pack(Pager.FREE, 0) + struct.pack('<Q', self.freeId)))
+            self.freeId = pageId
+        images.append((0, Pager.META.pack(Pager.MAGIC, self.pageSize, self.order, self.rootId, self.pageCount, self.freeId)))
+
+        self.__dirty.clear()
+        self.__freed.clear()
+        return images
+
+    def writePages(self, images : List[Tuple[int, bytes]]) -> None:
+        '''
+        Write page images to file, grow the file if needed
+        '''
+        for (pageId, data) in images:
+            offset = pageId * self.pageSize
+            while offset + self.pageSize > len(self.__mmap):
+                self.__grow()
+            self.__mmap[offset : offset + len(data)] = data
+
+    def sync(self) -> None:
+        '''
+        Flush mmap to disk
+        '''
+        self.__mmap.flush()
+
+    def reload(self) -> None:
+        '''
+        Read meta page again and drop all cached nodes
+        '''
+        (self.__magic, self.pageSize, self.order, self.rootId, self.pageCount, self.freeId) = Pager.META.unpack_from(self.__mmap, 0)
+        self.__cache.clear()
+        self.__dirty.clear()
+        self.__freed.clear()
+
+    def flush(self) -> None:
+        '''
+        Write back all dirty nodes and meta page, then flush mmap to file
+        '''
+        self.writePages(self.takeImages())
+        self.sync()
+
+    def close(self) -> None:
+        '''
+        Flush and close the file
+        '''
+        self.flush()
+        self.__cache.clear()
+        self.__mmap.close()
+        self.__file.close()
+
+    def __evict(self) -> None:
+        '''
+        Evict least recently used nodes while cache is over capacity, write back if dirty and steal is allowed
+        '''
+        while len(self.__cache) > self.cacheSize:
+            (pageId, node) = self.__cache.popitem(last=False)
+            if self.steal and pageId in self.__dirty:
+                del self.__dirty[pageId]
+                self.writePages([(pageId, self.__encode(node))])
+
+    def __encode(self, node : PageNode) -> bytes:
+        '''
+        Serialize a node to bytes of its page
+        '''
+        n = len(node.keys)
+        data = Pager.HEADER.pack(1 if node.isLeaf() else 0, n) + struct.pack('<{}q'.format(n), *node.keys)
+        if not node.isLeaf():
+            data += struct.pack('<{}Q'.format(n + 1), *node.children)
+        return data
+
+    def __grow(self) -> None:
+        '''
+        Double the file size and map it again
+        '''
+        size = len(self.__mmap) * 2
+        self.__mmap.close()
+        self.__file.truncate(size)
+        self.__mmap = mmap.mmap(self.__file.fileno(), 0)
+
+class WriteAheadLog:
+    '''
+    # Write-Ahead Log
+
+        Append-only log of B-Tree changes since the last checkpoint:
+        + Insert and delete records: 1 byte operation + 8 bytes key
+        + Checkpoint: page images (1 byte + page id + length + bytes), then 1 byte checkpoint end mark
+        + Records are buffered and written with one fsync per group of records (group commit)
+        + A torn record at the end of the log (crash while writing) is ignored
+    '''
+    INSERT = b'I'
+    DELETE = b'D'
+    PAGE = b'P'
+    CHECKPOINT = b'C'
+    RECORD = struct.Struct('<cq')
+    PAGE_HEADER = struct.Struct('<cQI')
+
+    def __init__(self, fileName : str, groupSize : int = 64) -> None:
+        if groupSize < 1:
+            raise Exception("Group size must be at least 1")
+
+        self.groupSize : int = groupSize
+        self.__file = open(fileName, 'r+b' if os.path.exists(fileName) else 'w+b')
+        self.__buffer : bytearray = bytearray()
+        self.__count : int = 0
+
+    def append(self, operation : bytes, key : int) -> None:
+        '''
+        Buffer a record, commit when the group is full
+        '''
+        self.__buffer += WriteAheadLog.RECORD.pack(operation, key)
+        self.__count += 1
+        if self.__count >= self.groupSize:
+            self.commit()
+
+    def commit(self) -> None:
+        '''
+        Write buffered records and fsync once
+        '''
+        if self.__count == 0:
+            return
+        self.__file.seek(0, os.SEEK_END)
+        self.__file.write(self.__buffer)
+        self.__sync()
+        self.__buffer.clear()
+        self.__count = 0
+
+    def writeCheckpoint(self, images : List[Tuple[int, bytes]]) -> None:
+        '''
+        Log page images of a checkpoint, the end mark is written only after all images are durable
+        '''
+        self.commit()
+        self.__file.seek(0, os.SEEK_END)
+        for (pageId, data) in images:
+            self.__file.write(WriteAheadLog.PAGE_HEADER.pack(WriteAheadLog.PAGE, pageId, len(data)))
+            self.__file.write(data)
+        self.__sync()
+        self.__file.write(WriteAheadLog.CHECKPOINT)
+        self.__sync()
+
+    def truncate(self) -> None:
+        '''
+        Remove all records after the checkpoint has been applied
+        '''
+        self.__file.seek(0)
+        self.__file.truncate(0)
+        self.__sync()
+
+    def read(self) -> Tuple[List[Tuple[bytes, int]], List[Tuple[int, bytes]]]:
+        '''
+        Return insert / delete records and page images of a complete checkpoint (None if there is no complete checkpoint)
+        '''
+        self.__file.seek(0)
+        data = self.__file.read()
+        records : List[Tuple[bytes, int]] = []
+        images : List[Tuple[int, bytes]] = []
+        offset = 0
+        while offset < len(data):
+            operation = data[offset : offset + 1]
+            if operation == WriteAheadLog.CHECKPOINT:
+                return (records, images)
+
+            if operation == WriteAheadLog.PAGE:
+                if offset + WriteAheadLog.PAGE_HEADER.size > len(data):
+                    break
+                (_, pageId, length) = WriteAheadLog.PAGE_HEADER.unpack_from(data, offset)
+                offset += WriteAheadLog.PAGE_HEADER.size
+                if offset + length > len(data):
+                    break
+                images.append((pageId, data[offset : offset + length]))
+                offset += length
+            elif operation in (WriteAheadLog.INSERT, WriteAheadLog.DELETE):
+                if offset + WriteAheadLog.RECORD.size > len(data):
+                    break
+                records.append(WriteAheadLog.RECORD.unpack_from(data, offset))
+                offset += WriteAheadLog.RECORD.size
+            else:
+                break
+
+        return (records, None)
+
+    def close(self) -> None:
+        self.commit()
+        self.__file.close()
+
+    def __sync(self) -> None:
+        self.__file.flush()
+        os.fsync(self.__file.fileno())
+
+class PagedBTree:
+    '''
+    # Paged B-Tree
+
+        B-Tree stored in a file (same rules as BTree):
+        + Each node is a fixed-size page, children are referred by page id
+        + Nodes do not link to parent -> insert and delete record the path from root to leaf
+        + Only O(height) pages are decoded for a lookup, other pages stay on disk
+        + Changes are written to file by flush() or close()
+        + Insert, delete and range are a separate copy of the BTree algorithm: BTree nodes hold child objects and subtree sizes,
+          paged nodes hold page ids and every change must go through the pager, so bulk load, batch operations,
+          rank / select and snapshots of BTree are not available here
+
+        If durable is True, changes are also logged to a write-ahead log (file name + '-wal'):
+        + Changed pages stay in memory until checkpoint, so the file always keeps the last checkpoint
+        + Log records are committed in groups of groupSize records, or by commit()
+        + On open, the log is replayed on top of the last checkpoint
+        + checkpoint() writes changed pages through the log to the file, then truncates the log
+    '''
+
+    def __init__(self, fileName : str, order : int = None, pageSize : int = 4096, cacheSize : int = 1024, durable : bool = False, groupSize : int = 64) -> None:
+        isNew = not os.path.exists(fileName) or os.path.getsize(fileName) == 0
+        self.pager : Pager = Pager(fileName, pageSize, order, cacheSize, steal=not durable)
+        self.__order : int = self.pager.order
+        self.__minKeys : int = round(self.__order / 2) - 1
+        self.__log : WriteAheadLog = None
+
+        if durable:
+            log = WriteAheadLog(fileName + '-wal', groupSize)
+            if isNew:
+                log.truncate()
+            self.__recover(log)
+            self.__log = log
+
+    def __str__(self) -> str:
+        return "PagedBTree-root: " + str(self.pager.read(self.pager.rootId).keys)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def search(self, key : int) -> Tuple[PageNode, int]:
+        '''
+        Return node and index of key in this node. Return (None, -1) if not found
+        '''
+        curNode = self.pager.read(self.pager.rootId)
+        while True:
+            i = bisect_left(curNode.keys, key)
+            if i < len(curNode.keys) and curNode.keys[i] == key:
+                return (curNode, i)
+
+            if curNode.isLeaf():
+                return (None, -1)
+
+            curNode = self.pager.read(curNode.children[i])
+
+    def isEmpty(self) -> bool:
+        return len(self.pager.read(self.pager.rootId).keys) == 0
+
+    def insert(self, key : int) -> None:
+        '''
+        Insert new key to B-Tree
+        '''
+        (path, node, index) = self.__searchPath(key)
+        if index < len(node.keys) and node.keys[index] == key:
+            print("Key has been in tree!")
+            return
+
+        node.keys.insert(index, key)
+        self.pager.write(node)
+
+        # Split overflow nodes along the path
+        while len(node.keys) > self.__order - 1:
+            medianPosition = len(node.keys) // 2
+            rightNode = self.pager.allocate()
+            rightNode.keys = node.keys[medianPosition + 1 :]
+            rightNode.children = node.children[medianPosition + 1 :]
+            median = node.keys[medianPosition]
+            del node.keys[medianPosition :]
+            del node.children[medianPosition + 1 :]
+
+            # If root node, create new root node
+            if len(path) == 0:
+                parent = self.pager.allocate()
+                parent.keys = [median]
+                parent.children = [node.pageId, rightNode.pageId]
+                self.pager.rootId = parent.pageId
+            else:
+                (parent, nodeIndex) = path.pop()
+                parent.keys.insert(nodeIndex, median)
+                parent.children.insert(nodeIndex + 1, rightNode.pageId)
+
+            self.pager.write(node)
+            self.pager.write(rightNode)
+            self.pager.write(parent)
+            node = parent
+
+        self.__logChange(WriteAheadLog.INSERT, key)
+
+    def delete(self, key : int) -> int:
+        '''
+        Search and delete a key in B-Tree, return the deleted key
+        '''
+        (path, node, index) = self.__searchPath(key)
+        if index >= len(node.keys) or node.keys[index] != key:
+            print('Can not find key!')
+            return
+
+        if node.isLeaf():
+            del node.keys[index]
+
+        # Search most right of left child and swap it
+        else:
+            path.append((node, index))
+            curNode = self.pager.read(node.children[index])
+            while not curNode.isLeaf():
+                path.append((curNode, len(curNode.children) - 1))
+                curNode = self.pager.read(curNode.children[-1])
+
+            node.keys[index] = curNode.keys.pop()
+            self.pager.write(node)
+            node = curNode
+
+        self.pager.write(node)
+        self.__fixUnderflow(path, node)
+        self.__logChange(WriteAheadLog.DELETE, key)
+        return key
+
+    def range(self, lo : int = None, hi : int = None, reverse : bool = False) -> Iterator[int]:
+        '''
+        Generate keys in range [lo, hi) in increasing order, or decreasing order if reverse is True.
+        None bound means no limit. Tree must not be changed while generating.
+        '''
+        # Stack of (node, index of next key in increasing order or index after next key in decreasing order)
+        stack : List[Tuple[PageNode, int]] = []
+        curNode = self.pager.read(self.pager.rootId)
+        while True:
+            if reverse:
+                i = len(curNode.keys) if hi is None else bisect_left(curNode.keys, hi)
+            else:
+                i = 0 if lo is None else bisect_left(curNode.keys, lo)
+            stack.append((curNode, i))
+            if curNode.isLeaf():
+                break
+            curNode = self.pager.read(curNode.children[i])
+
+        while len(stack) > 0:
+            (curNode, i) = stack.pop()
+            if i == (0 if reverse else len(curNode.keys)):
+                continue
+
+            key = curNode.keys[i - 1] if reverse else curNode.keys[i]
+            if (reverse and lo is not None and key < lo) or (not reverse and hi is not None and key >= hi):
+                return
+            yield key
+            stack.append((curNode, i - 1 if reverse else i + 1))
+
+            # Next key is the most right key of left child or the most left key of right child
+            if not curNode.isLeaf():
+                curNode = self.pager.read(curNode.children[i - 1 if reverse else i + 1])
+                while True:
+                    stack.append((curNode, len(curNode.keys) if reverse else 0))
+                    if curNode.isLeaf():
+                        break
+                    curNode = self.pager.read(curNode.children[-1 if reverse else 0])
+
+    def __iter__(self) -> Iterator[int]:
+        return self.range()
+
+    def commit(self) -> None:
+        '''
+        Make all logged changes durable (only for durable tree)
+        '''
+        if self.__log is not None:
+            self.__log.commit()
+
+    def checkpoint(self) -> None:
+        '''
+        Write all changed pages to file. For durable tree, page images are logged first, then the log is truncated
+        '''
+        if self.__log is None:
+            self.pager.flush()
+        else:
+            self.__checkpoint(self.__log)
+
+    def flush(self) -> None:
+        '''
+        Write all changed pages to file
+        '''
+        self.checkpoint()
+
+    def close(self) -> None:
+        '''
+        Flush and close file
+        '''
+        self.checkpoint()
+        self.pager.close()
+        if self.__log is not None:
+            self.__log.close()
+
+    def __logChange(self, operation : bytes, key : int) -> None:
+        '''
+        Log a change, checkpoint when too many changed pages are kept in memory
+        '''
+        if self.__log is None:
+            return
+        self.__log.append(operation, key)
+        if self.pager.dirtyCount() > self.pager.cacheSize:
+            self.__checkpoint(self.__log)
+
+    def __checkpoint(self, log : WriteAheadLog) -> None:
+        '''
+        Log page images, write them to file, then truncate the log.
+        A crash before the checkpoint end mark keeps the file at the last checkpoint,
+        a crash after it is recovered by writing the logged images again.
+        '''
+        images = self.pager.takeImages()
+        log.writeCheckpoint(images)
+        self.pager.writePages(images)
+        self.pager.sync()
+        log.truncate()
+
+    def __recover(self, log : WriteAheadLog) -> None:
+        '''
+        Apply a complete checkpoint in the log, or replay insert / delete records on top of the last checkpoint
+        '''
+        (records, images) = log.read()
+        if images is not None:
+            self.pager.writePages(images)
+            self.pager.sync()
+            self.pager.reload()
+        else:
+            for (operation, key) in records:
+                if operation == WriteAheadLog.INSERT:
+                    self.insert(key)
+                else:
+                    self.delete(key)
+
+        # Start a new log from the recovered state
+        self.__checkpoint(log)
+
+    def __searchPath(self, key : int) -> Tuple[List[Tuple[PageNode, int]], PageNode, int]:
+        '''
+        Return path of (node, child index) from root, the node containing key or the leaf to insert, and index of key
+        '''
+        path : List[Tuple[PageNode, int]] = []
+        curNode = self.pager.read(self.pager.rootId)
+        while True:
+            i = bisect_left(curNode.keys, key)
+            if (i < len(curNode.keys) and curNode.keys[i] == key) or curNode.isLeaf():
+                return (path, curNode, i)
+
+            path.append((curNode, i))
+            curNode = self.pager.read(curNode.children[i])
+
+    def __fixUnderflow(self, path : List[Tuple[PageNode, int]], node : PageNode) -> None:
+        '''
+        Fix underflow nodes from node up to the root along path
+        '''
+        while len(path) > 0 and len(node.keys) < self.__minKeys:
+            (parent, index) = path.pop()
+
+            # Case 1: Right sibling has at least m/2 keys -> Rotate left
+            rightSibling = self.pager.read(parent.children[index + 1]) if index < len(parent.keys) else None
+            leftSibling = self.pager.read(parent.children[index - 1]) if index > 0 else None
+            if rightSibling is not None and len(rightSibling.keys) > self.__minKeys:
+                node.keys.append(parent.keys[index])
+                parent.keys[index] = rightSibling.keys.pop(0)
+                if not rightSibling.isLeaf():
+                    node.children.append(rightSibling.children.pop(0))
+                self.pager.write(rightSibling)
+                self.pager.write(node)
+
+            # Case 2: Left sibling has at least m/2 keys -> Rotate right
+            elif leftSibling is not None and len(leftSibling.keys) > self.__minKeys:
+                node.keys.insert(0, parent.keys[index - 1])
+                parent.keys[index - 1] = leftSibling.keys.pop()
+                if not leftSibling.isLeaf():
+                    node.children.insert(0, leftSibling.children.pop())
+                self.pager.write(leftSibling)
+                self.pager.write(node)
+
+            # Case 3: Merge right sibling into node, then free its page
+            elif rightSibling is not None:
+                node.keys.append(parent.keys.pop(index))
+                node.keys.extend(rightSibling.keys)
+                node.children.extend(rightSibling.children)
+                del parent.children[index + 1]
+                self.pager.free(rightSibling.pageId)
+                self.pager.write(node)
+
+            # Case 4: Merge node into left sibling, then free its page
+            else:
+                leftSibling.keys.append(parent.keys.pop(index - 1))
+                leftSibling.keys.extend(node.keys)
+                leftSibling.children.extend(node.children)
+                del parent.children[index]
+                self.pager.write(leftSibling)
+                self.pager.free(node.pageId)
+
+            self.pager.write(parent)
+            node = parent
+
+        # Empty root -> its only child become new root
+        if len(path) == 0 and len(node.keys) == 0 and not node.isLeaf():
+            self.pager.rootId = node.children[0]
+            self.pager.free(node.pageId)
+
+if __name__ == "__main__":
+    from random import shuffle
+    from time import time
+
+    # Build a paged B-Tree in a file, then search it again with a cold cache
+    N = 100000
+    fileName = './btree.db'
+    if os.path.exists(fileName):
+        os.remove(fileName)
+
+    keys = [x for x in range(N)]
+    shuffle(keys)
+    t1 = time()
+    with PagedBTree(fileName, cacheSize=256) as ptree:
+        for key in keys:
+            ptree.insert(key)
+    t2 = time()
+    print("Insert {0} keys: {1:.0f} ops/s, file size {2} bytes".format(N, N / (t2 - t1), os.path.getsize(fileName)))
+
+    with PagedBTree(fileName, cacheSize=256) as ptree:
+        t1 = time()
+        for key in keys[: 1000]:
+            ptree.search(key)
+        t2 = time()
+        print("Cold search: {0:.0f} ops/s, {1:.2f} pages decoded per search".format(1000 / (t2 - t1), ptree.pager.misses / 1000))
+        print("Keys in [10, 20): ", list(ptree.range(10, 20)))
+
+    os.remove(fileName)
@@ -0,0 +1,3 @@
+'''
+B-Tree, B+Tree and paged B-Tree
+'''
@@ -137,12 +137,14 @@ class DisjointSet_Forest:
         '''
         a = self.findSet(x)
         b = self.findSet(y)
+        if a == b:
+            return
         
         if self.rank[a] > self.rank[b]:
             self.parent[b] = a
         else:
             self.parent[a] = b
-            if self.rank[x] == self.rank[b]:
+            if self.rank[a] == self.rank[b]:
                 self.rank[b] += 1
 
     def findSet(self, x : object) -> DisjointSet_LinkedList.__LinkedListNode:
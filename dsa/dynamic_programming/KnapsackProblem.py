@@ -1,5 +1,3 @@
-from random import random
-from time import time
 from typing import *
 
 
@@ -44,32 +42,36 @@ class Knapsack:
                 i -= 1
         return (self.optimized_cost[n][C], self.optimized_result)
 
-# Testing
-knapsack = Knapsack()
-W = [int(random() * 100) + 1 for x in range(10)]
-W.sort()
-P = [int(random() * 100) for x in range(10)]
-P.sort()
-print("W = ", W)
-print("P = ", P)
-C = 100
-t1 = time()
-result = knapsack.solve(C, W, P)
-print("Optimized cost: ", result[0])
-print("Optimized items: ", result[1])
-t2 = time()
-print("Execution time with C = {0}: {1} seconds".format(C, t2 - t1))
-C = 1000
-t1 = time()
-result = knapsack.solve(C, W, P)
-print("Optimized cost: ", result[0])
-print("Optimized items: ", result[1])
-t2 = time()
-print("Execution time with C = {0}: {1} seconds".format(C, t2 - t1))
-C = 1000000
-t1 = time()
-result = knapsack.solve(C, W, P)
-print("Optimized cost: ", result[0])
-print("Optimized items: ", result[1])
-t2 = time()
-print("Execution time with C = {0}: {1} seconds".format(C, t2 - t1))
\ No newline at end of file
+if __name__ == "__main__":
+    from random import random
+    from time import time
+
+    # Testing
+    knapsack = Knapsack()
+    W = [int(random() * 100) + 1 for x in range(10)]
+    W.sort()
+    P = [int(random() * 100) for x in range(10)]
+    P.sort()
+    print("W = ", W)
+    print("P = ", P)
+    C = 100
+    t1 = time()
+    result = knapsack.solve(C, W, P)
+    print("Optimized cost: ", result[0])
+    print("Optimized items: ", result[1])
+    t2 = time()
+    print("Execution time with C = {0}: {1} seconds".format(C, t2 - t1))
+    C = 1000
+    t1 = time()
+    result = knapsack.solve(C, W, P)
+    print("Optimized cost: ", result[0])
+    print("Optimized items: ", result[1])
+    t2 = time()
+    print("Execution time with C = {0}: {1} seconds".format(C, t2 - t1))
+    C = 1000000
+    t1 = time()
+    result = knapsack.solve(C, W, P)
+    print("Optimized cost: ", result[0])
+    print("Optimized items: ", result[1])
+    t2 = time()
+    print("Execution time with C = {0}: {1} seconds".format(C, t2 - t1))
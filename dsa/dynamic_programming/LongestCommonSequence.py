@@ -44,9 +44,10 @@ class LongestCommonSequence:
 
         return (self.optimized_length[lenA][lenB], self.optimized_result)
 
-# Testing
+if __name__ == "__main__":
+    # Testing
 
-LCS = LongestCommonSequence()
-result = LCS.solve('ABCD', 'ACBDCD')
-print('Longest length: {}'.format(result[0]))
-print('Longest sequence: {}'.format(result[1]))
+    LCS = LongestCommonSequence()
+    result = LCS.solve('ABCD', 'ACBDCD')
+    print('Longest length: {}'.format(result[0]))
+    print('Longest sequence: {}'.format(result[1]))
@@ -1,7 +1,4 @@
-from random import random
-from time import time
 from typing import *
-import numpy as np
 import queue
 
 
@@ -67,10 +64,11 @@ class MatrixChainMultiplication:
         return (self.optimized_scalar[0][n-1], self.optimized_result)
 
 
-# Testing
-MCP = MatrixChainMultiplication()
-
-result = MCP.solve([30, 35, 15, 5, 10, 20, 25])
-print('The minimum multiplications: {}'.format(np.array(result[0])))
-print('The chain of multiplications: {}'.format(result[1]))
+if __name__ == "__main__":
+    # Testing
+    import numpy as np
+    MCP = MatrixChainMultiplication()
 
+    result = MCP.solve([30, 35, 15, 5, 10, 20, 25])
+    print('The minimum multiplications: {}'.format(np.array(result[0])))
+    print('The chain of multiplications: {}'.format(result[1]))
@@ -0,0 +1,3 @@
+'''
+Dynamic Programming problems
+'''
@@ -0,0 +1,554 @@
+from collections import deque
+from math import inf
+from typing import Callable, Dict, Iterable, Iterator, List
+
+
+class HeapTreeNode:
+    '''
+    Heap Tree Node
+    ----
+        Feature of Heap Tree Node:
+        + Contains value (priority) of node and an optional item
+        + Link to parent and to one child, the children form a circular doubly linked list
+        + Link to left and right sibling, so a node is removed from any list in O(1)
+        + Number of children (degree)
+        + Be marked or not
+    '''
+    __slots__ = ('value', 'item', 'parent', 'child', 'left', 'right', 'degree', 'isMarked')
+
+    def __init__(self, value: int, item : object = None) -> None:
+        self.value: int = value
+        self.item: object = item
+        self.parent: HeapTreeNode = None
+        self.child: HeapTreeNode = None
+        self.left: HeapTreeNode = self
+        self.right: HeapTreeNode = self
+        self.degree: int = 0
+        self.isMarked = False
+
+    def __str__(self) -> str:
+        return str(self.value)
+
+    @property
+    def children(self) -> List['HeapTreeNode']:
+        '''
+        List of children, built from the circular list in O(degree)
+        '''
+        return [] if self.child is None else list(self.child.siblings())
+
+    def siblings(self) -> Iterator['HeapTreeNode']:
+        '''
+        Generate this node and its siblings, going right around the circular list
+        '''
+        curNode = self
+        while True:
+            yield curNode
+            curNode = curNode.right
+            if curNode is self:
+                return
+
+    def preorder(self) -> Iterator['HeapTreeNode']:
+        '''
+        Generate nodes of subtree in preorder with a stack
+        '''
+        waitNodes = [self]
+        while len(waitNodes) > 0:
+            curNode = waitNodes.pop()
+            yield curNode
+            waitNodes.extend(reversed(curNode.children))
+
+    def level_order(self) -> Iterator['HeapTreeNode']:
+        '''
+        Generate nodes of subtree in level order with a queue
+        '''
+        waitNodes = deque([self])
+        while len(waitNodes) > 0:
+            curNode = waitNodes.popleft()
+            yield curNode
+            if curNode.child is not None:
+                waitNodes.extend(curNode.child.siblings())
+
+
+class FibonacciHeap:
+    '''
+    Fibonacci Heap
+    ----
+        Features of Fibonacci Heap:
+        + Set of heap-ordered trees.
+        + Roots and children of each node are circular doubly linked lists, min is the entry of root list.
+        + Maintain pointer to minimum element.
+        + Set of marked nodes.
+        + Lazily defer consolidation until next delete-min.
+        + Easily insertion, union and decrease key in O(1), delete min in amortized O(log n)
+        + Union of indexed heaps also merges the smaller index into the larger one: O(min(n, m))
+        + Insert returns the node as a handle for decrease key and delete
+        + Optional index from item to node (FibonacciHeap(indexed=True)), so items can be used instead of handles
+        + Difficultly searching
+    '''
+    def __init__(self, indexed : bool = False) -> None:
+        self.min : HeapTreeNode = None
+        self.size : int = 0
+        self.handles : Dict[object, HeapTreeNode] = {} if indexed else None
+
+    def __str__(self) -> str:
+        return "Fibonacci Heap: " + str(self.min)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, item : object) -> bool:
+        return self.handles is not None and item in self.handles
+
+    def handle(self, item : object) -> HeapTreeNode:
+        '''
+        Return node of an item, the heap must be indexed
+        '''
+        if self.handles is None:
+            raise Exception("Heap is not indexed!")
+        node = self.handles.get(item, None)
+        if node is None:
+            raise Exception("Can not find item!")
+        return node
+
+    @property
+    def roots(self) -> List[HeapTreeNode]:
+        '''
+        List of roots, built from the circular root list in O(number of roots)
+        '''
+        return [] if self.min is None else list(self.min.siblings())
+
+    def dot_lines(self, start : int = None, maxDepth : int = None, maxNodes : int = None) -> Iterator[str]:
+        '''
+        Generate heap in DOT format line by line, so large heaps can be streamed to a file
+        + start: draw the subtree of the node with this value, all trees if None
+        + maxDepth: number of levels drawn below the roots, all levels if None
+        + maxNodes: number of nodes drawn, all nodes if None
+        Children and roots that are cut off are collapsed into one summary node with their number of nodes
+        '''
+        if start is None:
+            roots = self.roots
+        else:
+            node = self.search(start)
+            if node is None:
+                raise Exception("Can not find value!")
+            roots = [node]
+
+        # Min -> red color
+        # Marked -> black color
+        # Other -> green color
+        # Links from roots -> red color
+        # Links from parent to children -> black color
+        nodeLine = lambda node: '    n{} [label="{}", color={}];'.format(id(node), node.value, 'red' if node is self.min else 'black' if node.isMarked else 'green')
+        yield 'graph fibonacci_heap {'
+
+        # Create root nodes and edges from left root to right root
+        shownRoots = roots if maxNodes is None else roots[:max(maxNodes, 1)]
+        waitNodes = deque()
+        lastRoot = None
+        for curRoot in shownRoots:
+            yield nodeLine(curRoot)
+            if lastRoot:
+                yield '    n{} -- n{} [constraint=false, color=red];'.format(id(lastRoot), id(curRoot))
+            waitNodes.append((curRoot, 0))
+            lastRoot = curRoot
+        if len(shownRoots) < len(roots):
+            count = sum(1 for curRoot in roots[len(shownRoots):] for _ in curRoot.preorder())
+            yield '    more [label="... {} nodes in {} trees", shape=box, style=dashed];'.format(count, len(roots) - len(shownRoots))
+            yield '    n{} -- more [constraint=false, color=red];'.format(id(lastRoot))
+
+        # Queue of (node, depth), children are drawn in level order
+        drawn = len(shownRoots)
+        while len(waitNodes) > 0:
+            (curNode, depth) = waitNodes.popleft()
+            if curNode.degree == 0:
+                continue
+            # Collapse all children if they are too deep or over the node limit
+            if (maxDepth is not None and depth >= maxDepth) or (maxNodes is not None and drawn + curNode.degree > maxNodes):
+                count = sum(1 for child in curNode.child.siblings() for _ in child.preorder())
+                yield '    n{}s [label="... {} nodes", shape=box, style=dashed];'.format(id(curNode), count)
+                yield '    n{} -- n{}s;'.format(id(curNode), id(curNode))
+                continue
+            # Create nodes and edges from this node to its children
+            drawn += curNode.degree
+            for child in curNode.child.siblings():
+                yield nodeLine(child)
+                yield '    n{} -- n{};'.format(id(curNode), id(child))
+                waitNodes.append((child, depth + 1))
+        yield '}'
+
+    def save_dot(self, fileName : str, start : int = None, maxDepth : int = None, maxNodes : int = None) -> None:
+        '''
+        Stream heap in DOT format to a file, see dot_lines for the options
+        '''
+        with open(fileName, 'w') as f:
+            for line in self.dot_lines(start, maxDepth, maxNodes):
+                f.write(line + '\n')
+
+    def show(self, fileName : str = None, start : int = None, maxDepth : int = None, maxNodes : int = None, render : bool = True) -> None:
+        '''
+        Save heap to .gv file, then render pdf and display heap
+        + start, maxDepth, maxNodes: see dot_lines
+        + render: only save the .gv file if False
+        '''
+        if self.is_empty():
+            print('Empty Heap!')
+            return
+
+        # Save and render image
+        if fileName is None:
+            fileName = './fibonacci-heap.gv'
+        self.save_dot(fileName, start, maxDepth, maxNodes)
+        if render:
+            import graphviz
+            graphviz.view(graphviz.render('dot', 'pdf', fileName))
+
+    def is_empty(self) -> bool:
+        '''
+        Return True if min is None, that is root list is empty
+        '''
+        return self.min is None
+
+    def search(self, value : int) -> HeapTreeNode:
+        '''
+        Search a node with value equal given value
+        '''
+        if self.is_empty() or value < self.min.value:
+            return None
+
+        # If value < value of node -> do not traverse the node children
+        # Traverse all root with a stack
+        for curRoot in self.min.siblings():
+            waitNodes = [curRoot]
+            while len(waitNodes) > 0:
+                curNode = waitNodes.pop()
+                if curNode.value == value:
+                    return curNode
+                elif value > curNode.value and curNode.child is not None:
+                    waitNodes.extend(curNode.child.siblings())
+
+        return None
+
+    def preorder(self) -> Iterator[HeapTreeNode]:
+        '''
+        Generate all nodes, each tree in preorder
+        '''
+        for curRoot in self.roots:
+            yield from curRoot.preorder()
+
+    def level_order(self) -> Iterator[HeapTreeNode]:
+        '''
+        Generate all nodes, each tree in level order
+        '''
+        for curRoot in self.roots:
+            yield from curRoot.level_order()
+
+    def insert(self, value: int, item : object = None) -> HeapTreeNode:
+        '''
+        Insert new node with value (priority) and item to roots list, update min and return the node as a handle
+        '''
+        node = HeapTreeNode(value=value, item=item)
+        if self.handles is not None and item is not None:
+            if item in self.handles:
+                raise Exception("Item is already in heap!")
+            self.handles[item] = node
+
+        self.insert_root(node)
+        self.size += 1
+        return node
+
+    def insert_root(self, node: HeapTreeNode) -> HeapTreeNode:
+        '''
+        Insert new root to heap and update min
+        '''
+        node.parent = None
+        node.isMarked = False
+        node.left = node.right = node
+
+        if self.is_empty():
+            self.min = node
+        else:
+            self.__splice(self.min, node)
+            if node.value < self.min.value:
+                self.min = node
+
+        return node
+
+    @classmethod
+    def from_iterable(cls, values : Iterable[int], indexed : bool = False) -> 'FibonacciHeap':
+        '''
+        Build heap from values in O(n): nodes are linked into one root list in a single pass, consolidate waits for the first delete min
+        '''
+        heap = cls(indexed)
+        firstNode = lastNode = None
+        for value in values:
+            node = HeapTreeNode(value=value)
+            if firstNode is None:
+                firstNode = heap.min = node
+            else:
+                lastNode.right = node
+                node.left = lastNode
+                if value < heap.min.value:
+                    heap.min = node
+            lastNode = node
+            heap.size += 1
+
+        # Close the circular list
+        if firstNode is not None:
+            lastNode.right = firstNode
+            firstNode.left = lastNode
+        return heap
+
+    def insert_multiple(self, values: Iterable[int]) -> None:
+        '''
+        Insert multiple values to heap: build a heap from values in O(m), then union it in O(1) (O(min(n, m)) if indexed)
+        '''
+        self.union(FibonacciHeap.from_iterable(values, self.handles is not None))
+
+    def pop_min(self) -> int:
+        '''
+        Delete min node in the heap and return its value
+        '''
+        if self.is_empty():
+            raise Exception("Empty Heap!")
+        value = self.min.value
+        self.delete_min()
+        return value
+
+    def drain(self) -> Iterator[int]:
+        '''
+        Generate values in increasing order, each value is deleted from heap when it is generated
+        '''
+        while not self.is_empty():
+            yield self.pop_min()
+
+    def delete_min(self) -> None:
+        '''
+        Delete min node in the heap, then consolidate it
+        '''
+        if self.is_empty():
+            return
+
+        minNode = self.min
+
+        # Put all children of min to root
+        if minNode.child is not None:
+            for node in minNode.child.siblings():
+                node.parent = None
+                node.isMarked = False
+            self.__splice(minNode, minNode.child)
+            minNode.child = None
+            minNode.degree = 0
+
+        # Remove min from root list, any root is a valid entry until consolidate finds the new min
+        if minNode.right is minNode:
+            self.min = None
+        else:
+            self.min = minNode.right
+            self.__unlink(minNode)
+        self.size -= 1
+        if self.handles is not None and minNode.item is not None:
+            del self.handles[minNode.item]
+
+        self.__consolidate()
+
+    def decrease_key(self, node : HeapTreeNode, value : int) -> None:
+        '''
+        Decrease value of a node and reconstruct heap, node is a handle or an item of an indexed heap
+        '''
+        if not isinstance(node, HeapTreeNode):
+            node = self.handle(node)
+        if value > node.value:
+            raise Exception("New value is greater than current value!")
+
+        node.value = value
+        if node.parent is not None and value < node.parent.value:
+            self.__reconstruct(node)
+
+        if value < self.min.value:
+            self.min = node
+
+    def delete(self, node : HeapTreeNode) -> None:
+        '''
+        Delete any node in heap : decrease it to -infinity, then delete it. Node is a handle or an item of an indexed heap
+        '''
+        self.decrease_key(node, -inf)
+        self.delete_min()
+
+    def union(self, heap) -> None:
+        '''
+        Union other heap to this heap by joining both root lists in O(1), other heap becomes empty.
+        Indexed heaps: the smaller index is checked against and merged into the larger one in O(min(n, m))
+        '''
+        heap : FibonacciHeap = heap
+        if (self.handles is None) != (heap.handles is None):
+            raise Exception("Can not union indexed heap and not indexed heap!")
+        if heap.is_empty():
+            return
+        if self.handles is not None:
+            (small, large) = (self.handles, heap.handles) if len(self.handles) < len(heap.handles) else (heap.handles, self.handles)
+            if not large.keys().isdisjoint(small):
+                raise Exception("Item is already in heap!")
+
+        if self.is_empty():
+            self.min = heap.min
+        else:
+            self.__splice(self.min, heap.min)
+            if heap.min.value < self.min.value:
+                self.min = heap.min
+        self.size += heap.size
+        if self.handles is not None:
+            large.update(small)
+            self.handles = large
+            heap.handles = {}
+
+        heap.min = None
+        heap.size = 0
+
+    def __splice(self, a : HeapTreeNode, b : HeapTreeNode) -> None:
+        '''
+        Join circular list of b into circular list of a, right after a
+        '''
+        aRight = a.right
+        bLeft = b.left
+        a.right = b
+        b.left = a
+        bLeft.right = aRight
+        aRight.left = bLeft
+
+    def __unlink(self, node : HeapTreeNode) -> None:
+        '''
+        Remove node from its circular list, node becomes a list of itself
+        '''
+        node.left.right = node.right
+        node.right.left = node.left
+        node.left = node.right = node
+
+    def __link(self, child : HeapTreeNode, parent : HeapTreeNode) -> None:
+        '''
+        Remove root child from root list and put it to children of root parent
+        '''
+        self.__unlink(child)
+        child.parent = parent
+        child.isMarked = False
+        if parent.child is None:
+            parent.child = child
+        else:
+            self.__splice(parent.child, child)
+        parent.degree += 1
+
+    def __reconstruct(self, node : HeapTreeNode) -> None:
+        '''
+        Reconstruct heap after decrease key: cut node to root list, then cut its marked ancestors
+        '''
+        while node.parent is not None:
+            parent = node.parent
+
+            # Remove node from children of parent
+            if parent.child is node:
+                parent.child = None if node.right is node else node.right
+            self.__unlink(node)
+            parent.degree -= 1
+            self.insert_root(node)
+
+            # Roots are never marked, a marked parent lost a child before -> cut it too
+            if not parent.isMarked:
+                parent.isMarked = parent.parent is not None
+                return
+            node = parent
+
+    def __consolidate(self) -> None:
+        '''
+        Consolidate heap after delete min node
+        '''
+        if self.is_empty():
+            return
+
+        # Degree is at most log_phi(size) < 1.45 * log2(size), array grows if a degree is larger
+        ranks : List[HeapTreeNode] = [None] * (self.size.bit_length() * 3 // 2 + 2)
+        for curRoot in list(self.min.siblings()):
+            rank = curRoot.degree
+
+            # If 2 root same rank -> union them, put the larger root to children of smaller
+            while rank < len(ranks) and ranks[rank] is not None:
+                sameRankRoot = ranks[rank]
+                ranks[rank] = None
+                if sameRankRoot.value < curRoot.value:
+                    (curRoot, sameRankRoot) = (sameRankRoot, curRoot)
+                self.__link(sameRankRoot, curRoot)
+                rank += 1
+
+            if rank >= len(ranks):
+                ranks.extend([None] * (rank - len(ranks) + 1))
+            ranks[rank] = curRoot
+
+        # Update min, remaining roots are still linked in the root list
+        self.min = None
+        for curRoot in ranks:
+            if curRoot is not None and (self.min is None or curRoot.value < self.min.value):
+                self.min = curRoot
+
+def merge_sorted(*iterables : Iterable[int], heap : Callable = FibonacciHeap) -> Iterator[int]:
+    '''
+    Merge sorted iterables into one sorted stream, heap keeps only the current head of each iterable
+    + heap: factory of an empty heap with the interface of FibonacciHeap, see HeapEngines
+    '''
+    queue = heap()
+    iterators = [iter(iterable) for iterable in iterables]
+
+    # Item of a head is the index of its iterable, so the next value is taken from the same iterable
+    for (i, iterator) in enumerate(iterators):
+        for value in iterator:
+            queue.insert(value, i)
+            break
+    while not queue.is_empty():
+        (value, i) = (queue.min.value, queue.min.item)
+        queue.delete_min()
+        yield value
+        for nextValue in iterators[i]:
+            queue.insert(nextValue, i)
+            break
+
+if __name__ == "__main__":
+    import time
+    FH = FibonacciHeap()
+    time1 = time.time()
+    FH.insert_multiple([3 * x for x in range(200000)])
+    time2 = time.time()
+    print("insert: ", time2 - time1)
+    time1 = time.time()
+    FH.delete_min()
+    time2 = time.time()
+    print("delete min: ", time2 - time1)
+    time1 = time.time()
+    FH.delete_min()
+    time2 = time.time()
+    print("delete min 2: ", time2 - time1)
+    # FH.delete_min()
+    # FH.show()
+    print("After delete 2 min node: ", FH)
+
+    FH1 = FibonacciHeap()
+    FH1.insert_multiple([3 * x+1 for x in range(2000)])
+    FH1.delete_min()
+    time1 = time.time()
+    FH1.union(FH)
+    time2 = time.time()
+    print("union: ", time2 - time1)
+    print("After delete 1 min node", FH1)
+
+    # Insert returns a handle, an indexed heap also accepts items for decrease key and delete
+    FH2 = FibonacciHeap(indexed=True)
+    handle = FH2.insert(5, 'a')
+    FH2.insert(3, 'b')
+    FH2.insert(8, 'c')
+    FH2.decrease_key(handle, 2)
+    FH2.decrease_key('c', 1)
+    print("Min item after decrease key: ", FH2.min.item)
+
+    # Build a heap in one pass, drain it in order, merge sorted streams lazily
+    time1 = time.time()
+    FH3 = FibonacciHeap.from_iterable(3 * x for x in range(200000))
+    time2 = time.time()
+    print("from_iterable: ", time2 - time1)
+    print("Drain first 5 values: ", [value for (_, value) in zip(range(5), FH3.drain())])
+    print("Merge sorted: ", list(merge_sorted(range(0, 10, 3), range(1, 10, 3), range(2, 10, 3))))
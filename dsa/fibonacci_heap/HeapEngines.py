@@ -0,0 +1,594 @@
+from math import inf
+from operator import attrgetter
+from random import Random
+from time import time
+from typing import Callable, Dict, Iterable, Iterator, List
+
+from dsa.fibonacci_heap.FibonacciHeap import FibonacciHeap
+
+
+class HeapEngine:
+    '''
+    Heap Engine
+    ----
+        Common interface of priority queues, the same as FibonacciHeap:
+        + insert(value, item=None): insert value (priority) with an optional item, return a handle with value and item
+        + min: handle with minimum value, None if heap is empty
+        + delete_min(): delete handle with minimum value, pop_min() also returns its value
+        + drain(): generate values in increasing order while deleting them
+        + decrease_key(handle, value): decrease value of a handle
+        + delete(handle): delete any handle
+        + union(heap): move all handles of other heap of the same engine to this heap, other heap becomes empty
+        + is_empty(), len(heap)
+    '''
+    def __init__(self) -> None:
+        self.size : int = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def is_empty(self) -> bool:
+        return self.size == 0
+
+    def insert_multiple(self, values: Iterable[int]) -> None:
+        '''
+        Insert multiple values to heap
+        '''
+        for value in values:
+            self.insert(value)
+
+    def pop_min(self) -> int:
+        '''
+        Delete min handle in the heap and return its value
+        '''
+        if self.is_empty():
+            raise Exception("Empty Heap!")
+        value = self.min.value
+        self.delete_min()
+        return value
+
+    def drain(self) -> Iterator[int]:
+        '''
+        Generate values in increasing order, each value is deleted from heap when it is generated
+        '''
+        while not self.is_empty():
+            yield self.pop_min()
+
+    def delete(self, node) -> None:
+        '''
+        Delete any handle in heap : decrease it to -infinity, then delete it
+        '''
+        self.decrease_key(node, -inf)
+        self.delete_min()
+
+
+class HeapEntry:
+    '''
+    Heap Entry
+    ----
+        Handle of an array heap:
+        + Value (priority) and item
+        + Position in heap array, -1 after deleted
+    '''
+    __slots__ = ('value', 'item', 'index')
+
+    def __init__(self, value : int, item : object = None, index : int = -1) -> None:
+        self.value : int = value
+        self.item : object = item
+        self.index : int = index
+
+    def __str__(self) -> str:
+        return str(self.value)
+
+
+class DaryHeap(HeapEngine):
+    '''
+    D-ary Heap
+    ----
+        Features of D-ary Heap:
+        + Complete d-ary tree in a Python list, children of position i are at d*i+1 .. d*i+d
+        + Each entry knows its position, so decrease key and delete do not search
+        + Insert and decrease key in O(log_d n), delete min in O(d log_d n)
+        + Union moves entries of other heap, then rebuilds the heap bottom-up in O(n + m)
+    '''
+    def __init__(self, d : int = 4) -> None:
+        super().__init__()
+        if d < 2:
+            raise Exception("Heap needs at least 2 children per node!")
+        self.d : int = d
+        self.heap : List[HeapEntry] = []
+
+    def __str__(self) -> str:
+        return "{}-ary Heap: {}".format(self.d, self.min)
+
+    @property
+    def min(self) -> HeapEntry:
+        return self.heap[0] if len(self.heap) > 0 else None
+
+    def insert(self, value : int, item : object = None) -> HeapEntry:
+        '''
+        Append new entry to heap list and sift it up
+        '''
+        entry = HeapEntry(value, item, len(self.heap))
+        self.heap.append(entry)
+        self.__siftUp(entry)
+        self.size += 1
+        return entry
+
+    def delete_min(self) -> None:
+        '''
+        Move last entry to the top, then sift it down
+        '''
+        if self.is_empty():
+            return
+        self.delete(self.heap[0])
+
+    def decrease_key(self, entry : HeapEntry, value : int) -> None:
+        '''
+        Decrease value of an entry, then sift it up
+        '''
+        if value > entry.value:
+            raise Exception("New value is greater than current value!")
+        entry.value = value
+        self.__siftUp(entry)
+
+    def delete(self, entry : HeapEntry) -> None:
+        '''
+        Move last entry to the position of deleted entry, then sift it up or down
+        '''
+        last = self.heap.pop()
+        if last is not entry:
+            self.heap[entry.index] = last
+            last.index = entry.index
+            self.__siftUp(last)
+            self.__siftDown(last)
+        entry.index = -1
+        self.size -= 1
+
+    def union(self, heap : 'DaryHeap') -> None:
+        '''
+        Union other heap to this heap: few entries are sifted up one by one, otherwise heap is rebuilt
+        '''
+        if type(heap) is not type(self):
+            raise Exception("Can not union heaps of different engines!")
+        entries = heap.heap
+        (heap.heap, heap.size) = ([], 0)
+
+        rebuild = len(entries) * 4 > len(self.heap)
+        for entry in entries:
+            entry.index = len(self.heap)
+            self.heap.append(entry)
+            if not rebuild:
+                self.__siftUp(entry)
+        if rebuild:
+            for i in range((len(self.heap) - 2) // self.d, -1, -1):
+                self.__siftDown(self.heap[i])
+        self.size += len(entries)
+
+    def __siftUp(self, entry : HeapEntry) -> None:
+        '''
+        Move parents with larger value down until the position of entry is found
+        '''
+        (heap, d) = (self.heap, self.d)
+        (i, value) = (entry.index, entry.value)
+        while i > 0:
+            parent = heap[(i - 1) // d]
+            if parent.value <= value:
+                break
+            heap[i] = parent
+            parent.index = i
+            i = (i - 1) // d
+        heap[i] = entry
+        entry.index = i
+
+    def __siftDown(self, entry : HeapEntry) -> None:
+        '''
+        Move smallest children up until the position of entry is found
+        '''
+        (heap, d, n) = (self.heap, self.d, len(self.heap))
+        (i, value) = (entry.index, entry.value)
+        while True:
+            first = d * i + 1
+            if first >= n:
+                break
+            best = first
+            for c in range(first + 1, min(first + d, n)):
+                if heap[c].value < heap[best].value:
+                    best = c
+            child = heap[best]
+            if child.value >= value:
+                break
+            heap[i] = child
+            child.index = i
+            i = best
+        heap[i] = entry
+        entry.index = i
+
+
+class BinaryHeap(DaryHeap):
+    '''
+    Binary Heap
+    ----
+        D-ary Heap with 2 children per node
+    '''
+    def __init__(self) -> None:
+        super().__init__(2)
+
+
+class PairingNode:
+    '''
+    Pairing Heap Node
+    ----
+        A Pairing Heap Node contains:
+        + Value (priority) and item
+        + Link to leftmost child and to next sibling
+        + Link to previous sibling, or to parent if this node is the leftmost child
+    '''
+    __slots__ = ('value', 'item', 'child', 'next', 'prev')
+
+    def __init__(self, value : int, item : object = None) -> None:
+        self.value : int = value
+        self.item : object = item
+        self.child : PairingNode = None
+        self.next : PairingNode = None
+        self.prev : PairingNode = None
+
+    def __str__(self) -> str:
+        return str(self.value)
+
+
+class PairingHeap(HeapEngine):
+    '''
+    Pairing Heap
+    ----
+        Features of Pairing Heap:
+        + One heap-ordered tree, children of a node are a doubly linked list
+        + Insert, union and decrease key meld two trees in O(1)
+        + Delete min melds children in pairs from left to right, then from right to left, amortized O(log n)
+    '''
+    def __init__(self) -> None:
+        super().__init__()
+        self.root : PairingNode = None
+
+    def __str__(self) -> str:
+        return "Pairing Heap: " + str(self.root)
+
+    @property
+    def min(self) -> PairingNode:
+        return self.root
+
+    def insert(self, value : int, item : object = None) -> PairingNode:
+        '''
+        Meld new node with root
+        '''
+        node = PairingNode(value, item)
+        self.root = self.__meld(self.root, node)
+        self.size += 1
+        return node
+
+    def delete_min(self) -> None:
+        '''
+        Delete root, then meld its children
+        '''
+        if self.is_empty():
+            return
+        oldRoot = self.root
+        self.root = self.__mergePairs(oldRoot.child)
+        oldRoot.child = None
+        self.size -= 1
+
+    def decrease_key(self, node : PairingNode, value : int) -> None:
+        '''
+        Decrease value of a node, cut its subtree and meld it with root
+        '''
+        if value > node.value:
+            raise Exception("New value is greater than current value!")
+        node.value = value
+        if node is self.root:
+            return
+        self.__cut(node)
+        self.root = self.__meld(self.root, node)
+
+    def union(self, heap : 'PairingHeap') -> None:
+        '''
+        Union other heap to this heap by melding both roots
+        '''
+        if type(heap) is not type(self):
+            raise Exception("Can not union heaps of different engines!")
+        self.root = self.__meld(self.root, heap.root)
+        self.size += heap.size
+        (heap.root, heap.size) = (None, 0)
+
+    def __meld(self, a : PairingNode, b : PairingNode) -> PairingNode:
+        '''
+        Put root with larger value to leftmost child of the other root, return new root
+        '''
+        if a is None:
+            return b
+        if b is None:
+            return a
+        if b.value < a.value:
+            (a, b) = (b, a)
+        b.prev = a
+        b.next = a.child
+        if a.child is not None:
+            a.child.prev = b
+        a.child = b
+        return a
+
+    def __cut(self, node : PairingNode) -> None:
+        '''
+        Remove node and its subtree from children of its parent
+        '''
+        if node.prev.child is node:
+            node.prev.child = node.next
+        else:
+            node.prev.next = node.next
+        if node.next is not None:
+            node.next.prev = node.prev
+        node.prev = node.next = None
+
+    def __mergePairs(self, first : PairingNode) -> PairingNode:
+        '''
+        Meld a list of siblings in two passes, return new root
+        '''
+        # Meld pairs from left to right
+        pairs : List[PairingNode] = []
+        while first is not None:
+            a = first
+            b = a.next
+            first = None if b is None else b.next
+            a.prev = a.next = None
+            if b is not None:
+                b.prev = b.next = None
+            pairs.append(self.__meld(a, b))
+
+        # Meld results from right to left
+        root = None
+        for node in reversed(pairs):
+            root = self.__meld(root, node)
+        return root
+
+
+class RadixEntry:
+    '''
+    Radix Entry
+    ----
+        Handle of a radix heap:
+        + Value (priority) and item
+        + Bucket and position in bucket, bucket is -1 after deleted
+    '''
+    __slots__ = ('value', 'item', 'bucket', 'index')
+
+    def __init__(self, value : int, item : object = None) -> None:
+        self.value : int = value
+        self.item : object = item
+        self.bucket : int = -1
+        self.index : int = -1
+
+    def __str__(self) -> str:
+        return str(self.value)
+
+
+class RadixHeap(HeapEngine):
+    '''
+    Radix Heap
+    ----
+        Monotone priority queue for non-negative integer values, as in Dijkstra with integer weights (not Prim, its keys are not monotone):
+        + Inserted and decreased values must not be less than the last deleted min (name last)
+        + Bucket i holds values whose highest bit different from last is bit i-1, bucket 0 holds values equal to last
+        + Deleting min redistributes its bucket to lower buckets, each entry moves down at most log(C) times
+        + Insert and decrease key in O(1), delete min in amortized O(log C), C is the largest value
+    '''
+    def __init__(self) -> None:
+        super().__init__()
+        self.last : int = 0
+        self.buckets : List[List[RadixEntry]] = [[]]
+        self.__min : RadixEntry = None
+
+    def __str__(self) -> str:
+        return "Radix Heap: " + str(self.min)
+
+    @property
+    def min(self) -> RadixEntry:
+        # Minimum is in the first non-empty bucket, found lazily and kept until it changes
+        if self.__min is None and self.size > 0:
+            for bucket in self.buckets:
+                if len(bucket) > 0:
+                    self.__min = min(bucket, key=attrgetter('value'))
+                    break
+        return self.__min
+
+    def insert(self, value : int, item : object = None) -> RadixEntry:
+        '''
+        Put new entry to its bucket
+        '''
+        if value < self.last:
+            raise Exception("Value is less than last deleted min!")
+        entry = RadixEntry(value, item)
+        self.__place(entry)
+        self.size += 1
+        if self.__min is not None and value < self.__min.value:
+            self.__min = entry
+        return entry
+
+    def delete_min(self) -> None:
+        '''
+        Delete min, then redistribute its bucket with min as new last
+        '''
+        entry = self.min
+        if entry is None:
+            return
+        bucketIndex = entry.bucket
+        self.delete(entry)
+        self.last = entry.value
+        if bucketIndex > 0:
+            moved = self.buckets[bucketIndex]
+            self.buckets[bucketIndex] = []
+            for curEntry in moved:
+                self.__place(curEntry)
+
+    def decrease_key(self, entry : RadixEntry, value : int) -> None:
+        '''
+        Decrease value of an entry and move it to its new bucket
+        '''
+        if value > entry.value:
+            raise Exception("New value is greater than current value!")
+        if value < self.last:
+            raise Exception("Value is less than last deleted min!")
+        self.__remove(entry)
+        entry.value = value
+        self.__place(entry)
+        if self.__min is not None and value < self.__min.value:
+            self.__min = entry
+
+    def delete(self, entry : RadixEntry) -> None:
+        '''
+        Remove an entry from its bucket
+        '''
+        self.__remove(entry)
+        entry.bucket = -1
+        self.size -= 1
+        if entry is self.__min:
+            self.__min = None
+
+    def union(self, heap : 'RadixHeap') -> None:
+        '''
+        Union other heap to this heap by putting its entries to buckets of this heap, O(m)
+        '''
+        if type(heap) is not type(self):
+            raise Exception("Can not union heaps of different engines!")
+        if heap.is_empty():
+            return
+        if heap.min.value < self.last:
+            raise Exception("Value is less than last deleted min!")
+        for bucket in heap.buckets:
+            for entry in bucket:
+                self.__place(entry)
+        self.size += heap.size
+        self.__min = None
+        heap.__init__()
+
+    def __place(self, entry : RadixEntry) -> None:
+        '''
+        Append entry to the bucket of its highest bit different from last
+        '''
+        i = (entry.value ^ self.last).bit_length()
+        while i >= len(self.buckets):
+            self.buckets.append([])
+        entry.bucket = i
+        entry.index = len(self.buckets[i])
+        self.buckets[i].append(entry)
+
+    def __remove(self, entry : RadixEntry) -> None:
+        '''
+        Remove entry from its bucket by moving the last entry of bucket to its position
+        '''
+        bucket = self.buckets[entry.bucket]
+        last = bucket.pop()
+        if last is not entry:
+            bucket[entry.index] = last
+            last.index = entry.index
+
+
+# Engines with the interface of FibonacciHeap, each value is a factory of an empty heap
+ENGINES : Dict[str, Callable] = {
+    'fibonacci': FibonacciHeap,
+    'binary': BinaryHeap,
+    '4-ary': lambda: DaryHeap(4),
+    'pairing': PairingHeap,
+    'radix': RadixHeap,
+}
+
+
+def insert_heavy(engine : Callable, n : int, rnd : Random) -> None:
+    '''
+    Workload: n inserts of random values, then n / 100 delete min
+    '''
+    heap = engine()
+    for _ in range(n):
+        heap.insert(rnd.randrange(n))
+    for _ in range(n // 100):
+        heap.delete_min()
+
+
+def decrease_key_heavy(engine : Callable, n : int, rnd : Random) -> None:
+    '''
+    Workload: n inserts, then 3 decrease keys per delete min until heap is empty (monotone, as in Dijkstra)
+    '''
+    heap = engine()
+    # Item of a handle is its position in live list, so deleted handles are removed in O(1)
+    live = [heap.insert(n + rnd.randrange(8 * n), i) for i in range(n)]
+    last = 0
+    step = 0
+    while len(live) > 0:
+        step += 1
+        if step % 4 == 0:
+            entry = heap.min
+            last = entry.value
+            moved = live.pop()
+            if moved is not entry:
+                live[entry.item] = moved
+                moved.item = entry.item
+            heap.delete_min()
+        else:
+            entry = live[rnd.randrange(len(live))]
+            heap.decrease_key(entry, rnd.randint(last, entry.value))
+
+
+def merge_heavy(engine : Callable, n : int, rnd : Random) -> None:
+    '''
+    Workload: n / 8 heaps of 8 values are unioned in pairs until one heap remains, then n / 100 delete min
+    '''
+    heaps = []
+    for _ in range(max(n // 8, 1)):
+        heap = engine()
+        for _ in range(8):
+            heap.insert(rnd.randrange(n))
+        heaps.append(heap)
+
+    while len(heaps) > 1:
+        merged = []
+        for i in range(0, len(heaps) - 1, 2):
+            heaps[i].union(heaps[i + 1])
+            merged.append(heaps[i])
+        if len(heaps) % 2 == 1:
+            merged.append(heaps[-1])
+        heaps = merged
+
+    for _ in range(n // 100):
+        heaps[0].delete_min()
+
+
+WORKLOADS : Dict[str, Callable] = {
+    'insert-heavy': insert_heavy,
+    'decrease-key-heavy': decrease_key_heavy,
+    'merge-heavy': merge_heavy,
+}
+
+
+def benchmark(n : int = 100000, engines : Dict[str, Callable] = ENGINES, workloads : Dict[str, Callable] = WORKLOADS, seed : int = 1) -> Dict[str, Dict[str, float]]:
+    '''
+    Run each workload with each engine on the same random values, return seconds of workload -> engine -> time
+    '''
+    results : Dict[str, Dict[str, float]] = {}
+    for (workloadName, workload) in workloads.items():
+        results[workloadName] = {}
+        for (engineName, engine) in engines.items():
+            t1 = time()
+            workload(engine, n, Random(seed))
+            t2 = time()
+            results[workloadName][engineName] = t2 - t1
+    return results
+
+
+if __name__ == "__main__":
+    import sys
+
+    # Benchmark: python -m dsa.fibonacci_heap.HeapEngines [number of values]
+    N = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    results = benchmark(N)
+    print("{0:<20}".format("n = {}".format(N)) + "".join("{0:>11}".format(name) for name in ENGINES))
+    for (workloadName, times) in results.items():
+        winner = min(times, key=times.get)
+        print("{0:<20}".format(workloadName) + "".join("{0:>10.3f}s".format(times[name]) for name in ENGINES) + "   winner: " + winner)
@@ -0,0 +1,3 @@
+'''
+Fibonacci Heap and other heap engines with its interface
+'''
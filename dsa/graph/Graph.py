@@ -0,0 +1,263 @@
+from array import array
+from math import inf
+from random import Random
+from typing import Callable, Iterable, Iterator, List, Tuple
+
+from dsa.disjoint_set.DisjointSet import DisjointSet_Forest
+from dsa.fibonacci_heap.FibonacciHeap import FibonacciHeap
+
+
+class Graph:
+    '''
+    Graph
+    ----
+        Weighted graph with nodes 0 .. n-1, stored in compressed sparse row (CSR) arrays:
+        + offsets: edges of node u are at positions offsets[u] .. offsets[u + 1] - 1
+        + targets: target node of each edge (array of 64-bit integers)
+        + weights: weight of each edge (array of 64-bit integers if all weights are integers, otherwise doubles)
+        + An undirected edge is stored once in each direction, an undirected self-loop is stored once
+
+        About 16 bytes per stored edge and 8 bytes per node, no Python object per edge.
+    '''
+    def __init__(self, offsets : array, targets : array, weights : array, directed : bool = True, edgeCount : int = None) -> None:
+        self.offsets : array = offsets
+        self.targets : array = targets
+        self.weights : array = weights
+        self.directed : bool = directed
+
+        # An undirected edge is stored twice unless it is a self-loop
+        if edgeCount is None:
+            edgeCount = len(targets) if directed else sum(1 for u in range(len(offsets) - 1) for i in range(offsets[u], offsets[u + 1]) if u <= targets[i])
+        self.edgeCount : int = edgeCount
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def num_edges(self) -> int:
+        '''
+        Number of edges, an undirected edge is counted once
+        '''
+        return self.edgeCount
+
+    @classmethod
+    def from_edges(cls, n : int, edges : Iterable[Tuple[int, int, float]], directed : bool = True) -> 'Graph':
+        '''
+        Build graph of n nodes from (u, v, weight) edges, edges are grouped by source with a counting sort in O(n + m)
+        Integer weights stay integers (e.g. for RadixHeap), the first non-integer weight turns all weights to doubles
+        '''
+        sources = array('q')
+        targets = array('q')
+        weights = array('q')
+        edgeCount = 0
+        for (u, v, w) in edges:
+            if not (0 <= u < n and 0 <= v < n):
+                raise Exception("Node is out of range!")
+            if weights.typecode == 'q' and not isinstance(w, int):
+                weights = array('d', weights)
+            sources.append(u)
+            targets.append(v)
+            weights.append(w)
+            edgeCount += 1
+            if not directed and u != v:
+                sources.append(v)
+                targets.append(u)
+                weights.append(w)
+
+        # Count edges of each node, then prefix sums give the first position of each node
+        m = len(sources)
+        offsets = array('q', bytes(8 * (n + 1)))
+        for u in sources:
+            offsets[u + 1] += 1
+        for u in range(n):
+            offsets[u + 1] += offsets[u]
+
+        # Put each edge to the next free position of its source
+        position = offsets[:n]
+        sortedTargets = array('q', bytes(8 * m))
+        sortedWeights = array(weights.typecode, bytes(8 * m))
+        for i in range(m):
+            u = sources[i]
+            p = position[u]
+            sortedTargets[p] = targets[i]
+            sortedWeights[p] = weights[i]
+            position[u] = p + 1
+
+        return cls(offsets, sortedTargets, sortedWeights, directed, edgeCount)
+
+    @classmethod
+    def random(cls, n : int, m : int, maxWeight : int = 100, directed : bool = True, seed : int = None) -> 'Graph':
+        '''
+        Build graph of n nodes and m random edges with integer weights in [1, maxWeight]
+        '''
+        rnd = Random(seed)
+        return cls.from_edges(n, ((rnd.randrange(n), rnd.randrange(n), rnd.randint(1, maxWeight)) for _ in range(m)), directed)
+
+    def neighbors(self, u : int) -> Iterator[Tuple[int, float]]:
+        '''
+        Generate (v, weight) of all edges from u
+        '''
+        for i in range(self.offsets[u], self.offsets[u + 1]):
+            yield (self.targets[i], self.weights[i])
+
+    def edges(self) -> Iterator[Tuple[int, int, float]]:
+        '''
+        Generate all (u, v, weight) edges, an undirected edge is generated once with u <= v
+        '''
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+        for u in range(len(self)):
+            for i in range(offsets[u], offsets[u + 1]):
+                if self.directed or u <= targets[i]:
+                    yield (u, targets[i], weights[i])
+
+
+def dijkstra(graph : Graph, source : int, heap : Callable = FibonacciHeap) -> Tuple[List[float], List[int]]:
+    '''
+    Shortest paths from source, weights must be non-negative
+    + heap: factory of an empty priority queue with the interface of FibonacciHeap:
+      insert(priority, item) returns a handle, decrease_key(handle, priority), min (with value and item), delete_min(), is_empty()
+      RadixHeap also works here if all weights are integers, since deleted distances never decrease
+    Return distance of each node (inf if not reachable) and parent of each node in the shortest path tree (-1 if none)
+    '''
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    dist = [inf] * len(graph)
+    parent = [-1] * len(graph)
+    handles = [None] * len(graph)
+
+    # A node is inserted when it is reached first, later shorter paths decrease its key
+    queue = heap()
+    dist[source] = 0
+    handles[source] = queue.insert(0, source)
+    while not queue.is_empty():
+        (d, u) = (queue.min.value, queue.min.item)
+        queue.delete_min()
+        for i in range(offsets[u], offsets[u + 1]):
+            v = targets[i]
+            newDist = d + weights[i]
+            if newDist < dist[v]:
+                dist[v] = newDist
+                parent[v] = u
+                if handles[v] is None:
+                    handles[v] = queue.insert(newDist, v)
+                else:
+                    queue.decrease_key(handles[v], newDist)
+
+    return (dist, parent)
+
+
+def prim(graph : Graph, heap : Callable = FibonacciHeap) -> Tuple[float, List[Tuple[int, int, float]]]:
+    '''
+    Minimum spanning forest of an undirected graph, one tree is grown from each node not reached yet
+    + heap: factory of an empty priority queue, see dijkstra (not RadixHeap: keys are edge weights, they are not monotone)
+    Return total weight and (u, v, weight) edges of the forest
+    '''
+    if graph.directed:
+        raise Exception("Minimum spanning tree needs an undirected graph!")
+
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    key = [inf] * len(graph)
+    parent = [-1] * len(graph)
+    handles = [None] * len(graph)
+    inTree = bytearray(len(graph))
+    total = 0
+    forest : List[Tuple[int, int, float]] = []
+
+    queue = heap()
+    for root in range(len(graph)):
+        if inTree[root]:
+            continue
+        key[root] = 0
+        handles[root] = queue.insert(0, root)
+        while not queue.is_empty():
+            u = queue.min.item
+            queue.delete_min()
+            inTree[u] = 1
+            if parent[u] >= 0:
+                forest.append((parent[u], u, key[u]))
+                total += key[u]
+
+            # Lighter edge to a node outside the tree decreases its key
+            for i in range(offsets[u], offsets[u + 1]):
+                v = targets[i]
+                w = weights[i]
+                if not inTree[v] and w < key[v]:
+                    key[v] = w
+                    parent[v] = u
+                    if handles[v] is None:
+                        handles[v] = queue.insert(w, v)
+                    else:
+                        queue.decrease_key(handles[v], w)
+
+    return (total, forest)
+
+
+def kruskal(graph : Graph, disjointSet : Callable = DisjointSet_Forest) -> Tuple[float, List[Tuple[int, int, float]]]:
+    '''
+    Minimum spanning forest of an undirected graph, edges are added in increasing weight if they join two trees
+    + disjointSet: factory of an empty disjoint set with the interface of DisjointSet_Forest: makeSet(x), findSet(x), union(x, y)
+    Return total weight and (u, v, weight) edges of the forest
+    '''
+    if graph.directed:
+        raise Exception("Minimum spanning tree needs an undirected graph!")
+
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    sets = disjointSet()
+    for u in range(len(graph)):
+        sets.makeSet(u)
+
+    # Sort positions of edges (each undirected edge once) by weight instead of building edge tuples
+    sources = array('q', bytes(8 * len(targets)))
+    order = []
+    for u in range(len(graph)):
+        for i in range(offsets[u], offsets[u + 1]):
+            if u < targets[i]:
+                sources[i] = u
+                order.append(i)
+    order.sort(key=weights.__getitem__)
+
+    total = 0
+    forest : List[Tuple[int, int, float]] = []
+    for i in order:
+        (u, v) = (sources[i], targets[i])
+        if sets.findSet(u) != sets.findSet(v):
+            sets.union(u, v)
+            forest.append((u, v, weights[i]))
+            total += weights[i]
+            if len(forest) == len(graph) - 1:
+                break
+
+    return (total, forest)
+
+
+if __name__ == "__main__":
+    import sys
+    from time import time
+
+    # Benchmark on random graphs: python -m dsa.graph.Graph [number of nodes] [edges per node]
+    N = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    degree = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+    t1 = time()
+    graph = Graph.random(N, degree * N, seed=1)
+    t2 = time()
+    memory = sum(a.itemsize * len(a) for a in (graph.offsets, graph.targets, graph.weights))
+    print("Build directed graph of {0} nodes, {1} edges: {2:.2f} seconds, CSR arrays {3:.1f} MB".format(N, graph.num_edges(), t2 - t1, memory / 10**6))
+
+    t1 = time()
+    (dist, _) = dijkstra(graph, 0)
+    t2 = time()
+    print("Dijkstra with FibonacciHeap: {0:.2f} seconds, {1} nodes reachable".format(t2 - t1, sum(1 for d in dist if d < inf)))
+
+    t1 = time()
+    graph = Graph.random(N, degree * N // 2, directed=False, seed=2)
+    t2 = time()
+    print("Build undirected graph of {0} nodes, {1} edges: {2:.2f} seconds".format(N, graph.num_edges(), t2 - t1))
+
+    t1 = time()
+    (primWeight, primForest) = prim(graph)
+    t2 = time()
+    print("Prim with FibonacciHeap: {0:.2f} seconds, weight {1:.0f}, {2} edges".format(t2 - t1, primWeight, len(primForest)))
+
+    t1 = time()
+    (kruskalWeight, kruskalForest) = kruskal(graph)
+    t2 = time()
+    print("Kruskal with DisjointSet_Forest: {0:.2f} seconds, weight {1:.0f}, {2} edges".format(t2 - t1, kruskalWeight, len(kruskalForest)))
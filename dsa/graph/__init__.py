@@ -0,0 +1,3 @@
+'''
+Graph in CSR arrays, Dijkstra, Prim and Kruskal
+'''
@@ -0,0 +1,3 @@
+'''
+Greedy algorithms
+'''
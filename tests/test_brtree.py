@@ -0,0 +1,370 @@
+from bisect import bisect_left
+from random import Random
+import re
+from typing import List
+
+import pytest
+
+from dsa.brtree.BRTree import NIL, BRTree, IntervalTree, Node, PersistentBRTree
+
+
+def validate(tree : BRTree, linked : bool = True) -> List[int]:
+    '''
+    Check rules of BlackRed-Tree and links of nodes (parent is None if not linked), return values in increasing order
+    '''
+    assert not NIL.isRed and NIL.size == 0
+    values = []
+
+    # Return black height of subtree
+    def visit(node : Node, lo, hi) -> int:
+        if node.isNIL:
+            assert node is NIL
+            return 1
+        assert (lo is None or node.value > lo) and (hi is None or node.value < hi)
+        if node.isRed:
+            assert not node.left.isRed and not node.right.isRed
+        for child in (node.left, node.right):
+            if not child.isNIL:
+                assert child.parent is (node if linked else None)
+        leftHeight = visit(node.left, lo, node.value)
+        values.append(node.value)
+        rightHeight = visit(node.right, node.value, hi)
+        assert leftHeight == rightHeight
+        return leftHeight + (0 if node.isRed else 1)
+
+    if not tree.root.isNIL:
+        assert not tree.root.isRed and tree.root.parent is None
+    visit(tree.root, None, None)
+    return values
+
+
+def test_insert_delete_search():
+    rnd = Random(1)
+    for _ in range(10):
+        tree = BRTree()
+        reference = set()
+        for _ in range(500):
+            value = rnd.randrange(200)
+            if rnd.random() < 0.55:
+                tree.insert(value)
+                reference.add(value)
+            else:
+                tree.delete(value)
+                reference.discard(value)
+            assert validate(tree) == sorted(reference)
+            assert (tree.search(value) is not None) == (value in reference)
+
+
+def test_nodes_share_nil_and_use_slots():
+    tree = BRTree()
+    for value in range(100):
+        tree.insert(value)
+    for value in range(0, 100, 3):
+        tree.delete(value)
+    validate(tree)
+    assert all(not hasattr(node, '__dict__') for node in tree.root.inorder())
+    assert tree.root.parent is None
+
+
+def test_sorted_map_queries():
+    rnd = Random(5)
+    tree = BRTree()
+    reference = set()
+    for _ in range(1000):
+        value = rnd.randrange(100)
+        if rnd.random() < 0.6:
+            tree.insert(value)
+            reference.add(value)
+        else:
+            tree.delete(value)
+            reference.discard(value)
+
+        values = sorted(reference)
+        query = rnd.randrange(-5, 105)
+        less = [x for x in values if x < query]
+        greater = [x for x in values if x > query]
+        assert tree.floor(query) == (query if query in reference else (less[-1] if less else None))
+        assert tree.ceiling(query) == (query if query in reference else (greater[0] if greater else None))
+        assert tree.predecessor(query) == (less[-1] if less else None)
+        assert tree.successor(query) == (greater[0] if greater else None)
+        assert (query in tree) == (query in reference)
+        assert tree.get(query, 'missing') == (query if query in reference else 'missing')
+
+        lo = rnd.choice([None, rnd.randrange(-5, 105)])
+        hi = rnd.choice([None, rnd.randrange(-5, 105)])
+        assert list(tree.irange(lo, hi)) == [x for x in values if (lo is None or x >= lo) and (hi is None or x < hi)]
+        assert list(tree) == values
+
+
+def test_irange_is_lazy():
+    tree = BRTree()
+    for value in range(2000):
+        tree.insert(value)
+    scan = tree.irange(500)
+    assert [next(scan) for _ in range(3)] == [500, 501, 502]
+    assert list(BRTree().irange()) == []
+
+
+def maxHi(node : Node) -> int:
+    '''
+    Check the largest hi kept by nodes of interval tree, return it for subtree of node
+    '''
+    if node.isNIL:
+        return None
+    largest = max(hi for hi in (node.value[1], maxHi(node.left), maxHi(node.right)) if hi is not None)
+    assert node.maxHi == largest
+    return largest
+
+
+def test_interval_overlapping():
+    rnd = Random(9)
+    tree = IntervalTree()
+    reference = set()
+    for _ in range(1500):
+        lo = rnd.randrange(100)
+        hi = lo + rnd.randrange(1, 30)
+        if rnd.random() < 0.6:
+            tree.insert(lo, hi)
+            reference.add((lo, hi))
+        elif len(reference) > 0 and rnd.random() < 0.7:
+            (lo, hi) = rnd.choice(sorted(reference))
+            tree.delete(lo, hi)
+            reference.discard((lo, hi))
+        else:
+            tree.delete(lo, hi)
+            reference.discard((lo, hi))
+
+        assert validate(tree) == sorted(reference)
+        maxHi(tree.root)
+        lo = rnd.randrange(-5, 130)
+        hi = lo + rnd.randrange(1, 20)
+        assert list(tree.overlapping(lo, hi)) == [x for x in sorted(reference) if x[0] < hi and lo < x[1]]
+
+
+def test_interval_half_open():
+    tree = IntervalTree()
+    tree.insert(0, 10)
+    tree.insert(10, 20)
+    # Touching intervals do not overlap, empty queries overlap nothing
+    assert list(tree.overlapping(10, 11)) == [(10, 20)]
+    assert list(tree.overlapping(9, 10)) == [(0, 10)]
+    assert list(tree.overlapping(5, 5)) == []
+    assert list(tree.overlapping(6, 5)) == []
+    with pytest.raises(Exception):
+        tree.insert(3, 3)
+    with pytest.raises(Exception):
+        tree.insert(4, 3)
+    assert list(tree) == [(0, 10), (10, 20)]
+
+
+def countNodes(node : Node) -> int:
+    '''
+    Check subtree sizes, return number of nodes in subtree of node
+    '''
+    if node.isNIL:
+        assert node.size == 0
+        return 0
+    size = 1 + countNodes(node.left) + countNodes(node.right)
+    assert node.size == size
+    return size
+
+
+def test_rank_select():
+    rnd = Random(11)
+    tree = BRTree()
+    reference = set()
+    for _ in range(1000):
+        value = rnd.randrange(100)
+        if rnd.random() < 0.6:
+            tree.insert(value)
+            reference.add(value)
+        else:
+            tree.delete(value)
+            reference.discard(value)
+
+        values = sorted(reference)
+        assert countNodes(tree.root) == len(tree) == len(values)
+        assert tree.rank(value) == bisect_left(values, value)
+
+    assert [tree.select(i) for i in range(len(values))] == values
+    with pytest.raises(IndexError):
+        tree.select(len(values))
+    with pytest.raises(IndexError):
+        tree.select(-1)
+
+
+def test_interval_rank_select():
+    # Interval tree keeps sizes next to the largest hi
+    tree = IntervalTree()
+    for lo in range(0, 100, 2):
+        tree.insert(lo, lo + 3)
+    for lo in range(0, 100, 6):
+        tree.delete(lo, lo + 3)
+    intervals = [(lo, lo + 3) for lo in range(0, 100, 2) if lo % 6 != 0]
+    assert countNodes(tree.root) == len(intervals)
+    maxHi(tree.root)
+    assert [tree.select(i) for i in range(len(intervals))] == intervals
+    assert tree.rank((50, 53)) == bisect_left(intervals, (50, 53))
+
+
+def test_persistent_versions():
+    rnd = Random(2)
+    tree = PersistentBRTree()
+    reference = set()
+    versions = [(tree, [])]
+    for _ in range(1000):
+        value = rnd.randrange(150)
+        if rnd.random() < 0.55:
+            tree = tree.insert(value)
+            reference.add(value)
+        else:
+            tree = tree.delete(value)
+            reference.discard(value)
+        versions.append((tree, sorted(reference)))
+
+    # Every old version keeps its values
+    for (version, values) in versions[::10]:
+        assert validate(version, linked=False) == values
+        assert countNodes(version.root) == len(values)
+        lo = rnd.randrange(150)
+        hi = lo + rnd.randrange(50)
+        assert list(version.irange(lo, hi)) == [x for x in values if lo <= x < hi]
+        assert list(version.irange(lo)) == [x for x in values if lo <= x]
+
+
+def test_persistent_update_copies_one_path():
+    tree = PersistentBRTree()
+    for value in range(1000):
+        tree = tree.insert(value)
+
+    def nodeIds(root : Node) -> set:
+        return {id(node) for node in root.preorder()}
+
+    oldIds = nodeIds(tree.root)
+    # An update copies O(log n) nodes, all other nodes are shared
+    assert len(nodeIds(tree.insert(5000).root) - oldIds) <= 40
+    assert len(nodeIds(tree.delete(500).root) - oldIds) <= 40
+    assert tree.insert(5) is tree and tree.delete(5000) is tree
+    assert list(tree) == list(range(1000))
+
+
+def shuffledTree(values : List[int], rnd : Random) -> BRTree:
+    tree = BRTree()
+    for value in rnd.sample(values, len(values)):
+        tree.insert(value)
+    return tree
+
+
+def test_from_sorted():
+    for n in list(range(40)) + [1000]:
+        tree = BRTree.from_sorted(range(n))
+        assert validate(tree) == list(range(n))
+        assert countNodes(tree.root) == n
+    with pytest.raises(Exception):
+        BRTree.from_sorted([1, 3, 2])
+    with pytest.raises(Exception):
+        BRTree.from_sorted([1, 1])
+
+
+def test_split_join():
+    rnd = Random(4)
+    for _ in range(200):
+        values = sorted(rnd.sample(range(400), rnd.choice([0, 1, 2, 5, 30, 200])))
+        key = rnd.randrange(-1, 401)
+        (left, right) = shuffledTree(values, rnd).split(key)
+        assert validate(left) == [x for x in values if x < key]
+        assert validate(right) == [x for x in values if x >= key]
+        assert countNodes(left.root) + countNodes(right.root) == len(values)
+
+        lower = [x for x in values if x < key]
+        upper = [x + 400 for x in values if x > key]
+        tree = BRTree.join(BRTree.from_sorted(lower), key, shuffledTree(upper, rnd))
+        assert validate(tree) == lower + [key] + upper
+        assert countNodes(tree.root) == len(lower) + 1 + len(upper)
+
+    with pytest.raises(Exception):
+        BRTree.join(BRTree.from_sorted([1, 5]), 3, BRTree.from_sorted([7]))
+
+
+@pytest.mark.parametrize('operation', ['union', 'intersection', 'difference'])
+def test_set_operations(operation):
+    rnd = Random(operation)
+    expected = {'union': set.union, 'intersection': set.intersection, 'difference': set.difference}[operation]
+    for _ in range(100):
+        first = sorted(rnd.sample(range(400), rnd.choice([0, 1, 5, 30, 200])))
+        second = sorted(rnd.sample(range(400), rnd.choice([0, 1, 3, 30, 200])))
+        (tree, other) = (shuffledTree(first, rnd), BRTree.from_sorted(second))
+        result = getattr(tree, operation)(other)
+        assert validate(result) == sorted(expected(set(first), set(second)))
+        assert countNodes(result.root) == len(result)
+        assert len(tree) == 0 and len(other) == 0
+
+        # Result is a normal tree
+        for value in rnd.sample(range(400), 20):
+            result.insert(value)
+        validate(result)
+
+
+def test_interval_union_keeps_max_hi():
+    tree = IntervalTree.from_sorted([(i, i + 5) for i in range(20)])
+    other = IntervalTree.from_sorted([(i, i + 50) for i in range(10, 30)])
+    result = tree.union(other)
+    assert type(result) is IntervalTree
+    maxHi(result.root)
+    assert list(result.overlapping(40, 41)) == [x for x in result if x[0] < 41 and 40 < x[1]]
+
+
+def test_persistent_from_sorted():
+    tree = PersistentBRTree.from_sorted(range(50))
+    assert validate(tree, linked=False) == list(range(50))
+    assert list(tree.insert(100).delete(3)) == [x for x in range(50) if x != 3] + [100]
+    assert list(tree) == list(range(50))
+    with pytest.raises(Exception):
+        tree.split(10)
+    with pytest.raises(Exception):
+        tree.union(PersistentBRTree.from_sorted(range(60, 70)))
+
+
+def test_traversals():
+    rnd = Random(18)
+    tree = BRTree()
+    for value in rnd.sample(range(5000), 3000):
+        tree.insert(value)
+
+    def preorder(node : Node) -> List[int]:
+        return [] if node.isNIL else [node.value] + preorder(node.left) + preorder(node.right)
+
+    levels = []
+    waitNodes = [tree.root]
+    while len(waitNodes) > 0:
+        levels += [node.value for node in waitNodes]
+        waitNodes = [child for node in waitNodes for child in (node.left, node.right) if not child.isNIL]
+
+    assert list(tree.inorder()) == sorted(tree.irange())
+    assert list(tree.preorder()) == preorder(tree.root)
+    assert list(tree.level_order()) == levels
+    assert list(BRTree().inorder()) == list(BRTree().preorder()) == list(BRTree().level_order()) == []
+
+
+def test_dot_lines(tmp_path):
+    tree = BRTree.from_sorted(range(5000))
+    source = '\n'.join(tree.root.dot_lines())
+    names = re.findall(r'^    (\w+) \[label', source, re.M)
+    assert len(names) == 5000
+    assert all(head in names and tail in names for (head, tail) in re.findall(r'^    (\w+) -> (\w+);', source, re.M))
+
+    # 3 levels are drawn, cut off nodes are summarized with their number
+    source = '\n'.join(tree.root.dot_lines(maxDepth=2))
+    drawn = source.count('color=')
+    assert drawn == 7
+    assert drawn + sum(int(count) for count in re.findall(r'\.\.\. (\d+) nodes', source)) == 5000
+
+    fileName = str(tmp_path / 'brtree.gv')
+    tree.search(777).save_pdf(fileName, maxNodes=10, render=False)
+    with open(fileName) as f:
+        assert f.read().count('color=') <= 10
+
+    # Labels are escaped
+    quoted = BRTree()
+    quoted.insert('a"b\\')
+    assert 'label="a\\"b\\\\"' in '\n'.join(quoted.root.dot_lines())
@@ -0,0 +1,496 @@
+from array import array
+from bisect import bisect_left
+from random import Random
+import re
+from typing import List
+
+import pytest
+
+from dsa.btree.BTree import BPlusTree, BTree, BTreeNode, CompactBTreeNode
+
+
+def validate(tree : BTree) -> List[int]:
+    '''
+    Check balance rules of B-Tree (bounds of number of keys, order of keys, depth of leaves), return keys in increasing order
+    '''
+    keys = []
+    leafDepths = set()
+
+    def visit(node : BTreeNode, depth : int, lo : int, hi : int) -> None:
+        assert list(node.keys) == sorted(node.keys)
+        assert len(node.keys) <= tree.order - 1
+        if node is not tree.root:
+            assert len(node.keys) >= tree.minKeys
+        assert all((lo is None or key > lo) and (hi is None or key < hi) for key in node.keys)
+
+        if node.isLeaf():
+            leafDepths.add(depth)
+            keys.extend(node.keys)
+            return
+        assert len(node.children) == len(node.keys) + 1
+        bounds = [lo] + list(node.keys) + [hi]
+        for (i, child) in enumerate(node.children):
+            visit(child, depth + 1, bounds[i], bounds[i + 1])
+            if i < len(node.keys):
+                keys.append(node.keys[i])
+
+    visit(tree.root, 0, None, None)
+    assert len(leafDepths) <= 1
+    return keys
+
+
+@pytest.mark.parametrize('order', [3, 4, 5, 8, 64])
+def test_insert_delete_search(order):
+    rnd = Random(order)
+    tree = BTree(order)
+    reference = set()
+    for step in range(2000):
+        key = rnd.randrange(500)
+        if rnd.random() < 0.6:
+            if key not in reference:
+                tree.insert(key)
+                reference.add(key)
+        elif key in reference:
+            assert tree.delete(key) == key
+            reference.discard(key)
+        if step % 50 == 0:
+            assert validate(tree) == sorted(reference)
+
+    assert validate(tree) == sorted(reference)
+    for key in range(500):
+        (node, i) = tree.search(key)
+        if key in reference:
+            assert node.keys[i] == key
+        else:
+            assert (node, i) == (None, -1)
+
+    for key in sorted(reference):
+        tree.delete(key)
+    assert tree.isEmpty()
+
+
+def test_duplicate_and_missing_keys(capsys):
+    tree = BTree(3)
+    for key in range(20):
+        tree.insert(key)
+    tree.insert(5)
+    assert tree.delete(100) is None
+    assert "Key has been in tree!" in capsys.readouterr().out
+    assert validate(tree) == list(range(20))
+
+
+def test_order_must_be_at_least_3():
+    with pytest.raises(Exception):
+        BTree(2)
+
+
+@pytest.mark.parametrize('order', [3, 4, 5, 16, 65])
+@pytest.mark.parametrize('fill_factor', [0.01, 0.5, 1.0])
+def test_bulk_load(order, fill_factor):
+    for n in list(range(0, 40)) + [1000]:
+        tree = BTree.bulk_load(range(n), order, fill_factor)
+        assert validate(tree) == list(range(n))
+
+    # Bulk loaded tree stays valid under later inserts and deletes
+    tree = BTree.bulk_load(range(0, 2000, 2), order, fill_factor)
+    for key in range(1, 2000, 2):
+        tree.insert(key)
+    for key in range(0, 2000, 3):
+        tree.delete(key)
+    assert validate(tree) == [key for key in range(2000) if key % 3 != 0]
+
+
+def test_bulk_load_packs_leaves():
+    tree = BTree.bulk_load(range(10000), 9)
+    curNode = tree.root
+    while not curNode.isLeaf():
+        curNode = curNode.children[0]
+    assert len(curNode.keys) == 8
+
+
+def test_bulk_load_rejects_bad_input():
+    with pytest.raises(Exception):
+        BTree.bulk_load([1, 3, 2], 4)
+    with pytest.raises(Exception):
+        BTree.bulk_load([1, 1], 4)
+    with pytest.raises(Exception):
+        BTree.bulk_load(range(10), 4, 0)
+    with pytest.raises(Exception):
+        BTree.bulk_load(range(10), 4, 1.5)
+
+
+@pytest.mark.parametrize('order', [3, 4, 8, 64])
+def test_range(order):
+    rnd = Random(order)
+    keys = sorted(rnd.sample(range(1000), 300))
+    tree = BTree.bulk_load(keys, order, 0.7)
+    assert list(tree) == keys
+    for _ in range(200):
+        lo = rnd.choice([None, rnd.randrange(-5, 1005)])
+        hi = rnd.choice([None, rnd.randrange(-5, 1005)])
+        expected = [key for key in keys if (lo is None or key >= lo) and (hi is None or key < hi)]
+        assert list(tree.range(lo, hi)) == expected
+        assert list(tree.range(lo, hi, reverse=True)) == expected[::-1]
+
+
+def test_range_is_lazy():
+    tree = BTree.bulk_load(range(100000), 16)
+    scan = tree.range(500)
+    assert [next(scan) for _ in range(3)] == [500, 501, 502]
+    assert list(BTree(4).range()) == []
+
+
+def validatePlus(tree : BPlusTree) -> List[tuple]:
+    '''
+    Check balance rules of B+Tree and links of leaves, return items in increasing order of keys
+    '''
+    leaves = []
+    leafDepths = set()
+
+    def visit(node : BTreeNode, depth : int, lo : int, hi : int) -> None:
+        assert list(node.keys) == sorted(set(node.keys))
+        assert len(node.keys) <= tree.order - 1
+        if node is not tree.root:
+            assert len(node.keys) >= tree.minKeys
+        # Separator keys[i - 1] is the smallest key allowed in child i
+        assert all((lo is None or key >= lo) and (hi is None or key < hi) for key in node.keys)
+
+        if node.isLeaf():
+            assert len(node.values) == len(node.keys)
+            leafDepths.add(depth)
+            leaves.append(node)
+            return
+        assert node.values is None
+        assert len(node.children) == len(node.keys) + 1
+        bounds = [lo] + list(node.keys) + [hi]
+        for (i, child) in enumerate(node.children):
+            visit(child, depth + 1, bounds[i], bounds[i + 1])
+
+    visit(tree.root, 0, None, None)
+    assert len(leafDepths) <= 1
+    assert leaves[0].prev is None and leaves[-1].next is None
+    for (leaf, nextLeaf) in zip(leaves, leaves[1:]):
+        assert leaf.next is nextLeaf and nextLeaf.prev is leaf
+    return [item for leaf in leaves for item in zip(leaf.keys, leaf.values)]
+
+
+@pytest.mark.parametrize('order', [3, 4, 5, 8, 64])
+def test_bplus_insert_delete_get(order):
+    rnd = Random(order)
+    tree = BPlusTree(order)
+    reference = {}
+    for step in range(2000):
+        key = rnd.randrange(500)
+        if rnd.random() < 0.6:
+            # Insert of a key in tree replaces its value
+            tree.insert(key, step)
+            reference[key] = step
+        elif key in reference:
+            assert tree.delete(key) == reference.pop(key)
+        if step % 50 == 0:
+            assert validatePlus(tree) == sorted(reference.items())
+
+    assert validatePlus(tree) == sorted(reference.items())
+    assert list(tree.items()) == sorted(reference.items())
+    for key in range(500):
+        assert tree.get(key, 'missing') == reference.get(key, 'missing')
+
+    keys = sorted(reference)
+    for _ in range(100):
+        lo = rnd.choice([None, rnd.randrange(-5, 505)])
+        hi = rnd.choice([None, rnd.randrange(-5, 505)])
+        expected = [key for key in keys if (lo is None or key >= lo) and (hi is None or key < hi)]
+        assert list(tree.range(lo, hi)) == expected
+        assert list(tree.range(lo, hi, reverse=True)) == expected[::-1]
+        assert list(tree.items(lo, hi, reverse=True)) == [(key, reference[key]) for key in reversed(expected)]
+
+    for key in keys:
+        tree.delete(key)
+    assert tree.isEmpty() and list(tree) == []
+
+
+@pytest.mark.parametrize('order', [3, 4, 16])
+@pytest.mark.parametrize('fill_factor', [0.1, 0.8, 1.0])
+def test_bplus_bulk_load(order, fill_factor):
+    for n in list(range(0, 30)) + [777]:
+        items = [(2 * key, str(key)) for key in range(n)]
+        tree = BPlusTree.bulk_load(items, order, fill_factor)
+        assert validatePlus(tree) == items
+
+        reference = dict(items)
+        for key in range(0, 2 * n, 3):
+            tree.insert(key, 'new')
+            reference[key] = 'new'
+        for key in range(0, 2 * n, 5):
+            if key in reference:
+                tree.delete(key)
+                del reference[key]
+        assert validatePlus(tree) == sorted(reference.items())
+
+
+def countKeys(node : BTreeNode) -> int:
+    '''
+    Check subtree sizes, return number of keys counted in subtree of node
+    '''
+    size = node.countedKeys() + sum(countKeys(child) for child in node.children)
+    assert node.size == size
+    return size
+
+
+@pytest.mark.parametrize('treeType', [BTree, BPlusTree])
+@pytest.mark.parametrize('order', [3, 4, 7, 32])
+def test_rank_select_count(treeType, order):
+    rnd = Random(order)
+    tree = treeType(order)
+    reference = set()
+    for step in range(2000):
+        key = rnd.randrange(1000)
+        if rnd.random() < 0.6:
+            if key not in reference:
+                tree.insert(key)
+                reference.add(key)
+        elif key in reference:
+            tree.delete(key)
+            reference.discard(key)
+
+    keys = sorted(reference)
+    assert countKeys(tree.root) == len(tree) == len(keys)
+    assert [tree.select(i) for i in range(len(keys))] == keys
+    for key in range(-5, 1005):
+        assert tree.rank(key) == bisect_left(keys, key)
+    for _ in range(200):
+        lo = rnd.choice([None, rnd.randrange(-5, 1005)])
+        hi = rnd.choice([None, rnd.randrange(-5, 1005)])
+        assert tree.count(lo, hi) == len([key for key in keys if (lo is None or key >= lo) and (hi is None or key < hi)])
+
+    with pytest.raises(IndexError):
+        tree.select(len(keys))
+    with pytest.raises(IndexError):
+        tree.select(-1)
+
+
+def test_sizes_after_bulk_load():
+    tree = BTree.bulk_load(range(1000), 5, 0.6)
+    assert countKeys(tree.root) == 1000
+    plusTree = BPlusTree.bulk_load([(key, key) for key in range(1000)], 5, 0.6)
+    assert countKeys(plusTree.root) == 1000
+    assert plusTree.select(500) == 500 and plusTree.rank(500) == 500
+
+
+def test_nodes_have_no_parent_links():
+    assert 'parent' not in BTreeNode.__slots__
+    tree = BTree(3)
+    for key in range(100):
+        tree.insert(key)
+    assert not hasattr(tree.root, 'parent') and not hasattr(tree.root, '__dict__')
+
+
+@pytest.mark.parametrize('order', [3, 4])
+def test_deep_tree_along_paths(order):
+    # Small orders give the deepest trees, so splits and merges go up the whole path
+    rnd = Random(order)
+    keys = list(range(5000))
+    rnd.shuffle(keys)
+    tree = BTree(order)
+    for key in keys:
+        tree.insert(key)
+    assert validate(tree) == list(range(5000))
+    assert countKeys(tree.root) == 5000
+
+    rnd.shuffle(keys)
+    for (i, key) in enumerate(keys):
+        assert tree.delete(key) == key
+        if i % 500 == 0:
+            assert validate(tree) == sorted(keys[i + 1 :])
+            assert countKeys(tree.root) == len(keys) - i - 1
+    assert tree.isEmpty() and len(tree) == 0
+
+
+def compactNodes(node : BTreeNode) -> bool:
+    return type(node) is CompactBTreeNode and isinstance(node.keys, array) and all(compactNodes(child) for child in node.children)
+
+
+@pytest.mark.parametrize('order', [3, 4, 64])
+def test_compact_nodes(order):
+    rnd = Random(order)
+    tree = BTree(order)
+    compactTree = BTree(order, compact=True)
+    reference = set()
+    for step in range(3000):
+        # Keys near the bounds of 64-bit integers are kept exactly
+        key = rnd.randrange(-2**63, 2**63) if rnd.random() < 0.05 else rnd.randrange(800)
+        if rnd.random() < 0.6:
+            if key not in reference:
+                tree.insert(key)
+                compactTree.insert(key)
+                reference.add(key)
+        elif key in reference:
+            tree.delete(key)
+            compactTree.delete(key)
+            reference.discard(key)
+
+    keys = sorted(reference)
+    assert compactNodes(compactTree.root)
+    assert validate(compactTree) == validate(tree) == keys
+    assert countKeys(compactTree.root) == len(keys)
+    assert [compactTree.select(i) for i in range(len(keys))] == keys
+
+    bulkTree = BTree.bulk_load(keys, order, 0.7, compact=True)
+    assert compactNodes(bulkTree.root) and validate(bulkTree) == keys
+
+
+def test_compact_rejects_large_keys():
+    tree = BTree(4, compact=True)
+    for key in range(10):
+        tree.insert(key)
+    with pytest.raises(OverflowError):
+        tree.insert(2**63)
+    assert validate(tree) == list(range(10)) and len(tree) == 10
+
+
+@pytest.mark.parametrize('order', [3, 4, 7, 64])
+@pytest.mark.parametrize('compact', [False, True])
+def test_insert_many_delete_many(order, compact):
+    rnd = Random(order)
+    tree = BTree(order, compact)
+    reference = set()
+    for _ in range(100):
+        n = rnd.choice([1, 3, 20, 200, 2000])
+        if rnd.random() < 0.5:
+            keys = [rnd.randrange(5000) for _ in range(n)]
+            assert tree.insert_many(keys) == len(set(keys) - reference)
+            reference |= set(keys)
+        else:
+            # Random keys or a contiguous run that empties whole leaves
+            start = rnd.randrange(5000)
+            keys = [rnd.randrange(5000) for _ in range(n)] if rnd.random() < 0.5 else list(range(start, start + n))
+            assert tree.delete_many(keys) == len(set(keys) & reference)
+            reference -= set(keys)
+        assert validate(tree) == sorted(reference)
+        assert countKeys(tree.root) == len(reference)
+
+    assert tree.delete_many(list(reference)) == len(reference)
+    assert tree.isEmpty()
+    assert tree.insert_many([]) == 0 and tree.delete_many([]) == 0
+
+
+def test_bplus_insert_many_delete_many():
+    tree = BPlusTree(4)
+    assert tree.insert_many([(key, -key) for key in reversed(range(100))]) == 100
+    assert tree.insert_many([(0, 'zero')]) == 0 and tree.get(0) == 'zero'
+    assert tree.delete_many(range(50, 150)) == 50
+    assert validatePlus(tree) == [(0, 'zero')] + [(key, -key) for key in range(1, 50)]
+
+
+@pytest.mark.parametrize('order', [3, 7])
+@pytest.mark.parametrize('compact', [False, True])
+def test_snapshots(order, compact):
+    rnd = Random(order)
+    tree = BTree(order, compact)
+    reference = set()
+    snapshots = []
+    for step in range(300):
+        choice = rnd.random()
+        if choice < 0.1:
+            snapshots.append((tree.snapshot(), sorted(reference)))
+        elif choice < 0.4:
+            key = rnd.randrange(600)
+            if key not in reference:
+                tree.insert(key)
+                reference.add(key)
+        elif choice < 0.6:
+            key = rnd.randrange(600)
+            if key in reference:
+                tree.delete(key)
+                reference.discard(key)
+        elif choice < 0.8:
+            keys = [rnd.randrange(600) for _ in range(rnd.choice([3, 50]))]
+            tree.insert_many(keys)
+            reference |= set(keys)
+        else:
+            keys = [rnd.randrange(600) for _ in range(rnd.choice([3, 50]))]
+            tree.delete_many(keys)
+            reference -= set(keys)
+        assert validate(tree) == sorted(reference)
+
+    # Snapshots keep the keys of the time they were taken
+    for (snapshot, keys) in snapshots:
+        assert validate(snapshot) == keys
+        assert countKeys(snapshot.root) == len(snapshot) == len(keys)
+
+
+def test_snapshot_is_read_only():
+    tree = BTree(4)
+    tree.insert_many(range(100))
+    snapshot = tree.snapshot()
+    for change in (lambda: snapshot.insert(1000), lambda: snapshot.delete(1), lambda: snapshot.insert_many([1000]), lambda: snapshot.delete_many([1])):
+        with pytest.raises(Exception):
+            change()
+    assert snapshot.snapshot() is snapshot
+    assert list(snapshot) == list(range(100))
+
+
+def test_snapshot_copies_only_on_change(capsys):
+    tree = BTree(5)
+    tree.insert_many(range(100))
+    # Without snapshot, nodes are changed in place
+    root = tree.root
+    tree.insert(1000)
+    assert tree.root is root
+
+    snapshot = tree.snapshot()
+    tree.insert(50)
+    assert tree.delete(5000) is None
+    capsys.readouterr()
+    assert tree.root is snapshot.root
+
+    tree.insert(2000)
+    assert tree.root is not snapshot.root
+    assert list(snapshot) == list(range(100)) + [1000]
+
+
+def test_bplus_has_no_snapshot():
+    with pytest.raises(Exception):
+        BPlusTree(4).snapshot()
+
+
+def drawnNodes(lines : List[str]) -> List[str]:
+    '''
+    Check that every edge of DOT lines joins drawn nodes, return names of drawn nodes
+    '''
+    source = '\n'.join(lines)
+    assert lines[0].startswith('digraph') and lines[-1] == '}'
+    names = re.findall(r'^    (\w+) \[label', source, re.M)
+    for (head, tail) in re.findall(r'^    (\w+)(?::f\d+)? -> (\w+);', source, re.M):
+        assert head in names and tail in names
+    return names
+
+
+def test_dot_lines():
+    tree = BTree.bulk_load(range(20000), 8)
+    nodeCount = lambda node: 1 + sum(nodeCount(child) for child in node.children)
+    assert len(drawnNodes(list(tree.dot_lines()))) == nodeCount(tree.root)
+
+    # Cut off children are summarized with their number of keys
+    lines = list(tree.dot_lines(maxDepth=1))
+    drawnNodes(lines)
+    summarized = sum(int(count) for count in re.findall(r'\.\.\. (\d+) keys', '\n'.join(lines)))
+    assert summarized + len(tree.root.keys) + sum(len(child.keys) for child in tree.root.children) == 20000
+
+    lines = list(tree.dot_lines(start=12345, maxNodes=20))
+    drawnNodes(lines)
+    assert 0 < '\n'.join(lines).count('[label="<f0>') <= 20
+    with pytest.raises(Exception):
+        list(tree.dot_lines(start=-5))
+
+    plusTree = BPlusTree.bulk_load([(key, key) for key in range(1000)], 8)
+    lines = list(plusTree.dot_lines(maxDepth=0))
+    assert re.findall(r'\.\.\. (\d+) keys', '\n'.join(lines)) == ['1000']
+
+
+def test_save_dot(tmp_path):
+    tree = BTree.bulk_load(range(1000), 8)
+    fileName = str(tmp_path / 'btree.gv')
+    tree.show(fileName, maxDepth=1, render=False)
+    with open(fileName) as f:
+        assert f.read().split('\n')[:-1] == list(tree.dot_lines(maxDepth=1))
@@ -0,0 +1,242 @@
+from random import Random
+import re
+from typing import List
+
+import pytest
+
+from dsa.fibonacci_heap.FibonacciHeap import FibonacciHeap, HeapTreeNode, merge_sorted
+
+
+def validate(heap : FibonacciHeap) -> None:
+    '''
+    Check links of circular lists, heap order and degrees, min and size
+    '''
+    if heap.min is None:
+        assert len(heap) == 0
+        return
+    count = 0
+    for curRoot in heap.roots:
+        assert curRoot.parent is None and not curRoot.isMarked
+        assert curRoot.value >= heap.min.value
+        for node in curRoot.preorder():
+            count += 1
+            assert node.right.left is node and node.left.right is node
+            assert len(node.children) == node.degree
+            assert all(child.parent is node and child.value >= node.value for child in node.children)
+    assert count == len(heap)
+
+
+def test_traversals():
+    rnd = Random(18)
+    heap = FibonacciHeap()
+    for value in rnd.sample(range(5000), 3000):
+        heap.insert(value)
+    # Delete min links roots into trees of many levels
+    for _ in range(100):
+        heap.delete_min()
+
+    def preorder(node : HeapTreeNode) -> List[HeapTreeNode]:
+        return [node] + [x for child in node.children for x in preorder(child)]
+
+    def levelOrder(node : HeapTreeNode) -> List[HeapTreeNode]:
+        (result, waitNodes) = ([], [node])
+        while len(waitNodes) > 0:
+            result += waitNodes
+            waitNodes = [child for curNode in waitNodes for child in curNode.children]
+        return result
+
+    assert any(curRoot.degree > 3 for curRoot in heap.roots)
+    assert list(heap.preorder()) == [x for curRoot in heap.roots for x in preorder(curRoot)]
+    assert list(heap.level_order()) == [x for curRoot in heap.roots for x in levelOrder(curRoot)]
+    assert len(list(heap.preorder())) == len(heap) == 2900
+    assert list(FibonacciHeap().preorder()) == []
+
+
+def test_dot_lines(tmp_path):
+    heap = FibonacciHeap()
+    heap.insert_multiple(Random(20).sample(range(5000), 5000))
+    heap.delete_min()
+    source = '\n'.join(heap.dot_lines())
+    names = re.findall(r'^    (\w+) \[label', source, re.M)
+    assert len(names) == 4999
+    assert all(head in names and tail in names for (head, tail) in re.findall(r'^    (\w+) -- (\w+)', source, re.M))
+
+    # Cut off roots and children are summarized with their number of nodes
+    source = '\n'.join(heap.dot_lines(maxDepth=1, maxNodes=10))
+    drawn = len(re.findall(r'^    (\w+) \[label="\d+"', source, re.M))
+    assert drawn <= 10
+    assert drawn + sum(int(count) for count in re.findall(r'\.\.\. (\d+) nodes', source)) == 4999
+
+    fileName = str(tmp_path / 'heap.gv')
+    heap.show(fileName, start=heap.min.value, maxDepth=2, render=False)
+    with open(fileName) as f:
+        assert f.read().startswith('graph fibonacci_heap {')
+    with pytest.raises(Exception):
+        list(heap.dot_lines(start=-1))
+
+
+def test_insert_delete_min_decrease_key():
+    rnd = Random(1)
+    for _ in range(10):
+        heap = FibonacciHeap()
+        reference = set()
+        for step in range(600):
+            choice = rnd.random()
+            if choice < 0.45:
+                # Unique values, so nodes can be found by value
+                value = rnd.randrange(10**6) * 1000 + step
+                heap.insert(value)
+                reference.add(value)
+            elif choice < 0.65 and len(reference) > 0:
+                assert heap.min.value == min(reference)
+                reference.remove(heap.min.value)
+                heap.delete_min()
+            elif choice < 0.85 and len(reference) > 0:
+                value = rnd.choice(sorted(reference))
+                newValue = value - rnd.randrange(10**5) * 1000
+                if newValue != value and newValue in reference:
+                    continue
+                heap.decrease_key(heap.search(value), newValue)
+                reference.remove(value)
+                reference.add(newValue)
+            elif len(reference) > 0:
+                value = rnd.choice(sorted(reference))
+                heap.delete(heap.search(value))
+                reference.remove(value)
+            if step % 50 == 0:
+                validate(heap)
+            assert (None if heap.min is None else heap.min.value) == (min(reference) if len(reference) > 0 else None)
+
+        other = FibonacciHeap()
+        for value in range(-50, 0):
+            other.insert(value)
+        other.delete_min()
+        heap.union(other)
+        assert other.is_empty() and len(other) == 0
+        validate(heap)
+        values = []
+        while not heap.is_empty():
+            values.append(heap.min.value)
+            heap.delete_min()
+        assert values == sorted(reference | set(range(-49, 0)))
+
+
+def test_decrease_key_errors():
+    heap = FibonacciHeap()
+    node = heap.insert(5)
+    with pytest.raises(Exception):
+        heap.decrease_key(node, 6)
+    empty = FibonacciHeap()
+    empty.union(FibonacciHeap())
+    empty.delete_min()
+    assert empty.is_empty()
+
+
+def test_handles_and_items():
+    rnd = Random(3)
+    heap = FibonacciHeap(indexed=True)
+    reference = {}
+    for _ in range(2000):
+        choice = rnd.random()
+        if choice < 0.4:
+            item = 'v{}'.format(rnd.randrange(400))
+            if item in reference:
+                with pytest.raises(Exception):
+                    heap.insert(1, item)
+                continue
+            value = rnd.randrange(1000)
+            node = heap.insert(value, item)
+            assert node.item == item and heap.handle(item) is node
+            reference[item] = value
+        elif choice < 0.6 and len(reference) > 0:
+            item = heap.min.item
+            assert reference[item] == heap.min.value == min(reference.values())
+            del reference[item]
+            heap.delete_min()
+            assert item not in heap
+        elif choice < 0.85 and len(reference) > 0:
+            item = rnd.choice(sorted(reference))
+            reference[item] -= rnd.randrange(50)
+            heap.decrease_key(item, reference[item])
+        elif len(reference) > 0:
+            item = rnd.choice(sorted(reference))
+            heap.delete(item)
+            del reference[item]
+        assert len(heap) == len(reference) == len(heap.handles)
+        assert (None if heap.min is None else heap.min.value) == min(reference.values(), default=None)
+    validate(heap)
+
+
+def test_handles_without_index():
+    heap = FibonacciHeap()
+    heap.insert(5)
+    node = heap.insert(9)
+    heap.delete_min()
+    heap.decrease_key(node, 1)
+    assert heap.min is node
+    with pytest.raises(Exception):
+        heap.decrease_key('x', 1)
+    with pytest.raises(Exception):
+        heap.handle('x')
+
+
+def test_union_merges_smaller_index():
+    small = FibonacciHeap(indexed=True)
+    small.insert(-5, 'a')
+    large = FibonacciHeap(indexed=True)
+    for value in range(100):
+        large.insert(value, value)
+    handles = large.handles
+
+    # The larger index is kept whichever heap is unioned into the other
+    small.union(large)
+    assert small.handles is handles and large.handles == {} and len(large) == 0
+    assert 'a' in small and small.handle(50).value == 50 and small.min.item == 'a'
+    validate(small)
+
+    other = FibonacciHeap(indexed=True)
+    other.insert(0, 'a')
+    with pytest.raises(Exception):
+        small.union(other)
+    assert len(other) == 1 and len(small) == 101
+    with pytest.raises(Exception):
+        small.union(FibonacciHeap())
+
+
+def test_from_iterable_and_drain():
+    rnd = Random(25)
+    for n in [0, 1, 2, 10, 1000]:
+        values = [rnd.randrange(100) for _ in range(n)]
+        heap = FibonacciHeap.from_iterable(values)
+        # Nodes are only linked into the root list, consolidate waits for the first delete min
+        assert len(heap) == len(heap.roots) == n
+        validate(heap)
+        assert list(heap.drain()) == sorted(values)
+        assert heap.is_empty()
+    with pytest.raises(Exception):
+        FibonacciHeap().pop_min()
+
+
+def test_insert_multiple():
+    heap = FibonacciHeap()
+    heap.insert(50)
+    heap.insert_multiple(range(100, 0, -1))
+    validate(heap)
+    assert heap.pop_min() == 1 and len(heap) == 100
+
+    indexed = FibonacciHeap(indexed=True)
+    indexed.insert(7, 'a')
+    indexed.insert_multiple([3, 9])
+    assert indexed.pop_min() == 3 and indexed.handle('a').value == 7
+
+
+def test_merge_sorted():
+    rnd = Random(26)
+    iterables = [sorted(rnd.randrange(1000) for _ in range(rnd.randrange(50))) for _ in range(20)]
+    assert list(merge_sorted(*iterables)) == sorted(x for iterable in iterables for x in iterable)
+    assert list(merge_sorted()) == list(merge_sorted([], [])) == []
+
+    # Iterables are read lazily, so infinite streams can be merged
+    evens = iter(range(0, 10**18, 2))
+    merged = merge_sorted(evens, range(1, 10, 2))
+    assert [next(merged) for _ in range(12)] == list(range(10)) + [10, 12]
@@ -0,0 +1,94 @@
+from math import inf
+from random import Random
+from typing import List, Tuple
+
+import pytest
+
+from dsa.disjoint_set.DisjointSet import DisjointSet_LinkedList
+from dsa.graph.Graph import Graph, dijkstra, kruskal, prim
+
+
+def randomEdges(rnd : Random, n : int, m : int) -> List[Tuple[int, int, int]]:
+    return [(rnd.randrange(n), rnd.randrange(n), rnd.randint(1, 20)) for _ in range(m)]
+
+
+def spanningWeight(n : int, edges : List[Tuple[int, int, int]]) -> Tuple[int, int]:
+    '''
+    Reference: weight and number of edges of a minimum spanning forest, edges by increasing weight with a plain union-find
+    '''
+    parent = list(range(n))
+    def find(u : int) -> int:
+        while parent[u] != u:
+            u = parent[u]
+        return u
+
+    (weight, count) = (0, 0)
+    for (u, v, w) in sorted(edges, key=lambda edge: edge[2]):
+        (ru, rv) = (find(u), find(v))
+        if ru != rv:
+            parent[ru] = rv
+            weight += w
+            count += 1
+    return (weight, count)
+
+
+def test_from_edges():
+    rnd = Random(5)
+    for _ in range(20):
+        (n, m) = (rnd.randrange(1, 60), rnd.randrange(0, 200))
+        edges = randomEdges(rnd, n, m)
+        graph = Graph.from_edges(n, edges)
+        assert len(graph) == n and graph.num_edges() == m
+        assert sorted(graph.edges()) == sorted(edges)
+        assert all(sorted(graph.neighbors(u)) == sorted((v, w) for (x, v, w) in edges if x == u) for u in range(n))
+
+    # Undirected self-loop is stored and counted once
+    graph = Graph.from_edges(3, [(0, 1, 2), (1, 1, 5)], directed=False)
+    assert graph.num_edges() == 2 and sorted(graph.neighbors(1)) == [(0, 2), (1, 5)]
+    assert graph.weights.typecode == 'q'
+    assert Graph.from_edges(2, [(0, 1, 2), (1, 0, 0.5)]).weights.typecode == 'd'
+    with pytest.raises(Exception):
+        Graph.from_edges(2, [(0, 2, 1)])
+
+
+def test_dijkstra():
+    rnd = Random(6)
+    for _ in range(30):
+        (n, m) = (rnd.randrange(1, 60), rnd.randrange(0, 200))
+        edges = randomEdges(rnd, n, m)
+        source = rnd.randrange(n)
+        (dist, parent) = dijkstra(Graph.from_edges(n, edges), source)
+
+        # Reference: Bellman-Ford
+        expected = [inf] * n
+        expected[source] = 0
+        for _ in range(n):
+            for (u, v, w) in edges:
+                expected[v] = min(expected[v], expected[u] + w)
+        assert dist == expected
+        for v in range(n):
+            if v != source and parent[v] >= 0:
+                assert any(u == parent[v] and x == v and dist[u] + w == dist[v] for (u, x, w) in edges)
+
+
+def test_minimum_spanning_tree():
+    rnd = Random(7)
+    for _ in range(30):
+        (n, m) = (rnd.randrange(1, 60), rnd.randrange(0, 200))
+        edges = randomEdges(rnd, n, m)
+        graph = Graph.from_edges(n, edges, directed=False)
+        (weight, count) = spanningWeight(n, edges)
+        for (treeWeight, treeEdges) in (prim(graph), kruskal(graph), kruskal(graph, DisjointSet_LinkedList)):
+            assert treeWeight == weight and len(treeEdges) == count
+            assert sum(w for (_, _, w) in treeEdges) == weight
+
+    with pytest.raises(Exception):
+        prim(Graph.from_edges(2, [(0, 1, 1)]))
+    with pytest.raises(Exception):
+        kruskal(Graph.from_edges(2, [(0, 1, 1)]))
+
+
+def test_random_graph():
+    graph = Graph.random(100, 500, seed=1)
+    assert len(graph) == 100 and graph.num_edges() == 500
+    assert sorted(graph.edges()) == sorted(Graph.random(100, 500, seed=1).edges())
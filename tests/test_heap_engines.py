@@ -0,0 +1,93 @@
+from random import Random
+
+import pytest
+
+from dsa.fibonacci_heap.FibonacciHeap import merge_sorted
+from dsa.fibonacci_heap.HeapEngines import ENGINES, WORKLOADS, BinaryHeap, PairingHeap, RadixHeap, benchmark
+from dsa.graph.Graph import Graph, dijkstra, kruskal, prim
+
+
+@pytest.mark.parametrize('name', sorted(ENGINES))
+def test_monotone_operations(name):
+    # Values never go below the last deleted min, so every engine (radix too) gets the same operations
+    rnd = Random(name)
+    engine = ENGINES[name]
+    heap = engine()
+    reference = {}
+    (last, item) = (0, 0)
+    for _ in range(3000):
+        choice = rnd.random()
+        if choice < 0.4:
+            value = rnd.randrange(last, last + 1000)
+            reference[item] = (value, heap.insert(value, item))
+            item += 1
+        elif choice < 0.6 and len(reference) > 0:
+            entry = heap.min
+            assert entry.value == min(value for (value, _) in reference.values())
+            last = entry.value
+            del reference[entry.item]
+            heap.delete_min()
+        elif choice < 0.85 and len(reference) > 0:
+            key = rnd.choice(sorted(reference))
+            (value, entry) = reference[key]
+            value = rnd.randint(last, value)
+            heap.decrease_key(entry, value)
+            reference[key] = (value, entry)
+        elif choice < 0.93 and len(reference) > 0:
+            key = rnd.choice(sorted(reference))
+            heap.delete(reference.pop(key)[1])
+        else:
+            other = engine()
+            for _ in range(rnd.randrange(30)):
+                value = rnd.randrange(last, last + 1000)
+                reference[item] = (value, other.insert(value, item))
+                item += 1
+            heap.union(other)
+            assert other.is_empty() and len(other) == 0 and other.min is None
+        assert len(heap) == len(reference)
+
+    assert list(heap.drain()) == sorted(value for (value, _) in reference.values())
+    assert heap.min is None
+
+
+@pytest.mark.parametrize('name', sorted(ENGINES))
+def test_errors(name):
+    heap = ENGINES[name]()
+    with pytest.raises(Exception):
+        heap.pop_min()
+    entry = heap.insert(5)
+    with pytest.raises(Exception):
+        heap.decrease_key(entry, 6)
+    if name != 'fibonacci':
+        with pytest.raises(Exception):
+            heap.union(PairingHeap() if name == 'binary' else BinaryHeap())
+
+
+def test_radix_heap_is_monotone():
+    heap = RadixHeap()
+    heap.insert(10)
+    heap.delete_min()
+    with pytest.raises(Exception):
+        heap.insert(3)
+
+
+@pytest.mark.parametrize('name', sorted(ENGINES))
+def test_engines_in_algorithms(name):
+    graph = Graph.random(1000, 5000, seed=3)
+    assert dijkstra(graph, 0, heap=ENGINES[name])[0] == dijkstra(graph, 0)[0]
+    # Keys of Prim are not monotone, radix heap only fits Dijkstra
+    if name != 'radix':
+        undirected = Graph.random(1000, 3000, directed=False, seed=4)
+        assert prim(undirected, heap=ENGINES[name])[0] == kruskal(undirected)[0]
+
+
+def test_benchmark():
+    results = benchmark(500)
+    assert sorted(results) == sorted(WORKLOADS)
+    assert all(sorted(times) == sorted(ENGINES) and all(t >= 0 for t in times.values()) for times in results.values())
+
+
+@pytest.mark.parametrize('name', sorted(ENGINES))
+def test_merge_sorted_with_engines(name):
+    iterables = [range(0, 100, 3), range(0, 100, 7), []]
+    assert list(merge_sorted(*iterables, heap=ENGINES[name])) == sorted(x for iterable in iterables for x in iterable)
@@ -0,0 +1,24 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Modules only needed to display or benchmark data structures
+DEMO_MODULES = ['graphviz', 'matplotlib', 'numpy', 'tracemalloc']
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = sorted(
+    os.path.splitext(os.path.join(path, fileName))[0][len(ROOT) + 1 :].replace(os.sep, '.')
+    for (path, _, fileNames) in os.walk(os.path.join(ROOT, 'dsa'))
+    for fileName in fileNames
+    if fileName.endswith('.py') and fileName != '__init__.py'
+)
+
+
+@pytest.mark.parametrize('module', MODULES)
+def test_import_has_no_side_effects(module):
+    # A fresh interpreter, so modules loaded by other tests are not counted
+    code = 'import sys, {0}; print(",".join(name for name in {1} if name in sys.modules))'.format(module, DEMO_MODULES)
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout == '\n' and result.stderr == ''
@@ -0,0 +1,199 @@
+import os
+from random import Random
+import signal
+import struct
+from typing import Callable, List, Tuple
+
+import pytest
+
+from dsa.btree.PagedBTree import PageNode, PagedBTree
+
+N = 10000
+keys = [x for x in range(N)]
+Random(1).shuffle(keys)
+# Keys inserted and deleted before the crash, then keys inserted one commit at a time until the crash
+before = keys[: N // 2]
+deleted = before[: N // 8]
+after = keys[N // 2 :]
+committed = sorted(set(before) - set(deleted))
+
+needsFork = pytest.mark.skipif(not hasattr(os, 'fork'), reason="crash tests need os.fork")
+
+
+def validate(tree : PagedBTree) -> List[int]:
+    '''
+    Check balance rules of B-Tree on pages and that no page is used twice, return keys in increasing order
+    '''
+    keys = []
+    leafDepths = set()
+    seen = set()
+    minKeys = round(tree.pager.order / 2) - 1
+
+    def visit(pageId : int, depth : int, lo : int, hi : int) -> None:
+        assert pageId not in seen
+        seen.add(pageId)
+        node = tree.pager.read(pageId)
+        nodeKeys = list(node.keys)
+        nodeChildren = list(node.children)
+        assert nodeKeys == sorted(nodeKeys) and len(nodeKeys) <= tree.pager.order - 1
+        if pageId != tree.pager.rootId:
+            assert len(nodeKeys) >= minKeys
+        assert all((lo is None or key > lo) and (hi is None or key < hi) for key in nodeKeys)
+
+        if len(nodeChildren) == 0:
+            leafDepths.add(depth)
+            keys.extend(nodeKeys)
+            return
+        assert len(nodeChildren) == len(nodeKeys) + 1
+        bounds = [lo] + nodeKeys + [hi]
+        for (i, child) in enumerate(nodeChildren):
+            visit(child, depth + 1, bounds[i], bounds[i + 1])
+            if i < len(nodeKeys):
+                keys.append(nodeKeys[i])
+
+    visit(tree.pager.rootId, 0, None, None)
+    assert len(leafDepths) <= 1
+    return keys
+
+
+@pytest.mark.parametrize('order', [3, 4, 7, None])
+@pytest.mark.parametrize('cacheSize', [1, 3, 1000])
+def test_insert_delete_reopen(tmp_path, order, cacheSize):
+    fileName = str(tmp_path / 'btree.db')
+    rnd = Random(cacheSize)
+    reference = set()
+    with PagedBTree(fileName, order=order, pageSize=512, cacheSize=cacheSize) as tree:
+        for step in range(2000):
+            key = rnd.randrange(1000)
+            if rnd.random() < 0.6:
+                if key not in reference:
+                    tree.insert(key)
+                    reference.add(key)
+            elif key in reference:
+                assert tree.delete(key) == key
+                reference.discard(key)
+            if step % 500 == 0:
+                assert validate(tree) == sorted(reference)
+        assert list(tree.range(100, 600, reverse=True)) == sorted(key for key in reference if 100 <= key < 600)[::-1]
+
+    # Order and root are read back from the meta page
+    with PagedBTree(fileName, cacheSize=cacheSize) as tree:
+        assert validate(tree) == sorted(reference)
+        for key in range(1000):
+            assert (tree.search(key)[0] is not None) == (key in reference)
+
+
+def test_order_from_page_size(tmp_path):
+    with PagedBTree(str(tmp_path / 'btree.db'), pageSize=4096) as tree:
+        assert tree.pager.order == (4096 - 3 - 8) // 16
+    with pytest.raises(Exception):
+        PagedBTree(str(tmp_path / 'small.db'), order=64, pageSize=512)
+
+
+def test_free_pages_are_reused(tmp_path):
+    with PagedBTree(str(tmp_path / 'btree.db'), order=4, pageSize=512) as tree:
+        for key in range(2000):
+            tree.insert(key)
+        pageCount = tree.pager.pageCount
+        for key in range(2000):
+            tree.delete(key)
+        assert tree.isEmpty()
+        for key in range(2000):
+            tree.insert(key)
+        assert tree.pager.pageCount <= pageCount
+
+
+def test_cache_keeps_recent_pages(tmp_path):
+    with PagedBTree(str(tmp_path / 'btree.db'), order=4, pageSize=512, cacheSize=64) as tree:
+        for key in range(5000):
+            tree.insert(key)
+        tree.flush()
+        tree.search(2500)
+        misses = tree.pager.misses
+        tree.search(2500)
+        assert tree.pager.misses == misses
+
+
+def test_rejects_other_files(tmp_path):
+    fileName = tmp_path / 'other.db'
+    fileName.write_bytes(b'x' * 4096)
+    with pytest.raises(Exception):
+        PagedBTree(str(fileName))
+
+
+def crash(fileName : str, work : Callable) -> Tuple[List[int], int]:
+    '''
+    Run work(tree, kill) on a prepared durable tree in a child process, kill(progress) reports progress through a pipe and kills the child.
+    Return keys of the reopened tree and the reported progress
+    '''
+    (readEnd, writeEnd) = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        def kill(progress : int) -> None:
+            os.write(writeEnd, struct.pack('<q', progress))
+            os.kill(os.getpid(), signal.SIGKILL)
+
+        try:
+            tree = PagedBTree(fileName, order=4, pageSize=512, durable=True, groupSize=1000)
+            for key in before:
+                tree.insert(key)
+            for key in deleted:
+                tree.delete(key)
+            tree.commit()
+            work(tree, kill)
+        finally:
+            os._exit(1)
+
+    os.close(writeEnd)
+    (_, status) = os.waitpid(pid, 0)
+    report = os.read(readEnd, 8)
+    os.close(readEnd)
+    assert os.WIFSIGNALED(status) and os.WTERMSIG(status) == signal.SIGKILL, "child process was not killed at the crash point"
+    assert len(report) == 8
+
+    with PagedBTree(fileName, durable=True) as tree:
+        found = list(tree)
+        assert all(tree.search(key)[0] is not None for key in found)
+    return (found, struct.unpack('<q', report)[0])
+
+
+@needsFork
+def test_crash_during_split_cascade(tmp_path):
+    def killDuringSplit(tree : PagedBTree, kill : Callable) -> None:
+        # Kill at the third page allocated by one insert (order 4 -> at least two levels are split),
+        # progress is the number of committed inserts before the killed one
+        allocate = tree.pager.allocate
+        state = [0, 0]
+        def allocateOrKill() -> PageNode:
+            state[1] += 1
+            if state[1] == 3:
+                kill(state[0])
+            return allocate()
+        tree.pager.allocate = allocateOrKill
+
+        for key in after:
+            state[1] = 0
+            tree.insert(key)
+            tree.commit()
+            state[0] += 1
+
+    (found, inserted) = crash(str(tmp_path / 'btree.db'), killDuringSplit)
+    assert 0 < inserted < len(after)
+    assert found == sorted(committed + after[: inserted])
+
+
+@needsFork
+def test_crash_during_checkpoint(tmp_path):
+    def killDuringCheckpoint(tree : PagedBTree, kill : Callable) -> None:
+        # Kill between writeCheckpoint and truncate, when half of the logged page images are written to the file
+        writePages = tree.pager.writePages
+        def writeHalfAndKill(images : List[Tuple[int, bytes]]) -> None:
+            writePages(images[: len(images) // 2])
+            tree.pager.sync()
+            kill(len(images) // 2)
+        tree.pager.writePages = writeHalfAndKill
+        tree.checkpoint()
+
+    (found, written) = crash(str(tmp_path / 'btree.db'), killDuringCheckpoint)
+    assert written > 0
+    assert found == committed